@@ -8,23 +8,130 @@ import os
 import shutil
 
 from .. import APPLICATION_NAME, ERROR_LOG
+from ..chesscalc_legacy.core import performances
 from ..core import constants
+from ..core import mergeplayers
+from ..core import recordcache
+from ..core import valuecodec
 
 
 class Database:
     """Provide methods common to all database engine interfaces."""
 
+    _alias_person_map = None
+    _person_game_map = None
+    _record_cache = None
+    _warm_start = None
+    value_encoding = valuecodec.REPR_ENCODING
+
     def open_database(self, files=None):
-        """Return '' to fit behaviour of dpt version of this method."""
+        """Return '' to fit behaviour of dpt version of this method.
+
+        New record values are written in the value encoding chosen for the
+        database, noted in value_encoding.
+
+        """
         super().open_database(files=files)
+        self._alias_person_map = None
+        self._person_game_map = None
+        self._record_cache = None
+        self._warm_start = None
+        self.value_encoding = valuecodec.read_database_encoding(
+            self.home_directory
+        )
         return ""
 
+    def backout(self):
+        """Extend, discard alias to person map answers then backout.
+
+        The player to games map answers and the record cache are cleared
+        too.
+
+        """
+        if self._alias_person_map is not None:
+            self._alias_person_map.clear()
+        if self._person_game_map is not None:
+            self._person_game_map.clear()
+        if self._record_cache is not None:
+            self._record_cache.clear()
+        super().backout()
+
+    def commit(self):
+        """Extend, clear record cache then commit."""
+        if self._record_cache is not None:
+            self._record_cache.clear()
+        super().commit()
+
+    def end_read_only_transaction(self):
+        """Extend, clear record cache then end read only transaction."""
+        if self._record_cache is not None:
+            self._record_cache.clear()
+        super().end_read_only_transaction()
+
+    def delete_instance(self, dbset, instance):
+        """Extend, delete instance then discard cached record for instance."""
+        super().delete_instance(dbset, instance)
+        if self._record_cache is not None:
+            self._record_cache.discard(dbset, instance.key.pack())
+
+    def edit_instance(self, dbset, instance):
+        """Extend, edit instance then discard cached records for instance."""
+        super().edit_instance(dbset, instance)
+        if self._record_cache is not None:
+            self._record_cache.discard(dbset, instance.key.pack())
+            self._record_cache.discard(dbset, instance.newrecord.key.pack())
+
+    def put_instance(self, dbset, instance):
+        """Extend, put instance then discard cached record for instance.
+
+        The cache may hold None for the key of a new record.
+
+        """
+        super().put_instance(dbset, instance)
+        if self._record_cache is not None:
+            self._record_cache.discard(dbset, instance.key.pack())
+
+    def get_alias_person_map(self):
+        """Return AliasPersonMap instance for database, creating if needed."""
+        if self._alias_person_map is None:
+            self._alias_person_map = mergeplayers.AliasPersonMap()
+        return self._alias_person_map
+
+    def get_person_game_map(self):
+        """Return PersonGameMap instance for database, creating if needed."""
+        if self._person_game_map is None:
+            self._person_game_map = mergeplayers.PersonGameMap()
+        return self._person_game_map
+
+    def get_record_cache(self):
+        """Return RecordCache instance for database, creating if needed."""
+        if self._record_cache is None:
+            self._record_cache = recordcache.RecordCache()
+        return self._record_cache
+
+    def get_warm_start(self):
+        """Return WarmStart instance for database, creating if needed.
+
+        The performances calculated for players on the database are kept
+        for the start of later calculations while the database is open.
+
+        """
+        if self._warm_start is None:
+            self._warm_start = performances.WarmStart()
+        return self._warm_start
+
     def delete_database(self, names):
         """Delete results database and return message about items not deleted."""
         listnames = set(n for n in os.listdir(self.home_directory))
         homenames = set(n for n in names if os.path.basename(n) in listnames)
         if ERROR_LOG in listnames:
             homenames.add(os.path.join(self.home_directory, ERROR_LOG))
+        if valuecodec.VALUE_ENCODING_FILE in listnames:
+            homenames.add(
+                os.path.join(
+                    self.home_directory, valuecodec.VALUE_ENCODING_FILE
+                )
+            )
         if len(listnames - set(os.path.basename(h) for h in homenames)):
             message = "".join(
                 (
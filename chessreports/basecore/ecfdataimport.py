@@ -30,12 +30,227 @@ from ..core.ecf import ecfplayerdb
 from ..core.ecf import ecfmaprecord
 
 
+class ECFDownloadChanges:
+    """Changes needed to make a file match an ECF club or player download.
+
+    inserts is a list of new records for codes not on file.
+
+    updates is a list of (record, newrecord) tuples for codes in the
+    download whose details or active flag differ from the record on file.
+
+    deactivations is a list of (record, newrecord) tuples for active codes
+    on file which are not in the download.
+
+    unchanged is the number of records on file which need no change.
+
+    codes maps each ECF code to the number of records on file for the code
+    after the changes are applied.
+
+    """
+
+    def __init__(self, dbset, dbname):
+        """Initialise empty change set for dbset indexed by dbname."""
+        super().__init__()
+        self.dbset = dbset
+        self.dbname = dbname
+        self.inserts = []
+        self.updates = []
+        self.deactivations = []
+        self.unchanged = 0
+        self.codes = {}
+
+    def apply(self, results):
+        """Apply changes to results within the caller's transaction."""
+        for ecfrec, ecfnew in self.updates + self.deactivations:
+            ecfrec.edit_record(results, self.dbset, self.dbname, ecfnew)
+        for ecfrec in self.inserts:
+            ecfrec.put_record(results, self.dbset)
+
+    def get_summary(self):
+        """Return one line text summary of changes."""
+        return "".join(
+            [
+                str(len(self.inserts)),
+                " inserts, ",
+                str(len(self.updates)),
+                " updates, ",
+                str(len(self.deactivations)),
+                " deactivations, and ",
+                str(self.unchanged),
+                " unchanged.",
+            ]
+        )
+
+    def get_report(self):
+        """Return list of text lines describing each change."""
+        report = []
+        for action, records in (
+            ("Insert", self.inserts),
+            ("Update", [new for old, new in self.updates]),
+            ("Deactivate", [new for old, new in self.deactivations]),
+        ):
+            for ecfrec in records:
+                report.append(
+                    "  ".join(
+                        (action, ecfrec.value.ECFcode, ecfrec.value.ECFname)
+                    )
+                )
+        return report
+
+
+def _get_ecf_download_changes(
+    results, downloaded, dbset, dbname, recordclass, inactive
+):
+    """Return ECFDownloadChanges to make dbset records match downloaded.
+
+    downloaded maps ECF codes to a dict of value attributes for an active
+    record.  inactive is a dict of the value attributes set when a code is
+    not in downloaded.
+
+    The download is merged with one pass over the dbname index.  Only the
+    first record for an ECF code is compared with the download: other
+    records for the code are left alone.  New codes are inserted in code
+    order.
+
+    """
+    changes = ECFDownloadChanges(dbset, dbname)
+    codes = changes.codes
+    ecfcursor = results.database_cursor(dbset, dbname)
+    try:
+        record = ecfcursor.first()
+        while record:
+            ECF_code = record[0]
+            codes[ECF_code] = codes.get(ECF_code, 0) + 1
+            if codes[ECF_code] == 1 or ECF_code not in downloaded:
+                ecfrec = recordclass()
+                ecfrec.load_instance(results, dbset, dbname, record)
+                value = ecfrec.value
+                if ECF_code in downloaded:
+                    attributes = downloaded[ECF_code]
+                    target = changes.updates
+                else:
+                    attributes = inactive
+                    target = changes.deactivations
+                for name, attribute in attributes.items():
+                    if getattr(value, name) != attribute:
+                        ecfnew = ecfrec.clone()
+                        for name, attribute in attributes.items():
+                            setattr(ecfnew.value, name, attribute)
+                        target.append((ecfrec, ecfnew))
+                        break
+                else:
+                    changes.unchanged += 1
+            record = ecfcursor.next()
+    finally:
+        ecfcursor.close()
+    for ECF_code in sorted(downloaded):
+        if ECF_code in codes:
+            continue
+        ecfrec = recordclass()
+        ecfrec.key.recno = None
+        ecfrec.value.ECFcode = ECF_code
+        for name, attribute in downloaded[ECF_code].items():
+            setattr(ecfrec.value, name, attribute)
+        changes.inserts.append(ecfrec)
+        codes[ECF_code] = 1
+    return changes
+
+
+def get_ecf_clubs_post_2020_changes(results, ecfdata):
+    """Return ECFDownloadChanges for downloaded club records in ecfdata.
+
+    The last entry for a club code in ecfdata is used if the code occurs
+    more than once.
+
+    """
+    downloaded = {}
+    for data in ecfdata["clubs"]:
+        club_code = data.get("club_code")
+        if club_code is None:
+            club_code = ""
+        club_name = data.get("club_name")
+        if club_name is None:
+            club_name = ""
+        assoc_code = data.get("assoc_code")
+        if assoc_code is None:
+            assoc_code = ""
+        downloaded[club_code] = dict(
+            ECFactive=True, ECFname=club_name, ECFcountycode=assoc_code
+        )
+    return _get_ecf_download_changes(
+        results,
+        downloaded,
+        filespec.ECFCLUB_FILE_DEF,
+        filespec.ECFCLUBCODE_FIELD_DEF,
+        ecfrecord.ECFrefDBrecordECFclub,
+        dict(ECFactive=False),
+    )
+
+
+def get_ecf_players_post_2020_changes(results, ecfdata):
+    """Return ECFDownloadChanges for downloaded player records in ecfdata.
+
+    The last entry for an ECF code in ecfdata is used if the code occurs
+    more than once.
+
+    """
+    downloaded = {}
+    code_index = ecfdata["column_names"].index("ECF_code")
+    name_index = ecfdata["column_names"].index("full_name")
+    club_code_index = (ecfdata["column_names"].index("club_code"),)
+    for data in ecfdata["players"]:
+        ECF_code = data[code_index]
+        if ECF_code is None:
+            ECF_code = ""
+        full_name = data[name_index]
+        if full_name is None:
+            full_name = ""
+        clubcodes = []
+        for i in club_code_index:
+            c = data[i]
+            if isinstance(c, str):
+                clubcodes.append(c)
+            else:
+                clubcodes.append(str(c).zfill(4))
+        clubcodes.sort()
+        downloaded[ECF_code] = dict(
+            ECFactive=True, ECFname=full_name, ECFclubcodes=clubcodes
+        )
+    return _get_ecf_download_changes(
+        results,
+        downloaded,
+        filespec.ECFPLAYER_FILE_DEF,
+        filespec.ECFPLAYERCODE_FIELD_DEF,
+        ecfrecord.ECFrefDBrecordECFplayer,
+        dict(ECFactive=False, ECFclubcodes=[]),
+    )
+
+
+def _report_ecf_download_changes(logwidget, changes, dry_run):
+    """Write summary of changes, and the changes if dry_run, to logwidget."""
+    if not logwidget:
+        return
+    logwidget.append_text(changes.get_summary())
+    if dry_run:
+        for line in changes.get_report():
+            logwidget.append_text_only(line)
+        logwidget.append_text("Dry run: database not changed.")
+
+
 def copy_ecf_clubs_post_2020_rules(
-    results, logwidget=None, ecfdata=None, downloaddate=None, **kwargs
+    results,
+    logwidget=None,
+    ecfdata=None,
+    downloaddate=None,
+    dry_run=False,
+    **kwargs
 ):
-    """Copy downloaded club records in ecfdata to database."""
-    keybyteify = results._keybyteify
+    """Copy downloaded club records in ecfdata to database.
+
+    Only the records which differ from the download are written.  If dry_run
+    is True the changes are reported to logwidget but not applied.
 
+    """
     # downloaddate replaces the datecontrol and ecfdate arguments.
     # Keep the original names within the procedure.
     datecontrol = downloaddate
@@ -56,6 +271,14 @@ def copy_ecf_clubs_post_2020_rules(
                 ]
             )
         )
+    if dry_run:
+        results.start_read_only_transaction()
+        try:
+            changes = get_ecf_clubs_post_2020_changes(results, ecfdata)
+        finally:
+            results.end_read_only_transaction()
+        _report_ecf_download_changes(logwidget, changes, dry_run)
+        return True
     results.start_transaction()
 
     # Update Master file date record.
@@ -108,87 +331,9 @@ def copy_ecf_clubs_post_2020_rules(
         logwidget.append_text(
             "Add or edit ECF Club Code references to Master club file."
         )
-    ecf_codes = set()
-    ecfcursor = results.database_cursor(
-        filespec.ECFCLUB_FILE_DEF, filespec.ECFCLUBCODE_FIELD_DEF
-    )
-    try:
-        for data in ecfdata["clubs"]:
-            club_code = data.get("club_code")
-            if club_code is None:
-                club_code = ""
-            club_name = data.get("club_name")
-            if club_name is None:
-                club_name = ""
-            assoc_code = data.get("assoc_code")
-            if assoc_code is None:
-                assoc_code = ""
-            ecfrec = ecfrecord.ECFrefDBrecordECFclub()
-            record = ecfcursor.nearest(keybyteify(club_code))
-            if record == None:
-                ecfrec.key.recno = None
-                ecfrec.value.ECFcode = club_code
-                ecfrec.value.ECFactive = True
-                ecfrec.value.ECFname = club_name
-                ecfrec.value.ECFcountycode = assoc_code
-                ecf_codes.add(ecfrec.value.ECFcode)
-                ecfrec.put_record(results, filespec.ECFCLUB_FILE_DEF)
-            elif record[0] != club_code:
-                ecfrec.key.recno = None
-                ecfrec.value.ECFcode = club_code
-                ecfrec.value.ECFactive = True
-                ecfrec.value.ECFname = club_name
-                ecfrec.value.ECFcountycode = assoc_code
-                ecf_codes.add(ecfrec.value.ECFcode)
-                ecfrec.put_record(results, filespec.ECFCLUB_FILE_DEF)
-            else:
-                ecfrec.load_instance(
-                    results,
-                    filespec.ECFCLUB_FILE_DEF,
-                    filespec.ECFCLUBCODE_FIELD_DEF,
-                    record,
-                )
-                ecfnew = ecfrec.clone()
-                ecfnew.value.ECFactive = True
-                ecfnew.value.ECFname = club_name
-                ecfnew.value.ECFcountycode = assoc_code
-                ecf_codes.add(ecfrec.value.ECFcode)
-                ecfrec.edit_record(
-                    results,
-                    filespec.ECFCLUB_FILE_DEF,
-                    filespec.ECFCLUBCODE_FIELD_DEF,
-                    ecfnew,
-                )
-
-        # Mark ECF codes not in download as inactive.
-        # Meaning of inactive depends on which download is loaded, latest or
-        # earlier.
-        if logwidget:
-            logwidget.append_text(
-                "Delete ECF Club Code references not in all active clubs."
-            )
-        record = ecfcursor.first()
-        while record:
-            ecfrec = ecfrecord.ECFrefDBrecordECFclub()
-            ecfrec.load_instance(
-                results,
-                filespec.ECFCLUB_FILE_DEF,
-                filespec.ECFCLUBCODE_FIELD_DEF,
-                record,
-            )
-            if ecfrec.value.ECFcode not in ecf_codes:
-                ecfnew = ecfrec.clone()
-                ecfnew.value.ECFactive = False
-                ecfrec.edit_record(
-                    results,
-                    filespec.ECFCLUB_FILE_DEF,
-                    filespec.ECFCLUBCODE_FIELD_DEF,
-                    ecfnew,
-                )
-            record = ecfcursor.next()
-
-    finally:
-        ecfcursor.close()
+    changes = get_ecf_clubs_post_2020_changes(results, ecfdata)
+    _report_ecf_download_changes(logwidget, changes, False)
+    changes.apply(results)
     results.commit()
     if logwidget:
         logwidget.append_text("", timestamp=False)
@@ -205,11 +350,19 @@ def copy_ecf_clubs_post_2020_rules(
 
 
 def copy_ecf_players_post_2020_rules(
-    results, logwidget=None, ecfdata=None, downloaddate=None, **kwargs
+    results,
+    logwidget=None,
+    ecfdata=None,
+    downloaddate=None,
+    dry_run=False,
+    **kwargs
 ):
-    """Copy downloaded player records in ecfdata to database."""
-    keybyteify = results._keybyteify
+    """Copy downloaded player records in ecfdata to database.
+
+    Only the records which differ from the download are written.  If dry_run
+    is True the changes are reported to logwidget but not applied.
 
+    """
     # downloaddate replaces the datecontrol argument.
     # ecfdate is replaced by ... in ecfdata.
     # Keep the original names within the procedure.
@@ -232,6 +385,14 @@ def copy_ecf_players_post_2020_rules(
                 ]
             )
         )
+    if dry_run:
+        results.start_read_only_transaction()
+        try:
+            changes = get_ecf_players_post_2020_changes(results, ecfdata)
+        finally:
+            results.end_read_only_transaction()
+        _report_ecf_download_changes(logwidget, changes, dry_run)
+        return True
     results.start_transaction()
 
     # Update Master file date record.
@@ -282,96 +443,10 @@ def copy_ecf_players_post_2020_rules(
         logwidget.append_text(
             "Add or edit ECF Grading Code references to Master player file."
         )
-    ecf_codes = set()
-    ecfcursor = results.database_cursor(
-        filespec.ECFPLAYER_FILE_DEF, filespec.ECFPLAYERCODE_FIELD_DEF
-    )
-    try:
-        code_index = ecfdata["column_names"].index("ECF_code")
-        name_index = ecfdata["column_names"].index("full_name")
-        club_code_index = (ecfdata["column_names"].index("club_code"),)
-        for data in ecfdata["players"]:
-            ECF_code = data[code_index]
-            if ECF_code is None:
-                ECF_code = ""
-            full_name = data[name_index]
-            if full_name is None:
-                full_name = ""
-            clubcodes = []
-            for i in club_code_index:
-                c = data[i]
-                if isinstance(c, str):
-                    clubcodes.append(c)
-                else:
-                    clubcodes.append(str(c).zfill(4))
-            clubcodes.sort()
-            ecfrec = ecfrecord.ECFrefDBrecordECFplayer()
-            record = ecfcursor.nearest(keybyteify(ECF_code))
-            if record == None:
-                ecfrec.key.recno = None
-                ecfrec.value.ECFcode = ECF_code
-                ecfrec.value.ECFactive = True
-                ecfrec.value.ECFname = full_name
-                ecfrec.value.ECFclubcodes = clubcodes
-                ecf_codes.add(ecfrec.value.ECFcode)
-                ecfrec.put_record(results, filespec.ECFPLAYER_FILE_DEF)
-            elif record[0] != ECF_code:
-                ecfrec.key.recno = None
-                ecfrec.value.ECFcode = ECF_code
-                ecfrec.value.ECFactive = True
-                ecfrec.value.ECFname = full_name
-                ecfrec.value.ECFclubcodes = clubcodes
-                ecf_codes.add(ecfrec.value.ECFcode)
-                ecfrec.put_record(results, filespec.ECFPLAYER_FILE_DEF)
-            else:
-                ecfrec.load_instance(
-                    results,
-                    filespec.ECFPLAYER_FILE_DEF,
-                    filespec.ECFPLAYERCODE_FIELD_DEF,
-                    record,
-                )
-                ecfnew = ecfrec.clone()
-                ecfnew.value.ECFactive = True
-                ecfnew.value.ECFname = full_name
-                ecfnew.value.ECFclubcodes = clubcodes
-                ecf_codes.add(ecfrec.value.ECFcode)
-                ecfrec.edit_record(
-                    results,
-                    filespec.ECFPLAYER_FILE_DEF,
-                    filespec.ECFPLAYERCODE_FIELD_DEF,
-                    ecfnew,
-                )
-
-        # Mark ECF codes not in download as inactive.
-        # Meaning of inactive depends on which download is loaded, latest or
-        # earlier.
-        if logwidget:
-            logwidget.append_text(
-                "Mark ECF Grading Codes not in player download inactive."
-            )
-        clubcodes = []
-        record = ecfcursor.first()
-        while record:
-            ecfrec = ecfrecord.ECFrefDBrecordECFplayer()
-            ecfrec.load_instance(
-                results,
-                filespec.ECFPLAYER_FILE_DEF,
-                filespec.ECFPLAYERCODE_FIELD_DEF,
-                record,
-            )
-            if ecfrec.value.ECFcode not in ecf_codes:
-                ecfnew = ecfrec.clone()
-                ecfnew.value.ECFactive = False
-                ecfnew.value.ECFclubcodes = clubcodes
-                ecfrec.edit_record(
-                    results,
-                    filespec.ECFPLAYER_FILE_DEF,
-                    filespec.ECFPLAYERCODE_FIELD_DEF,
-                    ecfnew,
-                )
-            record = ecfcursor.next()
-    finally:
-        ecfcursor.close()
+    changes = get_ecf_players_post_2020_changes(results, ecfdata)
+    _report_ecf_download_changes(logwidget, changes, False)
+    changes.apply(results)
+    stored_codes = changes.codes
 
     # Match grading codes for new players to copied master list
     # Any left unlinked are probably merged before master list published
@@ -398,9 +473,9 @@ def copy_ecf_players_post_2020_rules(
             if mr.value.__dict__:
                 if mr.value.playercode is None:
                     if mr.value.playerecfcode is not None:
-                        if ecfrecord.get_ecf_player_for_grading_code(
-                            results, mr.value.playerecfcode
-                        ):
+                        # Same test as get_ecf_player_for_grading_code,
+                        # one record for the code, without reading it.
+                        if stored_codes.get(mr.value.playerecfcode) == 1:
                             newmr = mr.clone()
                             newmr.value.playerecfcode = None
                             newmr.value.playercode = mr.value.playerecfcode
@@ -57,7 +57,7 @@ def validate_ecf_ogd_players_post_2006_rules(
     duplicates = []
     checkfails = []
     r = csv.DictReader(
-        [o.decode("iso-8859-1") for o in ogdfile.textlines], ogdfile.fieldnames
+        (o.decode("iso-8859-1") for o in ogdfile.textlines), ogdfile.fieldnames
     )
     for row in r:
         try:
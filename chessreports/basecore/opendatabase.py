@@ -0,0 +1,92 @@
+# opendatabase.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Open an existing results database without the Tk user interface.
+
+The database engine is chosen the way the Open action in the application
+chooses it: the engine must be installed and be the only one able to open
+the database in the folder.
+
+"""
+
+import importlib
+
+from solentware_base import modulequery
+
+from .. import APPLICATION_DATABASE_MODULE
+from ..core.filespec import FileSpec
+
+_RESULTS_DATABASE = "ResultsDatabase"
+
+
+class OpenDatabaseError(Exception):
+    """Exception raised when a results database cannot be opened."""
+
+
+def get_database_engine(database_folder):
+    """Return name of database engine module for database in folder."""
+    existing = modulequery.modules_for_existing_databases(
+        database_folder, FileSpec()
+    )
+    if not existing:
+        raise OpenDatabaseError(
+            " ".join((database_folder, "does not contain a results database"))
+        )
+    if len(existing) > 1:
+        raise OpenDatabaseError(
+            " ".join(
+                (database_folder, "contains more than one results database")
+            )
+        )
+    enginename = None
+    for name, module in modulequery.installed_database_modules().items():
+        if module in existing[0]:
+            if enginename is not None:
+                raise OpenDatabaseError(
+                    " ".join(
+                        (
+                            "Several modules able to open database in",
+                            database_folder,
+                        )
+                    )
+                )
+            enginename = name
+    if enginename is None:
+        raise OpenDatabaseError(
+            " ".join(("No modules able to open database in", database_folder))
+        )
+    return enginename
+
+
+def get_database_class(enginename):
+    """Return ResultsDatabase class for database engine module enginename."""
+    try:
+        modulename = APPLICATION_DATABASE_MODULE[enginename]
+    except KeyError as exc:
+        raise OpenDatabaseError(
+            " ".join((enginename, "is not a supported database engine"))
+        ) from exc
+    try:
+        module = importlib.import_module(modulename)
+    except ImportError as exc:
+        raise OpenDatabaseError(
+            " ".join(("Unable to import", modulename))
+        ) from exc
+    return getattr(module, _RESULTS_DATABASE)
+
+
+def open_results_database(database_folder, enginename=None, **kargs):
+    """Return opened results database in database_folder.
+
+    The engine is found from the database files if enginename is None.
+    kargs are passed to the ResultsDatabase class for the engine.
+
+    """
+    if enginename is None:
+        enginename = get_database_engine(database_folder)
+    database = get_database_class(enginename)(database_folder, **kargs)
+    message = database.open_database()
+    if message:
+        raise OpenDatabaseError(message)
+    return database
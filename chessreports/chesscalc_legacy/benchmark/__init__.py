@@ -0,0 +1,5 @@
+# __init__.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Identify benchmark as a sub-package in chesscalc_legacy."""
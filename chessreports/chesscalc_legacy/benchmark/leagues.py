@@ -0,0 +1,163 @@
+# leagues.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Synthetic league results for timing player performance calculations.
+
+A league has divisions of teams, each team belongs to a club and has a
+squad of players.  Matches are played between all teams in a division on a
+number of boards.  Divisions are connected by players who sometimes play
+for their club's team in another division (transfers), and by a number of
+single games between players in adjacent divisions (weak links).
+
+The games are returned in the form given by the function
+core.resultsrecord.get_events_for_performance_calculation, so they can be
+given to the classes in the performances module without a database.
+
+"""
+
+import random
+
+
+class SyntheticLeague:
+    """Generate games for a synthetic league."""
+
+    def __init__(
+        self,
+        divisions=4,
+        teams_per_division=8,
+        clubs=10,
+        squad_size=8,
+        boards=5,
+        rounds=2,
+        transfers=0.05,
+        weak_links=0,
+        draw_rate=0.2,
+        seed=0,
+    ):
+        """Initialise league description.
+
+        transfers is the probability a board in a match is played by a member
+        of a squad of the club's team in another division.
+
+        weak_links is the number of extra games between random players in
+        each pair of adjacent divisions.
+
+        """
+        super().__init__()
+        self.divisions = divisions
+        self.teams_per_division = teams_per_division
+        self.clubs = clubs
+        self.squad_size = squad_size
+        self.boards = boards
+        self.rounds = rounds
+        self.transfers = transfers
+        self.weak_links = weak_links
+        self.draw_rate = draw_rate
+        self.seed = seed
+
+    def _create_squads(self, generator):
+        """Return squads, club teams, and player strengths for league."""
+        squads = []
+        club_teams = {}
+        strength = []
+        for division in range(self.divisions):
+            squads.append([])
+            for team in range(self.teams_per_division):
+                club = (division * self.teams_per_division + team) % self.clubs
+                club_teams.setdefault(club, []).append((division, team))
+                first = len(strength)
+                for _ in range(self.squad_size):
+                    strength.append(generator.gauss(100 - division * 15, 20))
+                squads[-1].append(
+                    (club, list(range(first, first + self.squad_size)))
+                )
+        return squads, club_teams, strength
+
+    def _pick_player(self, generator, squads, club_teams, division, team):
+        """Return player from team's squad or squad of another club team."""
+        club, squad = squads[division][team]
+        if generator.random() < self.transfers:
+            others = [(d, t) for d, t in club_teams[club] if d != division]
+            if others:
+                other_division, other_team = generator.choice(others)
+                squad = squads[other_division][other_team][-1]
+        return generator.choice(squad)
+
+    def _play(self, generator, strength, home, away):
+        """Return result, 'h' 'd' or 'a', of a game between home and away."""
+        if generator.random() < self.draw_rate:
+            return "d"
+        expected = 1 / (1 + 10 ** ((strength[away] - strength[home]) / 50))
+        if generator.random() < expected:
+            return "h"
+        return "a"
+
+    def get_games(self):
+        """Return list of (home player, away player, result) for league."""
+        generator = random.Random(self.seed)
+        squads, club_teams, strength = self._create_squads(generator)
+        games = []
+        for division in range(self.divisions):
+            teams = range(self.teams_per_division)
+            for _ in range(self.rounds):
+                for home in teams:
+                    for away in teams:
+                        if home == away:
+                            continue
+                        for _ in range(self.boards):
+                            homeplayer = self._pick_player(
+                                generator, squads, club_teams, division, home
+                            )
+                            awayplayer = self._pick_player(
+                                generator, squads, club_teams, division, away
+                            )
+                            if homeplayer == awayplayer:
+                                continue
+                            games.append(
+                                (
+                                    homeplayer,
+                                    awayplayer,
+                                    self._play(
+                                        generator,
+                                        strength,
+                                        homeplayer,
+                                        awayplayer,
+                                    ),
+                                )
+                            )
+        for division in range(1, self.divisions):
+            upper = [p for c, s in squads[division - 1] for p in s]
+            lower = [p for c, s in squads[division] for p in s]
+            for _ in range(self.weak_links):
+                homeplayer = generator.choice(upper)
+                awayplayer = generator.choice(lower)
+                games.append(
+                    (
+                        homeplayer,
+                        awayplayer,
+                        self._play(
+                            generator, strength, homeplayer, awayplayer
+                        ),
+                    )
+                )
+        return games
+
+    def get_calculation_data(self):
+        """Return (games, players, game_opponent, opponents, names)."""
+        games = {}
+        players = {}
+        game_opponent = {}
+        opponents = {}
+        names = {}
+        reward = {"h": (1, -1), "d": (0, 0), "a": (-1, 1)}
+        for key, (home, away, result) in enumerate(self.get_games()):
+            home_reward, away_reward = reward[result]
+            games[key] = {home: home_reward, away: away_reward}
+            game_opponent[key] = {home: away, away: home}
+            for player, opponent in ((home, away), (away, home)):
+                players.setdefault(player, set()).add(key)
+                opponents.setdefault(player, set()).add(opponent)
+                if player not in names:
+                    names[player] = " ".join(("Player", str(player)))
+        return games, players, game_opponent, opponents, names
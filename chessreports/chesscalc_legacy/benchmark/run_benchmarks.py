@@ -0,0 +1,77 @@
+# run_benchmarks.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Time performance calculations and compare with a saved baseline.
+
+Run as 'python -m chessreports.chesscalc_legacy.benchmark.run_benchmarks'.
+The exit status is 1 if any step is slower than the baseline by more than
+the tolerance.
+
+"""
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    from . import timings
+
+    parser = argparse.ArgumentParser(
+        description="Time performance calculations on synthetic leagues."
+    )
+    parser.add_argument(
+        "scales",
+        nargs="*",
+        choices=sorted(timings.SCALES),
+        help="league scales to time (default all)",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="best of repeat runs"
+    )
+    parser.add_argument(
+        "-b", "--baseline", help="JSON baseline file to compare with"
+    )
+    parser.add_argument(
+        "-s",
+        "--save",
+        action="store_true",
+        help="save timings as the baseline file",
+    )
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="slowdown ratio reported as a regression",
+    )
+    args = parser.parse_args()
+    results = timings.run_benchmarks(
+        scales=args.scales or None, repeat=args.repeat
+    )
+    for scale, steps in results.items():
+        print(
+            scale,
+            "(" + str(steps["games"]),
+            "games,",
+            str(steps["players"]),
+            "players)",
+        )
+        for step, seconds in sorted(steps.items()):
+            if step not in ("games", "players"):
+                print("\t{:<40}{:>10.4f}".format(step, seconds))
+    regressions = []
+    if args.baseline and os.path.exists(args.baseline) and not args.save:
+        regressions = timings.find_regressions(
+            results, timings.load_baseline(args.baseline), args.tolerance
+        )
+        for scale, step, base, seconds in regressions:
+            print(
+                "Regression:",
+                scale,
+                step,
+                "{:.4f} -> {:.4f}".format(base, seconds),
+            )
+    if args.baseline and args.save:
+        timings.save_baseline(results, args.baseline)
+    if regressions:
+        raise SystemExit(1)
@@ -0,0 +1,144 @@
+# timings.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Time the player performance calculation pipeline on synthetic leagues.
+
+Timings for each scale are the best of a number of repeats, in seconds,
+and can be saved as a JSON baseline for comparison with later runs.
+
+"""
+
+import copy
+import json
+import time
+
+from ..core import performances
+from .leagues import SyntheticLeague
+
+SCALES = {
+    "small": dict(divisions=2, teams_per_division=6, squad_size=6),
+    "medium": dict(divisions=6, teams_per_division=10, squad_size=8),
+    "large": dict(
+        divisions=12, teams_per_division=12, clubs=40, squad_size=10
+    ),
+    "weak": dict(
+        divisions=8,
+        teams_per_division=10,
+        squad_size=8,
+        transfers=0,
+        weak_links=2,
+    ),
+}
+
+FIND_DISTINCT_POPULATIONS = "find_distinct_populations"
+FIND_POPULATION_FRACTURE_POINTS = "find_population_fracture_points"
+REBUILD_POPULATIONS = "PopulationMap.rebuild_populations"
+ITERATIONS_UNTIL_STABLE = "do_iterations_until_stable"
+ITERATIONS_UNTIL_STABLE_ARRAYS = "do_iterations_until_stable use_arrays"
+GET_STATISTICS = "get_statistics"
+
+
+def _timed(function, *args, **kwargs):
+    """Return (seconds, answer) for call of function with arguments."""
+    start = time.perf_counter()
+    answer = function(*args, **kwargs)
+    return time.perf_counter() - start, answer
+
+
+def time_pipeline(data):
+    """Return dict of seconds taken by each step for calculation data.
+
+    data is (games, players, game_opponent, opponents, names) as returned by
+    SyntheticLeague.get_calculation_data.  data is not changed.
+
+    """
+    games, players, game_opponent, opponents = copy.deepcopy(data[:-1])
+    timings = {}
+    perf = performances.Performances()
+    perf.get_events(games, players, game_opponent, opponents)
+    timings[FIND_DISTINCT_POPULATIONS] = _timed(
+        perf.find_distinct_populations
+    )[0]
+    perf.get_largest_population()
+    perf.find_distinct_populations()
+    timings[FIND_POPULATION_FRACTURE_POINTS] = _timed(
+        perf.find_population_fracture_points
+    )[0]
+    population_map = performances.PopulationMap(perf)
+    timings[REBUILD_POPULATIONS] = _timed(population_map.rebuild_populations)[
+        0
+    ]
+    for name, use_arrays in (
+        (ITERATIONS_UNTIL_STABLE, False),
+        (ITERATIONS_UNTIL_STABLE_ARRAYS, True),
+    ):
+        calculation = performances.Calculation(
+            perf.populations[0], perf.games, perf.game_opponent, iterations=50
+        )
+        timings[name] = _timed(
+            calculation.do_iterations_until_stable, use_arrays=use_arrays
+        )[0]
+    calculation = performances.Calculation(
+        perf.populations[0], perf.games, perf.game_opponent, iterations=50
+    )
+    calculation.do_iterations()
+    timings[GET_STATISTICS] = _timed(calculation.get_statistics)[0]
+    return timings
+
+
+def run_benchmarks(scales=None, repeat=3):
+    """Return {scale: {step: seconds, ...}, ...} for scales.
+
+    scales is a list of names in SCALES, default all.  The time for each
+    step is the best of repeat runs.
+
+    """
+    if scales is None:
+        scales = list(SCALES)
+    results = {}
+    for scale in scales:
+        data = SyntheticLeague(**SCALES[scale]).get_calculation_data()
+        best = {}
+        for _ in range(repeat):
+            for step, seconds in time_pipeline(data).items():
+                if step not in best or seconds < best[step]:
+                    best[step] = seconds
+        best["games"] = len(data[0])
+        best["players"] = len(data[1])
+        results[scale] = best
+    return results
+
+
+def save_baseline(results, path):
+    """Save results from run_benchmarks as JSON in file path."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    """Return results saved as JSON in file path."""
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def find_regressions(results, baseline, tolerance=1.25):
+    """Return list of steps slower than baseline by more than tolerance.
+
+    Each item is (scale, step, baseline seconds, seconds).  Steps, and scales,
+    not in both results and baseline are ignored.
+
+    """
+    regressions = []
+    for scale, timings in sorted(results.items()):
+        if scale not in baseline:
+            continue
+        for step, seconds in sorted(timings.items()):
+            if step in ("games", "players"):
+                continue
+            base = baseline[scale].get(step)
+            if base is None:
+                continue
+            if seconds > base * tolerance:
+                regressions.append((scale, step, base, seconds))
+    return regressions
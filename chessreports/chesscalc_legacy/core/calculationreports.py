@@ -0,0 +1,494 @@
+# calculationreports.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Report text for player performance and season prediction calculations.
+
+The report classes do the calculations and return the report text as a list
+of str.  The Tk report widgets in chesscalc_legacy.gui and the batch tool
+display or write the text.
+
+"""
+
+from . import performances
+from . import seasonperformances
+
+
+def get_names(players, names):
+    """Return names with an entry for each player in players.
+
+    The str of the player key is used for players not in names.
+
+    """
+    if names is None:
+        names = {}
+    for key in players.keys():
+        if key not in names:
+            names[key] = str(key)
+    return names
+
+
+class PerformanceReport:
+    """Chess performance calculation report text."""
+
+    def __init__(
+        self,
+        games,
+        players,
+        game_opponent,
+        opponents,
+        names,
+        warmstart=None,
+        cold_start=False,
+    ):
+        """Note games for performance calculation.
+
+        warmstart is a performances.WarmStart instance or None.  The
+        iteration starts from the saved performances in warmstart if given,
+        and cold_start True says report the iterations a calculation
+        without warmstart would take.
+
+        """
+        super().__init__()
+        self.warmstart = warmstart
+        self.cold_start = cold_start
+        self.games = games
+        self.players = players
+        self.game_opponent = game_opponent
+        self.opponents = opponents
+        self.names = get_names(players, names)
+        self.performance = None
+        self.calculation = None
+
+    def calculate_performance(self):
+        """Calculate performances by iteration and return report text."""
+        if self.performance is not None:
+            return []
+
+        # Output is buffered for, in practical terms, an infinite improvement
+        # in time taken to display answer on OpenBSD.
+        output = []
+
+        self.performance = performances.Performances()
+        self.performance.get_events(
+            self.games, self.players, self.game_opponent, self.opponents
+        )
+        self.performance.find_distinct_populations()
+        if not self.performance.populations:
+            output.append("\n\nNo players in selected events")
+            return output
+        pops = [len(p) for p in self.performance.populations]
+        if len(self.performance.populations) > 1:
+            output.append(
+                "".join(
+                    (
+                        "\n\nPlayers in selected events ",
+                        "do not form a connected population.\n",
+                    )
+                )
+            )
+            output.append(
+                "".join(
+                    (
+                        "\tPlayers in populations are: ",
+                        repr(pops),
+                        "\n",
+                    )
+                )
+            )
+            if (max(pops) * 100) / sum(pops) > 95:
+                self.performance.get_largest_population()
+                self.performance.find_distinct_populations()
+                output.append(
+                    "".join(
+                        (
+                            "\tLargest population is over 95% of total ",
+                            "for selected events.\n",
+                            "\tCalculation continued using largest ",
+                            "population.\n",
+                        )
+                    )
+                )
+            else:
+                output.append(
+                    "".join(
+                        (
+                            "\tLargest population is less than 95% of total ",
+                            "for selected events.\n",
+                        )
+                    ),
+                )
+                return output
+        else:
+            output.append(
+                "".join(
+                    (
+                        "\n\nAll players for selected events ",
+                        "used in calculation.\n",
+                    )
+                )
+            )
+        cscgoo = self.performance.cycle_state_connected_graph_of_opponents()
+        if cscgoo:
+            output.append(
+                "".join(
+                    (
+                        "\nNo opponent cycles in selected events.",
+                        ".\n\nShortest possible is A plays B, B plays C, C ",
+                        "plays A: a 3-cycle.\n\nThe workaround is attach a ",
+                        "3-cycle using two artifical player names to an ",
+                        "existing player who plays games against only one ",
+                        "opponent.  The three added games should be draws.",
+                    )
+                )
+            )
+            return output
+        output.append(
+            "".join(
+                (
+                    "\nNumber of players in performance calculation is: ",
+                    repr(max(pops)),
+                    "\n",
+                )
+            )
+        )
+
+        s_calculation = performances.Calculation(
+            self.performance.populations[0],
+            self.performance.games,
+            self.performance.game_opponent,
+            iterations=1000,
+        )
+        if self.warmstart is None:
+            (
+                iterations,
+                delta,
+                stable,
+            ) = s_calculation.do_iterations_until_stable(
+                cycles=cscgoo, use_arrays=True
+            )
+        else:
+            (
+                iterations,
+                delta,
+                stable,
+                started,
+                cold_iterations,
+            ) = s_calculation.do_warm_start_iterations_until_stable(
+                self.warmstart,
+                cycles=cscgoo,
+                use_arrays=True,
+                cold_start=self.cold_start,
+            )
+        if not stable:
+            output.append(
+                "".join(
+                    (
+                        "\nNo opponent cycles in selected events like: A ",
+                        "plays B, B plays C, C plays A.\n\n",
+                        "This is a 3-cycle and when present, the usual case, ",
+                        "ensures the iteration will converge.",
+                        "\n\nAn n-cycle, n>3, exists but this does not ",
+                        "ensure the iteration will converge: it depends on ",
+                        "the pattern of results of the games in the cycle.  ",
+                        "This case seems to be one which does not converge.",
+                        "\n\nhe workaround is attach a 3-cycle, using two ",
+                        "artifical player names, to an existing player who ",
+                        "plays games against only one opponent if possible.  ",
+                        "The three added games should be draws.",
+                    )
+                )
+            )
+            return output
+        self.calculation = s_calculation
+        output.append(
+            "".join(
+                (
+                    "Iterations used: ",
+                    str(iterations),
+                    "      Delta: ",
+                    str(delta),
+                    "\n",
+                )
+            )
+        )
+        if self.warmstart is not None:
+            output.extend(
+                seasonperformances.get_warm_start_report(
+                    iterations,
+                    started,
+                    len(s_calculation.persons),
+                    cold_iterations,
+                )
+            )
+        output.extend(self.report_performances())
+        return output
+
+    def report_performances(self):
+        """Return report text listing calculated performances."""
+        output = []
+        max_performance = round(
+            max(
+                p.get_calculated_performance()
+                for p in self.calculation.persons.values()
+            )
+        )
+        player_order = sorted(
+            [
+                (
+                    self.names[p][0],
+                    -pr.game_count,
+                    p,
+                    self.names[p][-1],
+                    -(
+                        round(pr.get_calculated_performance())
+                        - max_performance
+                    ),
+                )
+                for p, pr in self.calculation.persons.items()
+            ]
+        )
+        performance_order = sorted(
+            [
+                (
+                    -pr.get_calculated_performance(),
+                    -pr.game_count,
+                    p,
+                    self.names[p][-1],
+                    -(
+                        round(pr.get_calculated_performance())
+                        - max_performance
+                    ),
+                )
+                for p, pr in self.calculation.persons.items()
+            ]
+        )
+        output.append("\n\nPerformances in name order:\n\n")
+        for item in player_order:
+            output.append(
+                "".join(
+                    (
+                        item[3],
+                        "\t\t\t",
+                        str(item[4]),
+                        "\t",
+                        "(",
+                        str(-item[1]),
+                        ")\t\n",
+                    )
+                )
+            )
+        output.append("\n\nPerformances in performance order:\n\n")
+        for item in performance_order:
+            output.append(
+                "".join(
+                    (
+                        str(item[4]),
+                        "\t",
+                        "(",
+                        str(-item[1]),
+                        ")\t\t",
+                        item[3],
+                        "\n",
+                    )
+                )
+            )
+        if self.performance.discarded_players is not None:
+            discarded_players = sorted(
+                [self.names[p] for p in self.performance.discarded_players]
+            )
+            output.append(
+                "\n\nPlayers not included in performance calculation:\n\n"
+            )
+            output.append("\n".join((n[-1] for n in discarded_players)))
+        return output
+
+
+class PredictionReport:
+    """Chess performance prediction by season report text."""
+
+    def __init__(
+        self,
+        seasons,
+        games,
+        players,
+        game_opponent,
+        opponents,
+        names,
+        warmstart=None,
+        cold_start=False,
+    ):
+        """Note games by season for performance predictions.
+
+        warmstart and cold_start have the same meaning as for the
+        PerformanceReport class.
+
+        """
+        super().__init__()
+        self.warmstart = warmstart
+        self.cold_start = cold_start
+        self.seasons = seasons
+        self.games = games
+        self.players = players
+        self.game_opponent = game_opponent
+        self.opponents = opponents
+        self.names = get_names(players, names)
+        self.predictions = None
+        self.calculations = None
+
+    def calculate_prediction(self):
+        """Calculate predicted performance and return report text.
+
+        The reports for performance difference bucket sizes 5, 1, and 10
+        follow the report of the season calculations.
+
+        """
+        if self.predictions is not None:
+            return []
+
+        # Output is buffered for, in practical terms, an infinite improvement
+        # in time taken to display answer on OpenBSD.
+        output = []
+
+        self.predictions = {}
+        report, self.calculations = seasonperformances.calculate_seasons(
+            self.seasons,
+            self.games,
+            self.game_opponent,
+            self.opponents,
+            warmstart=self.warmstart,
+            cold_start=self.cold_start,
+        )
+        output.extend(report)
+
+        for ref in sorted(self.calculations):
+            ref_start = seasonperformances.get_season_start(ref)
+            self.predictions[ref] = {}
+            self.predictions[ref][ref] = performances.Distribution(
+                self.calculations[ref], self.calculations[ref]
+            )
+            output.append(
+                "".join(
+                    (
+                        "\nSeason starting ",
+                        ref_start,
+                        " used to partition results.\nPlayers: ",
+                        str(len(self.predictions[ref][ref].players)),
+                        "      games: ",
+                        str(len(self.predictions[ref][ref].games)),
+                        "\n",
+                    )
+                )
+            )
+            for target in sorted(self.calculations):
+                if ref == target:
+                    continue
+                target_start = seasonperformances.get_season_start(target)
+                self.predictions[ref][target] = performances.Distribution(
+                    self.calculations[ref], self.calculations[target]
+                )
+                output.append(
+                    "".join(
+                        (
+                            "Players: ",
+                            str(len(self.predictions[ref][target].players)),
+                            "      games: ",
+                            str(len(self.predictions[ref][target].games)),
+                            "  comparable in season starting ",
+                            target_start,
+                            "\n",
+                        )
+                    )
+                )
+
+        for slot_size in (5, 1, 10):
+            output.extend(self.report_prediction(slot_size))
+        return output
+
+    def report_prediction(self, bucket_size):
+        """Return report text of prediction for bucket size."""
+        output = []
+        output.append(
+            "".join(
+                (
+                    "\n\nReports with buckets of width ",
+                    str(bucket_size),
+                    " for performance difference between players of a ",
+                    "game.\n\n",
+                )
+            )
+        )
+        for ref in sorted(self.predictions):
+            ref_start = seasonperformances.get_season_start(ref)
+            self.predictions[ref][ref].calculate_distribution(bucket_size)
+            distribution = self.predictions[ref][ref].distributions[
+                bucket_size
+            ]
+            output.append(
+                "".join(
+                    (
+                        "\nDistribution calculated from results for season ",
+                        "starting ",
+                        ref_start,
+                        "\n",
+                    )
+                )
+            )
+            output.extend(_get_distribution_lines(distribution))
+
+        for target in sorted(self.predictions):
+            target_start = seasonperformances.get_season_start(target)
+            for ref in sorted(self.predictions):
+                if ref == target:
+                    continue
+                ref_start = seasonperformances.get_season_start(ref)
+                self.predictions[ref][target].calculate_distribution(
+                    bucket_size
+                )
+                distribution = self.predictions[ref][target].distributions[
+                    bucket_size
+                ]
+                output.append(
+                    "".join(
+                        (
+                            "\n",
+                            target_start,
+                            " season results partitioned by performances in ",
+                            "season ",
+                            ref_start,
+                            "\n",
+                        )
+                    )
+                )
+                output.extend(_get_distribution_lines(distribution))
+        return output
+
+
+def _get_distribution_lines(distribution):
+    """Return report lines for buckets in distribution."""
+    output = []
+    for bucket in sorted(distribution):
+        slot = distribution[bucket]
+        percent = round(
+            ((slot.wins * 2 + slot.draws) * 50)
+            / (slot.wins + slot.draws + slot.losses),
+            1,
+        )
+        output.append(
+            "".join(
+                (
+                    "< ",
+                    str(slot.base + slot.width),
+                    "\t\t+",
+                    str(slot.wins),
+                    "\t=",
+                    str(slot.draws),
+                    "\t-",
+                    str(slot.losses),
+                    "\t\t",
+                    str(percent),
+                    "\n",
+                )
+            )
+        )
+    return output
@@ -6,6 +6,9 @@
 
 import math
 import collections
+import array
+import itertools
+from ast import literal_eval
 
 _REWARD_TO_RESULT = {1: 1, 0: 0.5, -1: 0}
 _REVERSE_ACTUAL = {1: 0, 0.5: 0.5, 0: 1}
@@ -68,6 +71,19 @@ class Performances:
         self.statistics = None
         self.discarded_populations = None
         self.discarded_players = None
+        self._population_sets = None
+
+    def get_population_sets(self):
+        """Return PopulationSets instance for self.players, creating if needed.
+
+        The instance is discarded when the games or players are changed.
+
+        """
+        if self._population_sets is None:
+            self._population_sets = PopulationSets(
+                self.players, self.game_opponent
+            )
+        return self._population_sets
 
     def split_players_into_populations(self, allplayers):
         """Return players split into distinct populations.
@@ -76,23 +92,7 @@ class Performances:
         population by at least one path stepping via opponents in a game.
 
         """
-        players = set(allplayers)
-        populations = []
-        while len(players) > 0:
-            populations.append([])
-            subpop = [[players.pop()]]
-            populations[-1].extend(subpop[-1])
-            while len(subpop[-1]) > 0:
-                opps = []
-                for person in subpop[-1]:
-                    for game in self.players[person]:
-                        opponent = self.game_opponent[game][person]
-                        if opponent in players:
-                            opps.append(opponent)
-                            players.remove(opponent)
-                subpop.append(opps)
-                populations[-1].extend(opps)
-        return populations
+        return self.get_population_sets().split(allplayers)
 
     def find_distinct_populations(self):
         """Set self.populations as the distinct populations."""
@@ -115,23 +115,10 @@ class Performances:
         """
         if self.opponents is None:
             return None
-        subpopulations = [[list(population)]]
-        players = set(population)
-        removed = []
-        while len(players) > 0:
-            removed.append(
-                [
-                    p
-                    for p in players
-                    if len(self.opponents[p]) == len(subpopulations)
-                ]
-            )
-            for person in removed[-1]:
-                players.remove(person)
-            subpopulations.append(self.split_players_into_populations(players))
-            if len(subpopulations[-1]) > 1:
-                break
-        return subpopulations, removed
+        opponents = self.opponents
+        return self.get_population_sets().find_fracture_point(
+            population, lambda player: len(opponents[player])
+        )
 
     def find_population_fracture_points(self):
         """Set sub-populations as players removed until population splits."""
@@ -153,11 +140,13 @@ class Performances:
         self.players = players
         self.game_opponent = game_opponent
         self.opponents = opponents
+        self._population_sets = None
 
     def get_largest_population(self):
         """Trim the games to match the largest connected population."""
         if len(self.populations) < 2:
             return
+        self._population_sets = None
         pops = sorted([(len(p), p) for p in self.populations])
         self.discarded_populations = [p[-1] for p in pops[:-1]]
         self.populations = pops[-1][-1]
@@ -214,9 +203,172 @@ class Performances:
         return None
 
 
+class PopulationSets:
+    """Disjoint-set partitioning of players into distinct populations.
+
+    The players are given dense integer indicies and the opponents of each
+    player are converted to a tuple of indicies once.  Populations are found
+    by union operations along the edges between players rather than by a
+    breadth-first search of the games.
+
+    """
+
+    def __init__(self, players, game_opponent):
+        """Initialise opponent indicies from players and game_opponent."""
+        super().__init__()
+        self.keys = list(players)
+        self.index = {key: count for count, key in enumerate(self.keys)}
+        index = self.index
+        self.adjacent = tuple(
+            tuple(
+                {
+                    index[game_opponent[game][person]]
+                    for game in players[person]
+                }
+            )
+            for person in self.keys
+        )
+
+    @staticmethod
+    def _find(parent, item):
+        """Return root of set containing item compressing path on the way."""
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def _union(self, parent, size, item, other):
+        """Merge sets containing item and other and return True if merged."""
+        find = self._find
+        item = find(parent, item)
+        other = find(parent, other)
+        if item == other:
+            return False
+        if size[item] < size[other]:
+            item, other = other, item
+        parent[other] = item
+        size[item] += size[other]
+        return True
+
+    def _group(self, parent, members):
+        """Return list of populations, as lists of keys, for members."""
+        find = self._find
+        keys = self.keys
+        groups = {}
+        for item in members:
+            groups.setdefault(find(parent, item), []).append(keys[item])
+        return list(groups.values())
+
+    def split(self, allplayers):
+        """Return players split into distinct populations.
+
+        Only edges between players in allplayers are used to connect the
+        players.
+
+        """
+        index = self.index
+        members = {index[p] for p in allplayers}
+        parent = list(range(len(self.keys)))
+        size = [1] * len(self.keys)
+        adjacent = self.adjacent
+        union = self._union
+        for item in members:
+            for other in adjacent[item]:
+                if other in members:
+                    union(parent, size, item, other)
+        return self._group(parent, members)
+
+    def _add_players(self, parent, size, active, players):
+        """Add players to active set and return change in population count."""
+        adjacent = self.adjacent
+        union = self._union
+        change = 0
+        for item in players:
+            active[item] = True
+            change += 1
+            for other in adjacent[item]:
+                if active[other]:
+                    if union(parent, size, item, other):
+                        change -= 1
+        return change
+
+    def find_fracture_point(self, population, degree):
+        """Return pre-fracture sub-population and post-fracture populations.
+
+        The return value is the same as the Performances method which calls
+        this method, where degree(player) gives the number of opponents used
+        to decide when a player is removed.
+
+        Removing the players with degree 1, 2, and so on, in turn is replayed
+        in reverse as additions of players with decreasing degree.  A first
+        pass counts the populations at each level to find the fracture
+        point, and a second pass collects the populations at that level.
+        Each pass does about one union operation per edge.
+
+        """
+        index = self.index
+        by_degree = {}
+        for player in population:
+            by_degree.setdefault(degree(player), []).append(player)
+        subpopulations = [[list(population)]]
+        removed = []
+        if not by_degree:
+            return subpopulations, removed
+        max_degree = max(by_degree)
+        by_degree_index = {
+            key: [index[p] for p in value] for key, value in by_degree.items()
+        }
+
+        # Population count after removing players with degree <= level is
+        # count_at_level[level].
+        count_at_level = [0] * (max_degree + 1)
+        parent = list(range(len(self.keys)))
+        size = [1] * len(self.keys)
+        active = [False] * len(self.keys)
+        count = 0
+        for level in range(max_degree - 1, 0, -1):
+            count += self._add_players(
+                parent, size, active, by_degree_index.get(level + 1, ())
+            )
+            count_at_level[level] = count
+        fracture = max_degree
+        for level in range(1, max_degree):
+            if count_at_level[level] != 1:
+                fracture = level
+                break
+
+        # Second pass collects populations at the fracture level.
+        parent = list(range(len(self.keys)))
+        size = [1] * len(self.keys)
+        active = [False] * len(self.keys)
+        members = []
+        for level in range(max_degree, fracture, -1):
+            members.extend(by_degree_index.get(level, ()))
+        self._add_players(parent, size, active, members)
+        remaining = []
+        for level in range(max_degree, 0, -1):
+            remaining.append(by_degree.get(level, []))
+        for level in range(1, fracture + 1):
+            removed.append(by_degree.get(level, []))
+            if level < fracture:
+                subpopulations.append(
+                    [
+                        [
+                            p
+                            for players in remaining[: max_degree - level]
+                            for p in players
+                        ]
+                    ]
+                )
+        subpopulations.append(self._group(parent, members))
+        return subpopulations, removed
+
+
 class Gap:
     """Actual and expected results for a performance differences."""
 
+    __slots__ = ("count", "actual", "expected")
+
     def __init__(self, actual, expected):
         """Initialise gap data for actual and expected scores."""
         super().__init__()
@@ -231,106 +383,433 @@ class Gap:
         self.expected += expected
 
 
+class RunningStatistics:
+    """Count, sums, mean, variance, minimum, maximum and median of values.
+
+    Each batch of values is read in one loop, collecting the sums, minimum,
+    maximum, and sum of squared deviations by Welford's method, and combined
+    with the values already added by the pairwise form of Welford's method.
+    Values are kept for the median only if keep_values is True, by copying
+    the batch.
+
+    """
+
+    __slots__ = (
+        "count",
+        "total",
+        "weighted_total",
+        "mean",
+        "sum_squared_deviations",
+        "minimum",
+        "maximum",
+        "values",
+    )
+
+    def __init__(self, keep_values=False):
+        """Initialise statistics for no values."""
+        super().__init__()
+        self.values = array.array("d") if keep_values else None
+        self.reset()
+
+    def reset(self):
+        """Discard all values added so far."""
+        self.count = 0
+        self.total = 0
+        self.weighted_total = 0
+        self.mean = None
+        self.sum_squared_deviations = 0
+        self.minimum = None
+        self.maximum = None
+        if self.values is not None:
+            del self.values[:]
+
+    def update(self, values, weights=None):
+        """Add the sequence values with weights in weighted_total.
+
+        weights is a sequence the same length as values, or None meaning
+        each value has weight 1.
+
+        """
+        if weights is None:
+            weights = itertools.repeat(1)
+        count = 0
+        total = 0
+        weighted_total = 0
+        running_mean = 0
+        deviations = 0
+        minimum = None
+        maximum = None
+        for value, weight in zip(values, weights):
+            count += 1
+            total += value
+            weighted_total += weight * value
+            delta = value - running_mean
+            running_mean += delta / count
+            deviations += delta * (value - running_mean)
+            if minimum is None:
+                minimum = value
+                maximum = value
+            elif value < minimum:
+                minimum = value
+            elif value > maximum:
+                maximum = value
+        if not count:
+            return
+        mean = total / float(count)
+        self.weighted_total += weighted_total
+        if self.mean is None:
+            self.mean = mean
+            self.sum_squared_deviations = deviations
+            self.minimum = minimum
+            self.maximum = maximum
+        else:
+            delta = mean - self.mean
+            combined = self.count + count
+            self.mean += delta * count / combined
+            self.sum_squared_deviations += (
+                deviations + delta * delta * self.count * count / combined
+            )
+            self.minimum = min(self.minimum, minimum)
+            self.maximum = max(self.maximum, maximum)
+        self.count += count
+        self.total += total
+        if self.values is not None:
+            self.values.extend(values)
+
+    def median(self):
+        """Return median of values or None if there are no values.
+
+        ValueError is raised if values are not kept.
+
+        """
+        if self.values is None:
+            raise ValueError("Values are not kept for median")
+        if not self.values:
+            return None
+        return median(self.values)
+
+    def stdev(self):
+        """Return sample standard deviation or None if fewer than 2 values."""
+        if self.count < 2:
+            return None
+        return math.sqrt(self.sum_squared_deviations / (self.count - 1))
+
+
+class PersonStore(collections.abc.Mapping):
+    """Player details and calculation answers held in columns.
+
+    Each player is given a dense index, and the value of each Person
+    attribute for all players is held in an array at that index.  The
+    Person instances returned by the mapping interface are views of one
+    index in the store, which have no attributes other than the store and
+    index.
+
+    At most three iterations are kept for each player, in the columns
+    iteration0 (most recent) iteration1 and iteration2.  The depth column
+    gives the number of iterations kept.  The performance column is the
+    performance used in the next iteration: initial if the constant column
+    is set and iteration0 otherwise.
+
+    """
+
+    _float_columns = (
+        "reward",
+        "points",
+        "grade_points",
+        "predicted_score",
+        "predicted_score_initial",
+        "predicted_score_grade",
+        "score",
+        "grade",
+        "initial",
+        "iteration0",
+        "iteration1",
+        "iteration2",
+        "performance",
+    )
+
+    def __init__(self):
+        """Initialise empty columns."""
+        super().__init__()
+        self.index = {}
+        self.persons = []
+        for column in self._float_columns:
+            setattr(self, column, array.array("d"))
+        self.game_count = array.array("l")
+        self.constant = array.array("b")
+        self.depth = array.array("b")
+
+    def add(self, player, initialperformance, startperformance=None):
+        """Add player to store and return the Person view for player.
+
+        The initialperformance and startperformance arguments have the same
+        meaning as for Person.
+
+        """
+        index = len(self.index)
+        self.index[player] = index
+        for column in self._float_columns:
+            getattr(self, column).append(0)
+        self.game_count.append(0)
+        self.depth.append(1)
+        if initialperformance is not None:
+            self.constant.append(1)
+            self.initial[index] = initialperformance
+            self.iteration0[index] = initialperformance
+            self.performance[index] = initialperformance
+        else:
+            self.constant.append(0)
+            if startperformance is not None:
+                self.iteration0[index] = startperformance
+                self.performance[index] = startperformance
+        self.persons.append(Person.view(self, index))
+        return self.persons[-1]
+
+    def calculate_performance(self):
+        """Calculate and set performance for all players."""
+        self.iteration2[:] = self.iteration1
+        self.iteration1[:] = self.iteration0
+        self.iteration0[:] = array.array(
+            "d",
+            (
+                (points + reward) / game_count
+                for points, reward, game_count in zip(
+                    self.points, self.reward, self.game_count
+                )
+            ),
+        )
+        self.depth[:] = array.array(
+            "b", (depth + 1 if depth < 3 else 3 for depth in self.depth)
+        )
+        self.set_performance()
+
+    def set_performance(self):
+        """Set performance column from the initial and iteration0 columns."""
+        if any(self.constant):
+            self.performance[:] = array.array(
+                "d",
+                (
+                    initial if constant else calculated
+                    for initial, constant, calculated in zip(
+                        self.initial, self.constant, self.iteration0
+                    )
+                ),
+            )
+        else:
+            self.performance[:] = self.iteration0
+
+    def is_performance_stable(self, delta):
+        """Return True if performance of all players is stable."""
+        for depth, constant, current, previous, earlier in zip(
+            self.depth,
+            self.constant,
+            self.iteration0,
+            self.iteration1,
+            self.iteration2,
+        ):
+            if constant:
+                continue
+            if depth > 1 and abs(previous - current) > delta:
+                return False
+            if depth > 2 and abs(earlier - previous) > delta:
+                return False
+        return True
+
+    def set_points(self, points=0):
+        """Initialise sum of opponent's performance to points for players."""
+        self.points[:] = array.array("d", [points]) * len(self.points)
+
+    def __getitem__(self, player):
+        """Return Person view for player."""
+        return self.persons[self.index[player]]
+
+    def __contains__(self, player):
+        """Return True if player is in store."""
+        return player in self.index
+
+    def __iter__(self):
+        """Return iterator of players in store."""
+        return iter(self.index)
+
+    def __len__(self):
+        """Return number of players in store."""
+        return len(self.index)
+
+
+def _person_column(column):
+    """Return property giving access to a column in a PersonStore."""
+
+    def fget(self):
+        return getattr(self.store, column)[self.index]
+
+    def fset(self, value):
+        getattr(self.store, column)[self.index] = value
+
+    return property(fget, fset, doc=" ".join(("Player's", column, "value.")))
+
+
 class Person:
-    """Player details and calculation answers."""
+    """Player details and calculation answers.
+
+    A Person is a view of one player's entry in a PersonStore.  A Person
+    created by calling the class has a PersonStore of its own.
+
+    """
+
+    __slots__ = ("store", "index")
 
-    def __init__(self, initialperformance):
+    reward = _person_column("reward")
+    game_count = _person_column("game_count")
+    points = _person_column("points")
+    grade_points = _person_column("grade_points")
+    predicted_score = _person_column("predicted_score")
+    predicted_score_initial = _person_column("predicted_score_initial")
+    predicted_score_grade = _person_column("predicted_score_grade")
+    score = _person_column("score")
+    grade = _person_column("grade")
+
+    def __init__(self, initialperformance, startperformance=None):
         """Initialise calculation data.
 
         If initialperformance is not None the value is used as the player's
         performance in all calculations of performance but iteration[0] is
         still the result of the most recent performance calculation.
 
+        If initialperformance is None and startperformance is not None the
+        value is used as the player's performance in the first iteration.
+
         """
         super().__init__()
-        self.reward = 0
-        self.game_count = 0
-        self.initial_performance = initialperformance
-        if initialperformance is None:
-            self.iteration = [0]
-        else:
-            self.iteration = [initialperformance]
-        self.points = 0
-        self.grade_points = 0
-        self.predicted_score = 0
-        self.predicted_score_initial = 0
-        self.predicted_score_grade = 0
-        self.score = 0
-        self.grade = 0
+        self.store = PersonStore()
+        self.index = self.store.add(
+            None, initialperformance, startperformance=startperformance
+        ).index
+
+    @classmethod
+    def view(cls, store, index):
+        """Return Person for entry at index in store."""
+        person = cls.__new__(cls)
+        person.store = store
+        person.index = index
+        return person
+
+    @property
+    def initial_performance(self):
+        """Return player's fixed performance or None if not fixed."""
+        if self.store.constant[self.index]:
+            return self.store.initial[self.index]
+        return None
+
+    @property
+    def iteration(self):
+        """Return list of kept iterations, most recent first."""
+        store = self.store
+        index = self.index
+        return [
+            store.iteration0[index],
+            store.iteration1[index],
+            store.iteration2[index],
+        ][: store.depth[index]]
+
+    @iteration.setter
+    def iteration(self, values):
+        """Set kept iterations from list, most recent first."""
+        store = self.store
+        index = self.index
+        values = values[:3]
+        for column, value in zip(
+            (store.iteration0, store.iteration1, store.iteration2), values
+        ):
+            column[index] = value
+        store.depth[index] = len(values)
+        if values and not store.constant[index]:
+            store.performance[index] = values[0]
 
     def add_grade_points(self, points):
         """Add opponent's performance to grade points."""
-        self.grade_points += points
+        self.store.grade_points[self.index] += points
 
     def add_points(self, points):
         """Add opponent's performance to points."""
-        self.points += points
+        self.store.points[self.index] += points
 
     def add_predicted_score_grade(self, predicted_score):
         """Increment predicted score using calculated grade."""
-        self.predicted_score_grade += predicted_score
+        self.store.predicted_score_grade[self.index] += predicted_score
 
     def add_predicted_score(self, predicted_score):
         """Increment predicted score using calculated performance."""
-        self.predicted_score += predicted_score
+        self.store.predicted_score[self.index] += predicted_score
 
     def add_predicted_score_initial(self, predicted_score):
         """Increment predicted score using initial performance if available."""
-        self.predicted_score_initial += predicted_score
+        self.store.predicted_score_initial[self.index] += predicted_score
 
     def add_reward(self, reward, measure):
         """Increment total reward, total score and game count."""
-        self.reward += reward * measure
-        self.game_count += 1
-        self.score += _REWARD_TO_RESULT[reward]
+        store = self.store
+        index = self.index
+        store.reward[index] += reward * measure
+        store.game_count[index] += 1
+        store.score[index] += _REWARD_TO_RESULT[reward]
 
     def calculate_grade(self):
         """Calculate and set player's grade."""
-        self.grade = float(self.grade_points + self.reward) / self.game_count
+        store = self.store
+        index = self.index
+        store.grade[index] = (
+            store.grade_points[index] + store.reward[index]
+        ) / store.game_count[index]
 
     def calculate_performance(self):
         """Calculate and set player's performance."""
-        self.iteration.insert(
-            0, float(self.points + self.reward) / self.game_count
-        )
-        del self.iteration[3:]
+        store = self.store
+        index = self.index
+        store.iteration2[index] = store.iteration1[index]
+        store.iteration1[index] = store.iteration0[index]
+        store.iteration0[index] = (
+            store.points[index] + store.reward[index]
+        ) / store.game_count[index]
+        if store.depth[index] < 3:
+            store.depth[index] += 1
+        if not store.constant[index]:
+            store.performance[index] = store.iteration0[index]
 
     def get_grade(self):
         """Return player's grade."""
-        if self.initial_performance is None:
-            return self.grade
-        return self.initial_performance
+        if self.store.constant[self.index]:
+            return self.store.initial[self.index]
+        return self.store.grade[self.index]
 
     def get_calculated_performance(self):
         """Return player's calculated performance."""
-        return self.iteration[0]
+        return self.store.iteration0[self.index]
 
     def get_initial_performance(self):
         """Return player's initial performance."""
-        if self.initial_performance is None:
-            return 0
-        return self.initial_performance
+        if self.store.constant[self.index]:
+            return self.store.initial[self.index]
+        return 0
 
     def get_performance(self):
         """Return player's performance for use in next ieration."""
-        if self.initial_performance is None:
-            return self.iteration[0]
-        return self.initial_performance
+        return self.store.performance[self.index]
 
     def get_score(self):
         """Return player's actual total score."""
-        return self.score
+        return self.store.score[self.index]
 
     def is_performance_constant(self):
         """Return True if performance is fixed for iteration calculations."""
-        return self.initial_performance is not None
+        return bool(self.store.constant[self.index])
 
     def is_performance_stable(self, delta):
         """Return True if performance is fixed for iteration calculations."""
-        if self.initial_performance is not None:
+        if self.store.constant[self.index]:
             return True
-        for count, number in enumerate(self.iteration[1:]):
-            if abs(number - self.iteration[count]) > delta:
+        iteration = self.iteration
+        for count, number in enumerate(iteration[1:]):
+            if abs(number - iteration[count]) > delta:
                 break
         else:
             return True
@@ -338,7 +817,7 @@ class Person:
 
     def set_points(self, points=0):
         """Initialise sum of opponent's performance to points."""
-        self.points = points
+        self.store.points[self.index] = points
 
 
 class Calculation:
@@ -353,16 +832,24 @@ class Calculation:
         iterations=10,
         limit=40,
         measure=50,
+        startperformance=None,
     ):
-        """Initialise calculation data."""
+        """Initialise calculation data.
+
+        startperformance maps players to the performance used in the first
+        iteration, typically the answer from an earlier calculation.
+
+        """
         super().__init__()
         if initialperformance is None:
             initialperformance = {}
+        if startperformance is None:
+            startperformance = {}
         self.iterations = iterations
         self.opponents = opponents
         self.games = games
         self.popgames = set()
-        self.persons = {}
+        self.persons = PersonStore()
         self.gap = {}
         self.gap_grade = {}
         self.gap_initial = {}
@@ -379,8 +866,10 @@ class Calculation:
                 self.popgames.add(game)
                 for player, reward in result.items():
                     if player not in persons:
-                        persons[player] = Person(
-                            initialperformance.get(player)
+                        persons.add(
+                            player,
+                            initialperformance.get(player),
+                            startperformance=startperformance.get(player),
                         )
                     persons[player].add_reward(reward, measure)
 
@@ -404,126 +893,118 @@ class Calculation:
         if self.statistics is not None:
             return self.statistics.copy()
 
-        stat = {}
-        stat[MAX_GRADE] = max(p.get_grade() for p in self.persons.values())
-        stat[MAX_INITIAL_PERF] = max(
-            p.get_initial_performance() for p in self.persons.values()
-        )
-        stat[MAX_PERF] = max(
-            p.get_performance() for p in self.persons.values()
-        )
-        stat[MAX_PERF_CALC] = max(
-            p.get_calculated_performance() for p in self.persons.values()
-        )
-        stat[MEAN_DIFF_GAP_SCORE_PREDICTION] = mean(
-            [
-                abs(g.actual - g.expected)
-                for g in self.gap.values()
-                if g.count > 0
-            ]
-        )
-        stat[MEAN_DIFF_SCORE_PREDICTION] = mean(
+        store = self.persons
+        grade = RunningStatistics(keep_values=True)
+        grade.update(
             [
-                abs(p.get_score() - p.predicted_score)
-                for p in self.persons.values()
-            ]
-        )
-        stat[MEAN_GRADE] = mean([p.get_grade() for p in self.persons.values()])
-        stat[MEAN_INITIAL_PERF] = mean(
-            [p.get_initial_performance() for p in self.persons.values()]
-        )
-        stat[MEAN_PERF] = mean(
-            [p.get_performance() for p in self.persons.values()]
-        )
-        stat[MEAN_PERF_CALC] = mean(
-            [p.get_calculated_performance() for p in self.persons.values()]
-        )
-        stat[MEDIAN_GRADE] = median(
-            [p.get_grade() for p in self.persons.values()]
-        )
-        stat[MEDIAN_INITIAL_PERF] = mean(
-            [p.get_initial_performance() for p in self.persons.values()]
-        )
-        stat[MEDIAN_PERF] = median(
-            [p.get_performance() for p in self.persons.values()]
-        )
-        stat[MEDIAN_PERF_CALC] = median(
-            [p.get_calculated_performance() for p in self.persons.values()]
-        )
-        stat[MIN_GRADE] = min(p.get_grade() for p in self.persons.values())
-        stat[MIN_INITIAL_PERF] = min(
-            p.get_initial_performance() for p in self.persons.values()
-        )
-        stat[MIN_PERF] = min(
-            p.get_performance() for p in self.persons.values()
-        )
-        stat[MIN_PERF_CALC] = min(
-            p.get_calculated_performance() for p in self.persons.values()
+                initial if constant else value
+                for initial, constant, value in zip(
+                    store.initial, store.constant, store.grade
+                )
+            ],
+            weights=store.game_count,
         )
-        stat[STDEV_SCORE_PREDICTION] = stdev(
+        initial_perf = RunningStatistics()
+        initial_perf.update(
             [
-                abs(p.get_score() - p.predicted_score)
-                for p in self.persons.values()
-            ]
+                initial if constant else 0
+                for initial, constant in zip(store.initial, store.constant)
+            ],
+            weights=store.game_count,
         )
-        stat[STDEV_GAP_SCORE_PREDICTION] = stdev(
+        perf = RunningStatistics(keep_values=True)
+        perf.update(store.performance, weights=store.game_count)
+        perf_calc = RunningStatistics(keep_values=True)
+        perf_calc.update(store.iteration0, weights=store.game_count)
+        score_prediction = RunningStatistics()
+        score_prediction.update(
             [
-                abs(g.actual - g.expected)
-                for g in self.gap.values()
-                if g.count > 0
+                abs(score - predicted)
+                for score, predicted in zip(store.score, store.predicted_score)
             ]
         )
-        stat[SUM_GAP_PREDICTION] = sum(
-            g.expected for g in self.gap_initial.values()
-        )
-        stat[SUM_GAP_GAMES] = sum(g.count for g in self.gap_initial.values())
-        stat[SUM_GAP_SCORE] = sum(g.actual for g in self.gap_initial.values())
-        stat[SUM_GAP_PREDICTION_GRADE] = sum(
-            g.expected for g in self.gap_grade.values()
-        )
-        stat[SUM_GAP_GAMES_GRADE] = sum(
-            g.count for g in self.gap_grade.values()
-        )
-        stat[SUM_GAP_SCORE_GRADE] = sum(
-            g.actual for g in self.gap_grade.values()
-        )
-        stat[SUM_GAP_PREDICTION_CALC] = sum(
-            g.expected for g in self.gap.values()
-        )
-        stat[SUM_GAP_GAMES_CALC] = sum(g.count for g in self.gap.values())
-        stat[SUM_GAP_SCORE_CALC] = sum(g.actual for g in self.gap.values())
-        stat[SUM_GRADE] = sum(p.get_grade() for p in self.persons.values())
-        stat[SUM_PERF] = sum(
-            p.get_performance() for p in self.persons.values()
-        )
-        stat[SUM_PERF_CALC] = sum(
-            p.get_calculated_performance() for p in self.persons.values()
+        gap_score_prediction = RunningStatistics()
+        gap_score_prediction.update(
+            [abs(g.actual - g.expected) for g in self.gap.values() if g.count]
         )
-        stat[WEIGHTED_SUM_GRADE] = sum(
-            p.game_count * p.get_grade() for p in self.persons.values()
-        )
-        stat[SUM_INITIAL_PERF] = sum(
-            p.get_initial_performance() for p in self.persons.values()
-        )
-        stat[WEIGHTED_SUM_INITIAL_PERF] = sum(
-            p.game_count * p.get_initial_performance()
-            for p in self.persons.values()
-        )
-        stat[WEIGHTED_SUM_PERF] = sum(
-            p.game_count * p.get_performance() for p in self.persons.values()
-        )
-        stat[WEIGHTED_SUM_PERF_CALC] = sum(
-            p.game_count * p.get_calculated_performance()
-            for p in self.persons.values()
-        )
-        stat[SUM_PREDICTION] = sum(
-            p.predicted_score for p in self.persons.values()
-        )
-        stat[SUM_HALF_GAMES] = sum(p.game_count for p in self.persons.values())
-        stat[SUM_SCORE] = sum(p.get_score() for p in self.persons.values())
+        stat = {}
+        stat[MAX_GRADE] = grade.maximum
+        stat[MAX_INITIAL_PERF] = initial_perf.maximum
+        stat[MAX_PERF] = perf.maximum
+        stat[MAX_PERF_CALC] = perf_calc.maximum
+        stat[MEAN_DIFF_GAP_SCORE_PREDICTION] = gap_score_prediction.mean
+        stat[MEAN_DIFF_SCORE_PREDICTION] = score_prediction.mean
+        stat[MEAN_GRADE] = grade.mean
+        stat[MEAN_INITIAL_PERF] = initial_perf.mean
+        stat[MEAN_PERF] = perf.mean
+        stat[MEAN_PERF_CALC] = perf_calc.mean
+        stat[MEDIAN_GRADE] = grade.median()
+        stat[MEDIAN_INITIAL_PERF] = initial_perf.mean
+        stat[MEDIAN_PERF] = perf.median()
+        stat[MEDIAN_PERF_CALC] = perf_calc.median()
+        stat[MIN_GRADE] = grade.minimum
+        stat[MIN_INITIAL_PERF] = initial_perf.minimum
+        stat[MIN_PERF] = perf.minimum
+        stat[MIN_PERF_CALC] = perf_calc.minimum
+        stat[STDEV_SCORE_PREDICTION] = score_prediction.stdev()
+        stat[STDEV_GAP_SCORE_PREDICTION] = gap_score_prediction.stdev()
+        for gaps, prediction, games, score in (
+            (
+                self.gap_initial,
+                SUM_GAP_PREDICTION,
+                SUM_GAP_GAMES,
+                SUM_GAP_SCORE,
+            ),
+            (
+                self.gap_grade,
+                SUM_GAP_PREDICTION_GRADE,
+                SUM_GAP_GAMES_GRADE,
+                SUM_GAP_SCORE_GRADE,
+            ),
+            (
+                self.gap,
+                SUM_GAP_PREDICTION_CALC,
+                SUM_GAP_GAMES_CALC,
+                SUM_GAP_SCORE_CALC,
+            ),
+        ):
+            stat[prediction] = 0
+            stat[games] = 0
+            stat[score] = 0
+            for gap in gaps.values():
+                stat[prediction] += gap.expected
+                stat[games] += gap.count
+                stat[score] += gap.actual
+        stat[SUM_GRADE] = grade.total
+        stat[SUM_PERF] = perf.total
+        stat[SUM_PERF_CALC] = perf_calc.total
+        stat[WEIGHTED_SUM_GRADE] = grade.weighted_total
+        stat[SUM_INITIAL_PERF] = initial_perf.total
+        stat[WEIGHTED_SUM_INITIAL_PERF] = initial_perf.weighted_total
+        stat[WEIGHTED_SUM_PERF] = perf.weighted_total
+        stat[WEIGHTED_SUM_PERF_CALC] = perf_calc.weighted_total
+        stat[SUM_PREDICTION] = sum(store.predicted_score)
+        stat[SUM_HALF_GAMES] = sum(store.game_count)
+        stat[SUM_SCORE] = sum(store.score)
         self.statistics = stat
         return self.statistics.copy()
 
+    def get_iteration_statistics(self, statistics=None):
+        """Return RunningStatistics for most recent calculated performances.
+
+        statistics, if given, is reset and reused so a convergence display can
+        update one RunningStatistics instance after each iteration.
+
+        """
+        if statistics is None:
+            statistics = RunningStatistics(keep_values=True)
+        else:
+            statistics.reset()
+        statistics.update(
+            self.persons.iteration0, weights=self.persons.game_count
+        )
+        return statistics
+
     def grade_difference(self, game):
         """Calculate grade: self.limit on difference is implied."""
         for key, value in game.items():
@@ -540,30 +1021,34 @@ class Calculation:
         """Do one iteration of the performance calculation."""
         if not isinstance(calculation, collections.abc.Callable):
             calculation = self.performance_difference
-        for player in self.persons.values():
-            player.set_points()
+        self.persons.set_points()
         self.process_all_results(calculation)
-        for player in self.persons.values():
-            player.calculate_performance()
+        self.persons.calculate_performance()
 
     def performance_difference(self, game):
         """Calculate game performances without a limit on difference."""
+        persons = self.persons
+        index = persons.index
+        points = persons.points
+        performance = persons.performance
         for player, opponent in game.items():
-            self.persons[player].add_points(
-                self.persons[opponent].get_performance()
-            )
+            points[index[player]] += performance[index[opponent]]
 
     def performance_difference_limited(self, game):
         """Calculate game performances with self.limit on difference."""
+        persons = self.persons
+        index = persons.index
+        points = persons.points
+        performance = persons.performance
         for key, value in game.items():
-            operf = self.persons[value].get_performance()
-            pperf = self.persons[key].get_performance()
+            operf = performance[index[value]]
+            pperf = performance[index[key]]
             if pperf - operf > self.limit:
-                self.persons[key].add_points(pperf - self.limit)
+                points[index[key]] += pperf - self.limit
             elif operf - pperf > self.limit:
-                self.persons[key].add_points(pperf + self.limit)
+                points[index[key]] += pperf + self.limit
             else:
-                self.persons[key].add_points(operf)
+                points[index[key]] += operf
 
     def process_all_results(self, process):
         """Do process on games where both players are in population."""
@@ -651,7 +1136,9 @@ class Calculation:
             actual, player.get_grade() - opponent.get_grade(), self.gap_grade
         )
 
-    def do_iterations_until_stable(self, delta=0.000000000001, cycles=None):
+    def do_iterations_until_stable(
+        self, delta=0.000000000001, cycles=None, use_arrays=False
+    ):
         """Iterate until all performances vary by less tham delta.
 
         Performances in an iteration are compared with the previous iteration.
@@ -660,21 +1147,359 @@ class Calculation:
         until the condition on deleta is met.  Otherwise the number of
         iterations is limited by self.iterations.
 
+        If use_arrays is True the iterations are done by a CalculationArrays
+        instance and the answers are copied back to self.persons at the end.
+
         """
         if self.games is None:
             return None
         cycle_iterations = self.iterations * 2
+        if use_arrays:
+            return CalculationArrays(self).do_iterations_until_stable(
+                delta=delta, cycles=cycles, cycle_iterations=cycle_iterations
+            )
         iterations = 0
         while True:
             iterations += 1
             self.iterate_performance()
-            for person in self.persons.values():
-                if not person.is_performance_stable(delta):
-                    break
+            if self.persons.is_performance_stable(delta):
+                return iterations, delta, True
+            if cycles is None:
+                if iterations > cycle_iterations:
+                    return iterations, delta, False
+
+    def do_warm_start_iterations_until_stable(
+        self,
+        warmstart,
+        delta=0.000000000001,
+        cycles=None,
+        use_arrays=False,
+        cold_start=False,
+    ):
+        """Iterate from performances in warmstart until stable.
+
+        warmstart is a WarmStart instance.  The iteration starts from the
+        saved performances of the players, and zero for new players.  The
+        saved performances are used only as the start point so the answer
+        does not depend on them, even if results have changed since they
+        were saved.
+
+        The calculation is for one connected population, the component
+        containing the changed games, and every player in it is iterated.
+        The players whose games did not change cannot be left out because
+        their performances depend on every other performance in the
+        population, but they start near their answer so the extra work is
+        small.
+
+        The delta cycles and use_arrays arguments are passed to the
+        do_iterations_until_stable method.  The answer is added to warmstart
+        if the iteration is stable.
+
+        Return (iterations, delta, stable, started, cold_iterations) where
+        started is the number of players given a start performance from
+        warmstart, and cold_iterations is the number of iterations needed
+        without a warm start if cold_start is True, or None otherwise.
+
+        """
+        if self.games is None:
+            return None
+        cold_iterations = None
+        if cold_start:
+            cold = Calculation(
+                set(self.persons),
+                self.games,
+                self.opponents,
+                initialperformance={
+                    player: person.initial_performance
+                    for player, person in self.persons.items()
+                    if person.initial_performance is not None
+                },
+                iterations=self.iterations,
+                limit=self.limit,
+                measure=self.measure,
+            )
+            cold_iterations = cold.do_iterations_until_stable(
+                delta=delta, cycles=cycles, use_arrays=use_arrays
+            )[0]
+        start = warmstart.get_start_performances(self.persons)
+        started = 0
+        for player, person in self.persons.items():
+            if not person.is_performance_constant():
+                if player in start:
+                    person.iteration = [start[player]]
+                    started += 1
+
+        # Without constant performances any answer plus a constant is also
+        # an answer.  The game count weighted sum of performances does not
+        # change between iterations and is zero for a cold start, so adjust
+        # the start performances to give the cold start answer.
+        persons = self.persons.values()
+        if started and not any(
+            person.is_performance_constant() for person in persons
+        ):
+            adjust = sum(
+                person.game_count * person.iteration[0] for person in persons
+            ) / sum(person.game_count for person in persons)
+            for person in persons:
+                person.iteration = [person.iteration[0] - adjust]
+        iterations, delta, stable = self.do_iterations_until_stable(
+            delta=delta, cycles=cycles, use_arrays=use_arrays
+        )
+        if stable:
+            warmstart.add_calculation(self)
+        return iterations, delta, stable, started, cold_iterations
+
+
+class WarmStart:
+    """Converged performances from earlier calculations for warm starts.
+
+    The performances are kept for each population, identified by the
+    players in it, for the most recent maximum_populations populations.
+    These are used as the start point of the iteration in later
+    calculations, which usually converge in fewer iterations than a
+    calculation starting from zero.  Nothing else is taken from the saved
+    performances, so they remain useful, and harmless, when games are added
+    or results change.
+
+    """
+
+    def __init__(self, maximum_populations=20):
+        """Initialise empty collection of converged performances."""
+        super().__init__()
+        self.maximum_populations = maximum_populations
+        self.populations = {}
+
+    def add_calculation(self, calculation):
+        """Save converged performances in calculation for a later warm start.
+
+        Players whose performance is held constant in calculation are not
+        saved.  Saved populations whose players are all in calculation are
+        discarded.
+
+        """
+        performances = {
+            player: person.get_calculated_performance()
+            for player, person in calculation.persons.items()
+            if not person.is_performance_constant()
+        }
+        if not performances:
+            return
+        players = frozenset(performances)
+        populations = self.populations
+        for key in [k for k in populations if k.issubset(players)]:
+            del populations[key]
+        populations[players] = performances
+        while len(populations) > self.maximum_populations:
+            del populations[next(iter(populations))]
+
+    def get_start_performances(self, players):
+        """Return dict of saved performances for players.
+
+        A player's performance is taken from the saved population sharing
+        most players with players, the smallest such population if there
+        is a choice.
+
+        """
+        players = set(players)
+        start = {}
+        for count, _, key in sorted(
+            (
+                (len(players.intersection(key)), -len(key), key)
+                for key in self.populations
+            ),
+            key=lambda item: item[:2],
+            reverse=True,
+        ):
+            if not count:
+                break
+            performances = self.populations[key]
+            for player in players.intersection(key):
+                start.setdefault(player, performances[player])
+        return start
+
+    def write(self, path):
+        """Write the saved performances to file path."""
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(repr(list(self.populations.values())))
+
+    def read(self, path):
+        """Replace the saved performances with those in file path."""
+        with open(path, "r", encoding="utf-8") as file:
+            self.populations = {
+                frozenset(performances): performances
+                for performances in literal_eval(file.read())
+            }
+
+
+class CalculationArrays:
+    """Performance iteration for a Calculation using integer-indexed arrays.
+
+    The games in calculation.popgames are converted once to a tuple, for
+    each player, of the indicies of the player's opponents in those games.
+    Each iteration gathers the opponents' performances, sums them for each
+    player, and divides by the player's game count, without the dict lookups
+    and method calls done by Calculation.iterate_performance.
+
+    Opponents are listed in the order Calculation.process_all_results visits
+    the games so the answers agree with performance_difference and
+    performance_difference_limited to within float tolerance.
+
+    """
+
+    def __init__(self, calculation):
+        """Initialise arrays from persons and games in calculation."""
+        super().__init__()
+        self.calculation = calculation
+        self.limit = calculation.limit
+        persons = calculation.persons
+        self.keys = list(persons)
+        index = {key: count for count, key in enumerate(self.keys)}
+        opponents = [[] for _ in self.keys]
+        if calculation.opponents is not None:
+            for popgame in calculation.popgames:
+                for player, opponent in calculation.opponents[popgame].items():
+                    opponents[index[player]].append(index[opponent])
+        self.opponents = tuple(tuple(opps) for opps in opponents)
+        self.reward = array.array("d", persons.reward)
+        self.game_count = array.array("d", persons.game_count)
+        self.initial_performance = [
+            initial if constant else None
+            for initial, constant in zip(persons.initial, persons.constant)
+        ]
+        self.variable = array.array(
+            "l",
+            (
+                count
+                for count, constant in enumerate(persons.constant)
+                if not constant
+            ),
+        )
+        self.constant = len(self.variable) != len(self.keys)
+        if self.keys:
+            depth = persons.depth[0]
+        else:
+            depth = 0
+        self.iteration = [
+            array.array("d", column)
+            for column in (
+                persons.iteration0,
+                persons.iteration1,
+                persons.iteration2,
+            )[:depth]
+        ]
+        self.points = array.array("d", [0.0]) * len(self.keys)
+
+    def get_performance(self):
+        """Return array of performances for use in next iteration."""
+        if not self.constant:
+            return self.iteration[0]
+        return array.array(
+            "d",
+            (
+                calculated if initial is None else initial
+                for calculated, initial in zip(
+                    self.iteration[0], self.initial_performance
+                )
+            ),
+        )
+
+    def iterate_performance(self, limited=False):
+        """Do one iteration of the performance calculation.
+
+        The iteration matches Calculation.performance_difference_limited if
+        limited is True, and Calculation.performance_difference otherwise.
+
+        """
+        performance = self.get_performance()
+        gather = performance.__getitem__
+        if limited:
+            limit = self.limit
+            points = array.array("d")
+            for perf, opps in zip(performance, self.opponents):
+                operfs = list(map(gather, opps))
+                if perf - min(operfs) > limit or max(operfs) - perf > limit:
+                    low = perf - limit
+                    high = perf + limit
+                    operfs = [
+                        (
+                            low
+                            if perf - operf > limit
+                            else high if operf - perf > limit else operf
+                        )
+                        for operf in operfs
+                    ]
+                points.append(sum(operfs))
+        else:
+            points = array.array(
+                "d", (sum(map(gather, opps)) for opps in self.opponents)
+            )
+        self.points = points
+        self.iteration.insert(
+            0,
+            array.array(
+                "d",
+                (
+                    (p + r) / c
+                    for p, r, c in zip(points, self.reward, self.game_count)
+                ),
+            ),
+        )
+        del self.iteration[3:]
+
+    def is_performance_stable(self, delta):
+        """Return True if all performances vary by less than delta."""
+        iteration = self.iteration
+        for count in range(len(iteration) - 1):
+            current = iteration[count]
+            previous = iteration[count + 1]
+            if self.constant:
+                for item in self.variable:
+                    if abs(previous[item] - current[item]) > delta:
+                        return False
             else:
+                for now, then in zip(current, previous):
+                    if abs(then - now) > delta:
+                        return False
+        return True
+
+    def copy_to_persons(self):
+        """Copy points and iteration arrays to the calculation's persons."""
+        persons = self.calculation.persons
+        persons.points[:] = self.points
+        for column, item in zip(
+            (persons.iteration0, persons.iteration1, persons.iteration2),
+            self.iteration,
+        ):
+            column[:] = item
+        persons.depth[:] = array.array("b", [len(self.iteration)]) * len(
+            self.keys
+        )
+        persons.set_performance()
+
+    def do_iterations_until_stable(
+        self,
+        delta=0.000000000001,
+        cycles=None,
+        cycle_iterations=20,
+        limited=False,
+    ):
+        """Iterate until all performances vary by less than delta.
+
+        The arguments have the same meaning as in the method with the same
+        name in Calculation, where cycle_iterations is twice the iterations
+        attribute.  The answers are copied back to the calculation's persons.
+
+        """
+        iterations = 0
+        while True:
+            iterations += 1
+            self.iterate_performance(limited=limited)
+            if self.is_performance_stable(delta):
+                self.copy_to_persons()
                 return iterations, delta, True
             if cycles is None:
                 if iterations > cycle_iterations:
+                    self.copy_to_persons()
                     return iterations, delta, False
 
 
@@ -810,6 +1635,7 @@ class PopulationMap:
         self._core_populations = None
         self._link_populations = None
         self._remainder_populations = None
+        self._population_sets = None
         # Temporary reference to performances deleted by rebuild_populations
         self.__performances = performances
         # Rebuilt population information including links between them.
@@ -834,44 +1660,65 @@ class PopulationMap:
         if self.__performances is None:
             return
         perf = self.__performances
+        population_sets = perf.get_population_sets()
+        keys = population_sets.keys
+        index = population_sets.index
+        adjacent = population_sets.adjacent
         core_populations = [set(s) for s in self._subpopulations]
-        link_players = [set(r) for r in self._removed]
-        while True:
-            # Restore removed players to population if all player's opponents
-            # are in population.
-            # Repeat until a pass is done without restoring any players.
-            recombine = [set() for r in range(len(core_populations))]
-            for item in link_players:
-                for element in list(item):
-                    for index, value in enumerate(core_populations):
-                        if len(self._opponents[element] - value) == 0:
-                            recombine[index].add(element)
-                            item.remove(element)
-                            break
-            for index, value in enumerate(recombine):
-                core_populations[index].update(value)
-            if not sum(len(rc) for rc in recombine):
-                break
+        core = [-1] * len(keys)
+        for number, population in enumerate(core_populations):
+            for player in population:
+                core[index[player]] = number
+
+        def core_of(item):
+            # Return the core population containing all opponents of item,
+            # or -1 if there is no such core population.
+            opponents = adjacent[item]
+            if not opponents:
+                return 0 if core_populations else -1
+            number = core[opponents[0]]
+            if number < 0:
+                return -1
+            for opponent in opponents:
+                if core[opponent] != number:
+                    return -1
+            return number
+
+        # Restore removed players to population if all player's opponents
+        # are in population.
+        # A restored player's removed opponents are checked again until no
+        # more players are restored.
+        link = {index[player] for item in self._removed for player in item}
+        pending = collections.deque(link)
+        while pending:
+            item = pending.popleft()
+            if item not in link:
+                continue
+            number = core_of(item)
+            if number < 0:
+                continue
+            core[item] = number
+            core_populations[number].add(keys[item])
+            link.remove(item)
+            pending.extend(o for o in adjacent[item] if o in link)
+
         # Remove players who do not have an opponent in core_populations
         # from link_players and repartition these players into subpopulations.
         # But no need to find fracture point (if not already fractured).
         repartition = set()
-        for item in link_players:
-            for element in list(item):
-                for value in core_populations:
-                    if len(value - self._opponents[element]) != len(value):
-                        break
-                else:
-                    repartition.add(element)
-                    item.remove(element)
+        link_repartition = set()
+        for item in link:
+            for opponent in adjacent[item]:
+                if core[opponent] >= 0:
+                    link_repartition.add(keys[item])
+                    break
+            else:
+                repartition.add(keys[item])
         remainder_populations = perf.split_players_into_populations(
             repartition
         )
         # Repartition remaining players in link_players into subpopulations.
         # But no need to find fracture point (if not already fractured).
-        link_repartition = set()
-        for item in link_players:
-            link_repartition.update(item)
         link_populations = perf.split_players_into_populations(
             link_repartition
         )
@@ -879,6 +1726,7 @@ class PopulationMap:
         self._core_populations = core_populations
         self._link_populations = link_populations
         self._remainder_populations = remainder_populations
+        self._population_sets = population_sets
         self.__performances = None
 
     @property
@@ -904,28 +1752,56 @@ class PopulationMap:
         )
 
     def _calculate_population_information(self):
-        """Calculate core, link, and remainder population information."""
-
-        def calc_inf(players, opps_all, opps_own, key, src_pop):
-            opps = self._opponents
-            players[key] = len(src_pop)
-            opps_all[key] = sum(len(opps[p]) for p in src_pop)
-            total = sum(
-                len([o for o in opps[p] if o in src_pop]) for p in src_pop
-            )
-            if total:
-                opps_own[key] = total
-
-        def calc_xref(inf, key, ppop, xref):
-            opps = self._opponents
-            inf[key] = {}
-            for index, item in enumerate(xref):
-                total = sum(
-                    len([o for o in opps[p] if o in ppop]) for p in item
-                )
-                if total:
-                    inf[key][index] = total
+        """Calculate core, link, and remainder population information.
 
+        Each player is labelled with the number of their core, link, or
+        remainder population, and the edges between all pairs of populations
+        are counted in one pass over the opponents of all labelled players.
+
+        """
+        index = self._population_sets.index
+        adjacent = self._population_sets.adjacent
+        opps = self._opponents
+        populations = (
+            self._core_populations
+            + self._link_populations
+            + self._remainder_populations
+        )
+        link_base = len(self._core_populations)
+        rest_base = link_base + len(self._link_populations)
+        label = [-1] * len(adjacent)
+        for number, population in enumerate(populations):
+            for player in population:
+                label[index[player]] = number
+        edges = collections.Counter()
+        for item, number in enumerate(label):
+            if number < 0:
+                continue
+            for opponent in adjacent[item]:
+                other = label[opponent]
+                if other >= 0:
+                    edges[number, other] += 1
+
+        def calc_inf(players, opps_all, opps_own, base, count):
+            for key in range(count):
+                src_pop = populations[base + key]
+                players[key] = len(src_pop)
+                opps_all[key] = sum(len(opps[p]) for p in src_pop)
+                total = edges[base + key, base + key]
+                if total:
+                    opps_own[key] = total
+
+        def calc_xref(inf, base, count, xref_base, xref_count):
+            for key in range(count):
+                inf[key] = {}
+                for number in range(xref_count):
+                    total = edges[xref_base + number, base + key]
+                    if total:
+                        inf[key][number] = total
+
+        core_count = len(self._core_populations)
+        link_count = len(self._link_populations)
+        rest_count = len(self._remainder_populations)
         core_players = {}
         core_opps_all = {}
         core_opps_core = {}
@@ -939,16 +1815,17 @@ class PopulationMap:
         rest_opps_all = {}
         rest_opps_rest = {}
         rest_opps_link = {}
-        for index, item in enumerate(self._core_populations):
-            calc_inf(core_players, core_opps_all, core_opps_core, index, item)
-            calc_xref(core_opps_link, index, item, self._link_populations)
-        for index, item in enumerate(self._link_populations):
-            calc_inf(link_players, link_opps_all, link_opps_link, index, item)
-            calc_xref(link_opps_rest, index, item, self._remainder_populations)
-            calc_xref(link_opps_core, index, item, self._core_populations)
-        for index, item in enumerate(self._remainder_populations):
-            calc_inf(rest_players, rest_opps_all, rest_opps_rest, index, item)
-            calc_xref(rest_opps_link, index, item, self._link_populations)
+        calc_inf(core_players, core_opps_all, core_opps_core, 0, core_count)
+        calc_xref(core_opps_link, 0, core_count, link_base, link_count)
+        calc_inf(
+            link_players, link_opps_all, link_opps_link, link_base, link_count
+        )
+        calc_xref(link_opps_rest, link_base, link_count, rest_base, rest_count)
+        calc_xref(link_opps_core, link_base, link_count, 0, core_count)
+        calc_inf(
+            rest_players, rest_opps_all, rest_opps_rest, rest_base, rest_count
+        )
+        calc_xref(rest_opps_link, rest_base, rest_count, link_base, link_count)
         self._core_players = core_players
         self._core_opps_all = core_opps_all
         self._core_opps_core = core_opps_core
@@ -0,0 +1,339 @@
+# seasonperformances.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Player performance calculations for each season in selected events.
+
+Seasons are independent so the calculation for each season can be done in
+a separate process.  The answers are returned in season order whichever
+process finishes first.
+
+"""
+
+import os
+import concurrent.futures
+
+from . import performances
+
+
+def get_season_start(seasonkey):
+    """Return the start date of the season with seasonkey."""
+    return "-".join((seasonkey.split("-")[0], "07", "01"))
+
+
+def get_warm_start_report(iterations, started, players, cold_iterations):
+    """Return report text for a warm start calculation.
+
+    started of players were given a start performance from an earlier
+    calculation.  cold_iterations is the iterations taken without a warm
+    start, or None if not known.
+
+    """
+    output = [
+        "".join(
+            (
+                "Warm start performances used: ",
+                str(started),
+                " of ",
+                str(players),
+                " players\n",
+            )
+        )
+    ]
+    if cold_iterations is not None:
+        output.append(
+            "".join(
+                (
+                    "Cold start iterations: ",
+                    str(cold_iterations),
+                    "      Iterations saved: ",
+                    str(cold_iterations - iterations),
+                    "\n",
+                )
+            )
+        )
+    return output
+
+
+def get_season_data(season, games, game_opponent, opponents):
+    """Return (games, players, game_opponent, opponents) for season.
+
+    season is the set of game keys in the season, and games game_opponent
+    and opponents are for all seasons.
+
+    """
+    s_games = {}
+    s_game_opponent = {}
+    s_players = {}
+    s_opponents = {}
+    for skey in season:
+        s_games[skey] = games[skey]
+        s_game_opponent[skey] = game_opponent[skey]
+        for key in s_games[skey]:
+            s_players.setdefault(key, set()).add(skey)
+    for key in s_players:
+        s_opponents[key] = {o for o in opponents[key] if o in s_players}
+    return s_games, s_players, s_game_opponent, s_opponents
+
+
+def calculate_season(
+    seasonkey,
+    games,
+    players,
+    game_opponent,
+    opponents,
+    warmstart=None,
+    cold_start=False,
+):
+    """Return (seasonkey, report, calculation) for games in season.
+
+    report is a list of str describing the calculation, and calculation is
+    the performances.Calculation instance or None if the games do not allow
+    a calculation.
+
+    The iteration starts from the saved performances in warmstart, a
+    performances.WarmStart instance, if given.  The iterations taken without
+    warmstart are reported if cold_start is True.
+
+    """
+    season_start = get_season_start(seasonkey)
+    output = []
+    s_performance = performances.Performances()
+    s_performance.get_events(games, players, game_opponent, opponents)
+    s_performance.find_distinct_populations()
+    if not s_performance.populations:
+        output.append(
+            "".join(
+                (
+                    "\n\nNo players in season starting ",
+                    season_start,
+                    ".",
+                )
+            ),
+        )
+        return seasonkey, output, None
+    pops = [len(p) for p in s_performance.populations]
+    if len(s_performance.populations) > 1:
+        output.append(
+            "".join(
+                (
+                    "\n\nPlayers do not form a connected population ",
+                    "in season starting ",
+                    season_start,
+                    ".\n",
+                )
+            )
+        )
+        output.append(
+            "".join(
+                (
+                    "\tPlayers in populations are: ",
+                    repr(pops),
+                    "\n",
+                )
+            )
+        )
+        if (max(pops) * 100) / sum(pops) > 95:
+            s_performance.get_largest_population()
+            s_performance.find_distinct_populations()
+            output.append(
+                "".join(
+                    (
+                        "\tLargest population is over 95% of total ",
+                        "for season starting ",
+                        season_start,
+                        ".\n\tCalculation continued using largest ",
+                        "population.\n",
+                    )
+                )
+            )
+        else:
+            output.append(
+                "".join(
+                    (
+                        "\tLargest population is less than 95% of ",
+                        "total for season starting ",
+                        season_start,
+                        ".\n",
+                    )
+                ),
+            )
+            return seasonkey, output, None
+    else:
+        output.append(
+            "".join(
+                (
+                    "\n\nAll players used in calculation for season ",
+                    "starting ",
+                    season_start,
+                    ".\n",
+                )
+            )
+        )
+    output.append(
+        "".join(
+            (
+                "Number of players is: ",
+                repr(max(pops)),
+                "\n",
+            )
+        )
+    )
+    output.append(
+        "".join(
+            (
+                "Number of half-games is: ",
+                repr(
+                    sum(len(players[p]) for p in s_performance.populations[0])
+                ),
+                "\n",
+            )
+        )
+    )
+    cscgoo = s_performance.cycle_state_connected_graph_of_opponents()
+    if cscgoo is True:
+        output.append(
+            "".join(
+                (
+                    "\n\nNo opponent cycles in season starting ",
+                    season_start,
+                    ".\n\nShortest possible is A plays B, B plays C, ",
+                    "C plays A: a 3-cycle.\n\nThe workaround is ",
+                    "attach a 3-cycle using two artifical player ",
+                    "names to an existing player who plays games ",
+                    "against only one opponent.  The three added ",
+                    "games should be draws.",
+                )
+            )
+        )
+        return seasonkey, output, None
+
+    s_calculation = performances.Calculation(
+        s_performance.populations[0],
+        s_performance.games,
+        s_performance.game_opponent,
+        iterations=1000,
+    )
+    if warmstart is None:
+        (
+            iterations,
+            delta,
+            stable,
+        ) = s_calculation.do_iterations_until_stable(
+            cycles=cscgoo, use_arrays=True
+        )
+    else:
+        (
+            iterations,
+            delta,
+            stable,
+            started,
+            cold_iterations,
+        ) = s_calculation.do_warm_start_iterations_until_stable(
+            warmstart, cycles=cscgoo, use_arrays=True, cold_start=cold_start
+        )
+    if not stable:
+        output.append(
+            "".join(
+                (
+                    "\n\nNo opponent cycles in season ",
+                    season_start,
+                    " like: A plays B, B plays C, C plays A.\n\n",
+                    "This is a 3-cycle and when present, the usual ",
+                    "case, ensures the iteration will converge.",
+                    "\n\nAn n-cycle, n>3, exists but this does not ",
+                    "ensure the iteration will converge: it depends ",
+                    "on the pattern of results of the games in the ",
+                    "cycle.  This case seems to be one which does ",
+                    "not converge.\n\nThe workaround is attach a ",
+                    "3-cycle, using two artifical player names, to ",
+                    "an existing player who plays games against only ",
+                    "one opponent if possible.  ",
+                    "The three added games should be draws.",
+                )
+            )
+        )
+        return seasonkey, output, None
+    output.append(
+        "".join(
+            (
+                "Iterations used: ",
+                str(iterations),
+                "      Delta: ",
+                str(delta),
+                "\n",
+            )
+        )
+    )
+    if warmstart is not None:
+        output.extend(
+            get_warm_start_report(
+                iterations,
+                started,
+                len(s_calculation.persons),
+                cold_iterations,
+            )
+        )
+    return seasonkey, output, s_calculation
+
+
+def _calculate_season_from_arguments(arguments):
+    """Return calculate_season(*arguments) for use in a process pool."""
+    return calculate_season(*arguments)
+
+
+def calculate_seasons(
+    seasons,
+    games,
+    game_opponent,
+    opponents,
+    max_workers=None,
+    warmstart=None,
+    cold_start=False,
+):
+    """Return (report, calculations) for seasons.
+
+    seasons maps season keys to the set of game keys in each season.
+
+    report is a list of str describing the calculation for each season in
+    season order, and calculations maps season keys to the Calculation
+    instance for seasons where the calculation was done.
+
+    The seasons are calculated in a process pool with max_workers processes
+    unless max_workers is 1 or there is only one season.  The default is the
+    number of processors.
+
+    The warmstart and cold_start arguments are passed to calculate_season
+    for each season.  The performances calculated for each season in a
+    process pool are added to warmstart here because the additions made in
+    the pool's processes are lost.  Seasons calculated in this process are
+    added to warmstart by calculate_season.
+
+    """
+    arguments = [
+        (seasonkey,)
+        + get_season_data(seasons[seasonkey], games, game_opponent, opponents)
+        + (warmstart, cold_start)
+        for seasonkey in sorted(seasons)
+    ]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    pooled = not (max_workers == 1 or len(arguments) < 2)
+    if not pooled:
+        answers = map(_calculate_season_from_arguments, arguments)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers
+        ) as executor:
+            answers = list(
+                executor.map(_calculate_season_from_arguments, arguments)
+            )
+    report = []
+    calculations = {}
+    for seasonkey, output, calculation in answers:
+        report.extend(output)
+        if calculation is not None:
+            calculations[seasonkey] = calculation
+            if pooled and warmstart is not None:
+                warmstart.add_calculation(calculation)
+    return report, calculations
@@ -11,6 +11,8 @@ The collated results from the results report replace any existing results on
 the database for the reported events.
 
 """
+import time
+
 from chessvalidate.core.gameresults import ecfresult
 from chessvalidate.core.gameobjects import (
     Game,
@@ -25,6 +27,7 @@ from .resultsrecord import ResultsDBrecordName, ResultsDBrecordPlayer
 from .resultsrecord import get_alias, get_name_from_record_value
 from .resultsrecord import get_events_matching_event_identity
 from .resultsrecord import get_games_for_event, get_affiliation_details
+from .resultsrecord import get_games_for_events, get_aliases_for_games
 from . import filespec
 
 
@@ -40,13 +43,31 @@ class CollationDB(object):
         """
         self._games = games
         self._database = database
+        self.phase_timings = []
 
-    def update_results(self):
+    def update_results(self, bulk=False):
         """Apply games to database replacing existing games for event.
 
         Caller is responsible for commit or backout action.
 
+        If bulk is True the existing games for all events, and their player
+        records, are read in record key order in one pass; and the edits
+        and deletes of games, names, and players are applied in record key
+        order.  This suits replacement of large events.
+
+        The time taken by each phase is put in phase_timings as a list of
+        (phase name, seconds) tuples.
+
         """
+        self.phase_timings = []
+        phase_start = [time.perf_counter()]
+
+        def end_phase(phase):
+            """Note time taken by phase and start timing next phase."""
+            now = time.perf_counter()
+            self.phase_timings.append((phase, now - phase_start[0]))
+            phase_start[0] = now
+
         eventsections = dict()  # {name : {section name : srkey, ...}, ...}
         eventsamend = dict()
         eventskey = dict()  # {srkey : name, ...}
@@ -64,6 +85,7 @@ class CollationDB(object):
         dbgamesmap = dict()  # [instance attributes tuple : [key, ...], ...}
         merges = dict()  # {key: ResultsDBrecordPlayer instance, ...}
         mergesamend = dict()
+        dbaliases = dict()  # {key: ResultsDBrecordPlayer instance, ...}
 
         def get_players_blocking_update(buplayers):
             """Return players with merges or ECF codes blocking update."""
@@ -163,7 +185,9 @@ class CollationDB(object):
         def unset_player(skey):
             """Decrement affiliation and section counts and create key maps."""
             if skey not in playerskey:
-                pr = get_alias(self._database, skey)
+                pr = dbaliases.get(skey)
+                if pr is None:
+                    pr = get_alias(self._database, skey)
                 a = pr.value.affiliation
                 if a is not None:
                     namemanager.unset_name(a)
@@ -244,35 +268,63 @@ class CollationDB(object):
                 use_events.append(replace_events.pop())
             delete_events.extend(replace_events)
             del replace_events
+        end_phase("Match events")
 
         """Get names used by existing events and decrement reference counts
         Get players involved in existing games and decrement reference
         counts for names used by these games and players. Invert the
         value dictionary for comparison with new games"""
-        for dbevents in (delete_events, use_events):
-            for dbe, e, record in dbevents:
-                for s in record.value.sections:
-                    namemanager.unset_name(s)
-                for g in get_games_for_event(self._database, record):
-                    for s in (
-                        g.value.awayteam,
-                        g.value.hometeam,
-                        g.value.section,
-                    ):
-                        if s is not None:
-                            namemanager.unset_name(s)
-                    for p in (g.value.homeplayer, g.value.awayplayer):
-                        unset_player(p)
-                    ig = []
-                    d = g.value.__dict__
-                    for a in g.value._attribute_order:
-                        ig.append(d[a])
-                    igt = tuple(ig)
-                    if igt in dbgamesmap:
-                        dbgamesmap[igt].append(g)
-                    else:
-                        dbgamesmap[igt] = [g]
+        if bulk:
+            dbeventgames = [
+                get_games_for_events(
+                    self._database,
+                    [
+                        (record.key.recno,)
+                        for dbevents in (delete_events, use_events)
+                        for dbe, e, record in dbevents
+                    ],
+                )
+            ]
+            dbaliases.update(
+                get_aliases_for_games(self._database, dbeventgames[0])
+            )
+            for dbevents in (delete_events, use_events):
+                for dbe, e, record in dbevents:
+                    for s in record.value.sections:
+                        namemanager.unset_name(s)
+        else:
+            dbeventgames = []
+            for dbevents in (delete_events, use_events):
+                for dbe, e, record in dbevents:
+                    for s in record.value.sections:
+                        namemanager.unset_name(s)
+                    dbeventgames.append(
+                        get_games_for_event(self._database, record)
+                    )
+        for eventgames in dbeventgames:
+            for g in eventgames:
+                for s in (
+                    g.value.awayteam,
+                    g.value.hometeam,
+                    g.value.section,
+                ):
+                    if s is not None:
+                        namemanager.unset_name(s)
+                for p in (g.value.homeplayer, g.value.awayplayer):
+                    unset_player(p)
+                ig = []
+                d = g.value.__dict__
+                for a in g.value._attribute_order:
+                    ig.append(d[a])
+                igt = tuple(ig)
+                if igt in dbgamesmap:
+                    dbgamesmap[igt].append(g)
+                else:
+                    dbgamesmap[igt] = [g]
         del use_events
+        del dbeventgames
+        dbaliases.clear()
+        end_phase("Read existing games")
 
         """Go through new games to find players that already exist on database.
         If any missing from new games have aliases that are not being deleted
@@ -322,6 +374,7 @@ class CollationDB(object):
             )
         del dbplayers
         del dbplayersdict
+        end_phase("Check players")
 
         """Put new events (no existing event records) in event map. Use an
         existing event record if one is available."""
@@ -392,6 +445,7 @@ class CollationDB(object):
                     adjustmerge.value.alias.remove(players[p].key.recno)
                 except ValueError:
                     pass
+        end_phase("Prepare events names and players")
 
         """Prepare new games and invert the value dictionary for comparison
         with games from database."""
@@ -461,13 +515,15 @@ class CollationDB(object):
                     newgamesmap[igt] = [gr]
         for ngm in list(newgamesmap.keys()):
             if ngm in dbgamesmap:
-                minlen = min(len(newgamesmap[ngm]), len(newgamesmap[ngm]))
+                minlen = min(len(newgamesmap[ngm]), len(dbgamesmap[ngm]))
                 del newgamesmap[ngm][:minlen]
                 del dbgamesmap[ngm][:minlen]
         for ngm in newgamesmap:
             newgames.extend(newgamesmap[ngm])
         for dgm in dbgamesmap:
             dbgames.extend(dbgamesmap[dgm])
+        if bulk:
+            dbgames.sort(key=lambda g: g.key.recno)
 
         """Check that player records being deleted are not ones used to link
         to ECF grading code records.
@@ -492,6 +548,7 @@ class CollationDB(object):
                 ),
                 "\n".join(linkers),
             )
+        end_phase("Prepare games")
 
         """Do the updates.
         Note that games are the only records that need creating at this
@@ -517,8 +574,14 @@ class CollationDB(object):
             og.delete_record(self._database, filespec.GAME_FILE_DEF)
         for ng in newgames[len(dbgames) :]:
             ng.put_record(self._database, filespec.GAME_FILE_DEF)
-        namemanager.update_names()
-        for p in players:
+        end_phase("Apply games")
+        namemanager.update_names(in_key_order=bulk)
+        end_phase("Apply names")
+        if bulk:
+            playerorder = sorted(players, key=lambda p: players[p].key.recno)
+        else:
+            playerorder = players
+        for p in playerorder:
             if not playersgames[p]:
                 players[p].delete_record(
                     self._database, filespec.PLAYER_FILE_DEF
@@ -546,6 +609,14 @@ class CollationDB(object):
             )
         for dbe, e, record in delete_events:
             record.delete_record(self._database, filespec.EVENT_FILE_DEF)
+        end_phase("Apply players and events")
+
+    def get_phase_timings_report(self):
+        """Return list of lines reporting time taken by each update phase."""
+        return [
+            "".join((phase, ": ", "%.3f" % seconds, " seconds"))
+            for phase, seconds in self.phase_timings
+        ]
 
 
 class NameManager(object):
@@ -616,9 +687,17 @@ class NameManager(object):
         self.namesamend[name].value.reference_count -= 1
         return name
 
-    def update_names(self):
-        """Apply the collected updates to names."""
-        for n in self.names:
+    def update_names(self, in_key_order=False):
+        """Apply the collected updates to names.
+
+        The names are updated in record key order if in_key_order is True.
+
+        """
+        if in_key_order:
+            order = sorted(self.names, key=lambda n: self.namesmap[n])
+        else:
+            order = self.names
+        for n in order:
             if n in self.namesamend:
                 rc = self.namesamend[n].value.reference_count
                 if rc <= 0:
@@ -0,0 +1,249 @@
+# deleteevents.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Delete events, with their games and players, from a results database.
+
+The games for all the events are found with one cursor on the game event
+index, and their player records are read in record key order, so checking
+which players block the deletion and collecting the changes is one pass
+over the players however many events are deleted.
+
+Name reference count decrements are added up per name record, and each
+changed person record is edited once.  The deletes and edits are applied in
+record key order in batches, with progress reported after each batch.
+
+"""
+
+from collections import Counter
+
+from . import filespec
+from .resultsrecord import (
+    get_aliases_for_games,
+    get_event,
+    get_games_for_events,
+    get_name,
+    get_person_from_alias,
+)
+
+# Number of records deleted or edited between progress reports.
+DELETE_BATCH_SIZE = 500
+
+
+class EventDeletionError(Exception):
+    """Exception raised when events cannot be deleted."""
+
+
+class EventDeletion:
+    """Changes needed to delete events and their games and players.
+
+    events, games, and players are lists of records to delete, in record
+    key order.
+
+    blocking is a list of player records in the events which are used as
+    the main identification of a person: the events cannot be deleted while
+    blocking is not empty.
+
+    name_references maps name record keys to the number of references to
+    the name removed by the deletion.
+
+    persons maps person record keys to a (person record, aliases) tuple,
+    where aliases are the keys of players being deleted to remove from the
+    person record's alias list.
+
+    """
+
+    def __init__(self):
+        """Initialise empty change set."""
+        super().__init__()
+        self.events = []
+        self.games = []
+        self.players = []
+        self.blocking = []
+        self.name_references = Counter()
+        self.persons = {}
+
+    def get_summary(self):
+        """Return one line text summary of changes."""
+        return "".join(
+            [
+                str(len(self.events)),
+                " events, ",
+                str(len(self.games)),
+                " games, and ",
+                str(len(self.players)),
+                " players to delete; ",
+                str(len(self.name_references)),
+                " names and ",
+                str(len(self.persons)),
+                " persons affected.",
+            ]
+        )
+
+    def apply(self, database, progress=None, batch_size=DELETE_BATCH_SIZE):
+        """Apply changes to database within the caller's transaction.
+
+        progress, if not None, is called with the phase name, the number of
+        records done, and the number of records in the phase after each
+        batch of batch_size records.
+
+        """
+        if self.blocking:
+            raise EventDeletionError(
+                "Events cannot be deleted while players in them are used "
+                "as the main identification of a person"
+            )
+
+        def delete_records(phase, records, dbset):
+            """Delete records from dbset reporting progress for phase."""
+            for count, record in enumerate(records, start=1):
+                record.delete_record(database, dbset)
+                if progress and (
+                    count % batch_size == 0 or count == len(records)
+                ):
+                    progress(phase, count, len(records))
+
+        delete_records("Delete games", self.games, filespec.GAME_FILE_DEF)
+        namekeys = sorted(self.name_references)
+        for count, key in enumerate(namekeys, start=1):
+            name = get_name(database, key)
+            if name is not None:
+                newname = name.clone()
+                newname.value.reference_count -= self.name_references[key]
+                if newname.value.reference_count <= 0:
+                    name.delete_record(database, filespec.NAME_FILE_DEF)
+                else:
+                    name.edit_record(
+                        database,
+                        filespec.NAME_FILE_DEF,
+                        filespec.NAME_FIELD_DEF,
+                        newname,
+                    )
+            if progress and (
+                count % batch_size == 0 or count == len(namekeys)
+            ):
+                progress("Update names", count, len(namekeys))
+        personkeys = sorted(self.persons)
+        for count, key in enumerate(personkeys, start=1):
+            person = self.persons[key][0]
+            newperson = person.clone()
+            for alias in self.persons[key][1]:
+                newperson.value.alias.remove(alias)
+            person.edit_record(
+                database,
+                filespec.PLAYER_FILE_DEF,
+                filespec.PLAYER_FIELD_DEF,
+                newperson,
+            )
+            if progress and (
+                count % batch_size == 0 or count == len(personkeys)
+            ):
+                progress("Update persons", count, len(personkeys))
+        delete_records(
+            "Delete players", self.players, filespec.PLAYER_FILE_DEF
+        )
+        delete_records("Delete events", self.events, filespec.EVENT_FILE_DEF)
+
+
+def get_events_in_date_range(database, startdate=None, enddate=None):
+    """Return keys of events played entirely from startdate to enddate.
+
+    startdate and enddate are ISO format dates and None means no limit.
+
+    """
+    start = database.encode_record_selector(startdate or "")
+    end = None if enddate is None else database.encode_record_selector(enddate)
+    keys = []
+    cursor = database.database_cursor(
+        filespec.EVENT_FILE_DEF, filespec.STARTDATE_FIELD_DEF
+    )
+    try:
+        r = cursor.nearest(start)
+        while r:
+            if end is not None and database.encode_record_selector(r[0]) > end:
+                break
+            keys.append(r[1])
+            r = cursor.next()
+    finally:
+        cursor.close()
+    if end is None:
+        return sorted(keys)
+    return sorted(
+        k
+        for k in keys
+        if database.encode_record_selector(
+            get_event(database, k).value.enddate
+        )
+        <= end
+    )
+
+
+def get_event_deletion(database, eventkeys):
+    """Return EventDeletion to delete events with keys in eventkeys."""
+    deletion = EventDeletion()
+    references = deletion.name_references
+    for key in sorted(set(eventkeys)):
+        event = get_event(database, key)
+        if event is None:
+            continue
+        deletion.events.append(event)
+        references.update(event.value.sections)
+    deletion.games = get_games_for_events(
+        database, [(event.key.recno,) for event in deletion.events]
+    )
+    for game in deletion.games:
+        value = game.value
+        references.update(
+            s
+            for s in (value.awayteam, value.hometeam, value.section)
+            if s is not None
+        )
+    for key, player in get_aliases_for_games(database, deletion.games).items():
+        if player is None:
+            continue
+        value = player.value
+        if (
+            value.get_alias_list()
+            or value.merge is False
+            or value.merge is True
+        ):
+            deletion.blocking.append(player)
+            continue
+        deletion.players.append(player)
+        if value.affiliation is not None:
+            references[value.affiliation] += 1
+        if value.section:
+            references[value.section] += 1
+        if isinstance(value.merge, int):
+            person = deletion.persons.get(value.merge)
+            if person is None:
+                person = deletion.persons[value.merge] = (
+                    get_person_from_alias(database, player),
+                    [],
+                )
+            person[1].append(key)
+    return deletion
+
+
+def delete_events(
+    database, eventkeys, progress=None, batch_size=DELETE_BATCH_SIZE
+):
+    """Delete events with keys in eventkeys, and their games and players.
+
+    The deletion is done in a transaction which is committed if the events
+    can be deleted.  The EventDeletion is returned, and the database is not
+    changed if its blocking list is not empty.
+
+    """
+    database.start_transaction()
+    try:
+        deletion = get_event_deletion(database, eventkeys)
+        if deletion.blocking:
+            database.backout()
+            return deletion
+        deletion.apply(database, progress=progress, batch_size=batch_size)
+    except BaseException:
+        database.backout()
+        raise
+    database.commit()
+    return deletion
@@ -24,8 +24,14 @@ def _do_ecf_downloaded_data_import(
     specification_items=None,
     ecfdata=None,
     downloaddate=None,
+    dry_run=False,
 ):
-    """Run the import_method to do the import of ecfdata."""
+    """Run the import_method to do the import of ecfdata.
+
+    If dry_run is True import_method reports the changes without applying
+    them.
+
+    """
     results = widget.get_appsys().get_results_database()
     if not results:
         return False
@@ -37,6 +43,7 @@ def _do_ecf_downloaded_data_import(
             ecfdata=ecfdata,
             parent=widget.get_widget(),
             downloaddate=downloaddate,
+            dry_run=dry_run,
         ),
         use_specification_items=specification_items,
     )
@@ -98,11 +105,12 @@ def _do_ecf_reference_data_import(
 
 
 def copy_ecf_players_post_2020_rules(
-    widget, logwidget=None, ecfdata=None, downloaddate=None
+    widget, logwidget=None, ecfdata=None, downloaddate=None, dry_run=False
 ):
     """Import a new ECF player file.
 
     widget - the manager object for the ecf data import tab
+    dry_run - report the changes without applying them if True
 
     """
     return _do_ecf_downloaded_data_import(
@@ -118,15 +126,17 @@ def copy_ecf_players_post_2020_rules(
         },
         ecfdata=ecfdata,
         downloaddate=downloaddate,
+        dry_run=dry_run,
     )
 
 
 def copy_ecf_clubs_post_2020_rules(
-    widget, logwidget=None, ecfdata=None, downloaddate=None
+    widget, logwidget=None, ecfdata=None, downloaddate=None, dry_run=False
 ):
     """Import a new ECF club file.
 
     widget - the manager object for the ecf data import tab
+    dry_run - report the changes without applying them if True
 
     """
     return _do_ecf_downloaded_data_import(
@@ -141,6 +151,7 @@ def copy_ecf_clubs_post_2020_rules(
         },
         ecfdata=ecfdata,
         downloaddate=downloaddate,
+        dry_run=dry_run,
     )
 
 
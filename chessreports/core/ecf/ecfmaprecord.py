@@ -7,9 +7,10 @@
 from ast import literal_eval
 
 from solentware_base.core.record import KeyData
-from solentware_base.core.record import ValueList, Record, Value
+from solentware_base.core.record import Value
 
 from .. import filespec
+from ..valuecodec import CodecValueList, CodecRecord
 from . import ecfrecord
 from ..resultsrecord import get_unpacked_player_identity
 
@@ -20,7 +21,7 @@ class ECFmapDBkeyClub(KeyData):
     pass
 
 
-class ECFmapDBvalueClub(ValueList):
+class ECFmapDBvalueClub(CodecValueList):
     """ECF club for player in event."""
 
     attributes = dict(
@@ -64,7 +65,7 @@ class ECFmapDBvalueClub(ValueList):
         return get_unpacked_player_identity(self.playername)
 
 
-class ECFmapDBrecordClub(Record):
+class ECFmapDBrecordClub(CodecRecord):
     """Player in event associated with ECF club.
 
     For each ResultsDBrecordPlayer record there are 0 or 1
@@ -83,7 +84,7 @@ class ECFmapDBkeyEvent(KeyData):
     pass
 
 
-class ECFmapDBvalueEvent(ValueList):
+class ECFmapDBvalueEvent(CodecValueList):
     """Event data."""
 
     attributes = dict(
@@ -104,7 +105,7 @@ class ECFmapDBvalueEvent(ValueList):
         self.eventcode = ""
 
 
-class ECFmapDBrecordEvent(Record):
+class ECFmapDBrecordEvent(CodecRecord):
     """Event record."""
 
     def __init__(
@@ -120,7 +121,7 @@ class ECFmapDBkeyPlayer(KeyData):
     pass
 
 
-class ECFmapDBvaluePlayer(ValueList):
+class ECFmapDBvaluePlayer(CodecValueList):
     """ECF name and grading code for player in event."""
 
     attributes = dict(
@@ -169,7 +170,7 @@ class ECFmapDBvaluePlayer(ValueList):
     __hash__ = object.__hash__
 
 
-class ECFmapDBrecordPlayer(Record):
+class ECFmapDBrecordPlayer(CodecRecord):
     """Player in event linked to ECF name and grading code.
 
     For each ResultsDBrecordPlayer record where merge is False
@@ -414,26 +415,43 @@ def get_player_for_alias(database, aliaskey):
 
 
 def get_player_clubs_for_games(database, games):
-    """Return {record key : ECFmapDBrecordClub(), ...} for games."""
-    players = dict()
+    """Return {record key : ECFmapDBrecordClub(), ...} for games.
+
+    One cursor on the player alias index is used for all players, visited
+    in index key order by stepping the cursor forward, and the club records
+    are read in record key order after collecting all the keys.
+
+    """
+    playerkeys = set()
+    for g in games:
+        playerkeys.add(g.value.homeplayer)
+        playerkeys.add(g.value.awayplayer)
+    wanted = sorted(
+        (database.encode_record_number(pk), pk) for pk in playerkeys
+    )
+    clubkeys = {}
     cursor = database.database_cursor(
         filespec.MAPECFCLUB_FILE_DEF, filespec.PLAYERALIASID_FIELD_DEF
     )
     try:
-        for g in games:
-            for pk in (g.value.homeplayer, g.value.awayplayer):
-                if pk not in players:
-                    pkc = database.encode_record_number(pk)
-                    r = cursor.nearest(pkc)
-                    if r is not None:
-                        if database.encode_record_selector(r[0]) != pkc:
-                            continue
-                        p = database.get_primary_record(
-                            filespec.MAPECFCLUB_FILE_DEF, r[-1]
-                        )
-                        if p is not None:
-                            players[pk] = ECFmapDBrecordClub()
-                            players[pk].load_record(p)
+        if wanted:
+            r = cursor.nearest(wanted[0][0])
+            for pkc, pk in wanted:
+                while r is not None:
+                    ik = database.encode_record_selector(r[0])
+                    if ik >= pkc:
+                        break
+                    r = cursor.next()
+                if r is None:
+                    break
+                if ik == pkc:
+                    clubkeys[r[-1]] = pk
     finally:
         cursor.close()
+    players = dict()
+    for ck in sorted(clubkeys):
+        p = database.get_primary_record(filespec.MAPECFCLUB_FILE_DEF, ck)
+        if p is not None:
+            players[clubkeys[ck]] = ECFmapDBrecordClub()
+            players[clubkeys[ck]].load_record(p)
     return players
@@ -4,14 +4,14 @@
 
 """Record definition classes for data extracted from ECF master files."""
 
-from ast import literal_eval
-
 from solentware_base.core.record import KeyData
-from solentware_base.core.record import Value, ValueList, Record
+from solentware_base.core.record import Value, Record
 
 from . import ecfclubdb
 from . import ecfplayerdb
 from .. import filespec
+from .. import valuecodec
+from ..valuecodec import CodecValueList, CodecValue, CodecRecord
 
 New = "New"
 _Change = "Change"
@@ -97,7 +97,7 @@ class ECFrefDBkeyECFclub(KeyData):
     pass
 
 
-class ECFrefDBvalueECFclub(Value):
+class ECFrefDBvalueECFclub(CodecValue):
     """Club data from ECF."""
 
     def __init__(self):
@@ -115,7 +115,7 @@ class ECFrefDBvalueECFclub(Value):
             self.ECFactive,
             self.ECFname,
             self.ECFcountycode,
-        ) = literal_eval(value)
+        ) = valuecodec.decode(value)
 
     def pack(self):
         """Extend, return ECF club record and index data."""
@@ -127,12 +127,12 @@ class ECFrefDBvalueECFclub(Value):
 
     def pack_value(self, *a):
         """Override, return tuple of self attributes."""
-        return repr(
+        return self.encode(
             (self.ECFcode, self.ECFactive, self.ECFname, self.ECFcountycode)
         )
 
 
-class ECFrefDBrecordECFclub(Record):
+class ECFrefDBrecordECFclub(CodecRecord):
     """Club record from ECF."""
 
     def __init__(
@@ -148,7 +148,7 @@ class ECFrefDBkeyECFplayer(KeyData):
     pass
 
 
-class ECFrefDBvalueECFplayer(Value):
+class ECFrefDBvalueECFplayer(CodecValue):
     """Player data from ECF."""
 
     def __init__(self):
@@ -168,7 +168,7 @@ class ECFrefDBvalueECFplayer(Value):
             self.ECFname,
             self.ECFclubcodes,
             self.ECFmerge,
-        ) = literal_eval(value)
+        ) = valuecodec.decode(value)
 
     def pack(self):
         """Extend, return ECF player record and index data."""
@@ -180,7 +180,7 @@ class ECFrefDBvalueECFplayer(Value):
 
     def pack_value(self, *a):
         """Override, return tuple of self attributes."""
-        return repr(
+        return self.encode(
             (
                 self.ECFcode,
                 self.ECFactive,
@@ -191,7 +191,7 @@ class ECFrefDBvalueECFplayer(Value):
         )
 
 
-class ECFrefDBrecordECFplayer(Record):
+class ECFrefDBrecordECFplayer(CodecRecord):
     """Player record from ECF."""
 
     def __init__(
@@ -330,7 +330,7 @@ class ECFrefDBkeyEvent(KeyData):
     pass
 
 
-class ECFrefDBvalueEvent(ValueList):
+class ECFrefDBvalueEvent(CodecValueList):
     """Event data."""
 
     attributes = dict(
@@ -380,7 +380,7 @@ class ECFrefDBvalueEvent(ValueList):
         return v
 
 
-class ECFrefDBrecordEvent(Record):
+class ECFrefDBrecordEvent(CodecRecord):
     """Event record."""
 
     def __init__(
@@ -0,0 +1,148 @@
+# eventsummary.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Collect the games in events with their counts and results.
+
+The games for all the events are read with one cursor on the game event
+index, and counted by event, section, team, and player, with the players'
+results, in one pass over the games.  The event, name, and player records
+for the keys found in the games are read after the pass, once each and in
+record key order.
+
+The event summary and game summary reports on the Events tab are built
+from an EventSummary.
+
+"""
+
+from collections import Counter
+
+from . import constants
+from .resultsrecord import (
+    get_alias,
+    get_event,
+    get_games_for_events,
+    get_name,
+)
+
+# Index of won, drawn, and lost counts in EventSummary.player_scores items
+# for the results of the home and away players.
+_HOME_SCORE = {constants.HWIN: 0, constants.DRAW: 1, constants.AWIN: 2}
+_AWAY_SCORE = {constants.HWIN: 2, constants.DRAW: 1, constants.AWIN: 0}
+
+
+class EventSummary:
+    """Games in events with their counts and results, and decoded keys.
+
+    The attributes are filled by collect().
+
+    games is a list of the game records in record key order, and
+    event_games maps event keys to lists of their games.
+
+    event_players maps event keys to the set of player keys in the event's
+    games.  section_counts, team_counts, and player_counts count games by
+    section and team name keys, and by player key.  player_scores maps
+    player keys to [won, drawn, lost] counts, other results not counted.
+
+    events maps event keys to event record values, names maps name keys to
+    names for the sections and teams in games and the sections of events,
+    and players maps player keys to player records.  persons maps player
+    keys to the key of the player's person, or None if the player has not
+    been identified.
+
+    """
+
+    def __init__(self, database, eventkeys):
+        """Note database and keys of events to summarize in eventkeys."""
+        super().__init__()
+        self.database = database
+        self.eventkeys = list(dict.fromkeys(eventkeys))
+        self.games = []
+        self.event_games = {}
+        self.event_players = {}
+        self.section_counts = Counter()
+        self.team_counts = Counter()
+        self.player_counts = Counter()
+        self.player_scores = {}
+        self.events = {}
+        self.names = {}
+        self.players = {}
+        self.persons = {}
+
+    def collect(self):
+        """Count games in events then read records for keys found."""
+        self.games = get_games_for_events(
+            self.database, [(key,) for key in self.eventkeys]
+        )
+        event_games = self.event_games = {k: [] for k in self.eventkeys}
+        event_players = self.event_players = {k: set() for k in self.eventkeys}
+        section_counts = self.section_counts = Counter()
+        team_counts = self.team_counts = Counter()
+        player_counts = self.player_counts = Counter()
+        player_scores = self.player_scores = {}
+        for game in self.games:
+            value = game.value
+            home = value.homeplayer
+            away = value.awayplayer
+            event_games.setdefault(value.event, []).append(game)
+            players = event_players.setdefault(value.event, set())
+            players.add(home)
+            players.add(away)
+            player_counts[home] += 1
+            player_counts[away] += 1
+            if value.section is not None:
+                section_counts[value.section] += 1
+            for team in (value.hometeam, value.awayteam):
+                if team is not None:
+                    team_counts[team] += 1
+            if value.result in _HOME_SCORE:
+                player_scores.setdefault(home, [0, 0, 0])[
+                    _HOME_SCORE[value.result]
+                ] += 1
+                player_scores.setdefault(away, [0, 0, 0])[
+                    _AWAY_SCORE[value.result]
+                ] += 1
+        self._read_records()
+
+    def _read_records(self):
+        """Read event, name, and player records for keys in games."""
+        database = self.database
+        self.events = {}
+        for key in sorted(self.event_games):
+            event = get_event(database, key)
+            if event is not None:
+                self.events[key] = event.value
+        namekeys = set(self.section_counts)
+        namekeys.update(self.team_counts)
+        for value in self.events.values():
+            namekeys.update(value.sections)
+        self.names = {}
+        for key in sorted(namekeys):
+            name = get_name(database, key)
+            self.names[key] = "" if name is None else name.value.name
+        self.players = {
+            key: get_alias(database, key) for key in sorted(self.player_counts)
+        }
+        alias_person_map = database.get_alias_person_map()
+        self.persons = {}
+        for key, player in self.players.items():
+            merge = None if player is None else player.value.merge
+            if merge is None:
+                self.persons[key] = None
+            elif merge is True or merge is False:
+                self.persons[key] = key
+            else:
+                self.persons[key] = alias_person_map.get_person_key(
+                    database, merge
+                )
+
+    def get_event_person_count(self, key):
+        """Return number of identified persons with games in event key."""
+        persons = self.persons
+        return len(
+            {
+                persons[p]
+                for p in self.event_players.get(key, ())
+                if persons[p] is not None
+            }
+        )
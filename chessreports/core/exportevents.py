@@ -0,0 +1,267 @@
+# exportevents.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Export events, with their games and players, from a results database.
+
+The export is the key=value lines read by importreports: the identities
+of all players on the database, with their aliases, followed by the games
+in the events exported.
+
+The lines are generated while reading the database and written straight to
+the output file, so the size of the export does not affect memory used.
+Each name, event, and game player record is read once per export and the
+answer kept in a memo.
+
+"""
+
+import os
+import bz2
+
+from . import constants, filespec
+from .importreports import convert_alias_to_transfer_format
+from .resultsrecord import (
+    ResultsDBrecordPlayer,
+    get_alias,
+    get_alias_identity,
+    get_event,
+    get_games_for_event,
+    get_name,
+)
+
+# Merge values of player records which are the main alias of a person, or
+# not identified yet.
+_MAIN_ALIAS_TYPES = {type(True), type(False), type(None)}
+
+# Keys of the player lines for each player in a game.
+_HOME_PLAYER = (
+    constants._homename,
+    constants._homepin,
+    constants._homepinfalse,
+    constants._homeaffiliation,
+    constants._homereportedcodes,
+)
+_AWAY_PLAYER = (
+    constants._awayname,
+    constants._awaypin,
+    constants._awaypinfalse,
+    constants._awayaffiliation,
+    constants._awayreportedcodes,
+)
+
+
+class ExportEventsError(Exception):
+    """Exception raised when events cannot be exported."""
+
+
+class EventExport:
+    """Generate the lines of an export of events from a results database.
+
+    names, events, and players map record keys to the details used in the
+    export, and are filled as the records are read.
+
+    """
+
+    def __init__(self, database, eventkeys):
+        """Note database and keys of events to export in eventkeys."""
+        super().__init__()
+        self.database = database
+        self.eventkeys = list(dict.fromkeys(eventkeys))
+        self.names = {}
+        self.events = {}
+        self.players = {}
+        self.line_count = 0
+
+    def get_name(self, key):
+        """Return name for name record key."""
+        name = self.names.get(key)
+        if name is None:
+            name = self.names[key] = get_name(self.database, key).value.name
+        return name
+
+    def get_event_identity(self, key):
+        """Return (name, start date, end date, section names) for event key."""
+        identity = self.events.get(key)
+        if identity is None:
+            value = get_event(self.database, key).value
+            identity = self.events[key] = (
+                value.name,
+                value.startdate,
+                value.enddate,
+                tuple(self.get_name(s) for s in value.sections),
+            )
+        return identity
+
+    def get_player(self, key):
+        """Return (name, pin, affiliation, reported codes) for player key."""
+        player = self.players.get(key)
+        if player is None:
+            record = get_alias(self.database, key)
+            if record is None:
+                raise ExportEventsError(
+                    "Cannot generate an export file when some players in "
+                    "the events being exported are not on the database."
+                )
+            value = record.value
+            player = self.players[key] = (
+                value.name,
+                value.pin,
+                value.affiliation,
+                value.reported_codes,
+            )
+        return player
+
+    def _get_alias_identity(self, key):
+        """Return identity of player record key for export."""
+        record = get_alias(self.database, key)
+        if record is None:
+            raise ExportEventsError(
+                "Cannot generate an export file when some aliases of "
+                "players on the database are missing."
+            )
+        record.set_database(self.database)
+        return get_alias_identity(record)
+
+    def generate_player_lines(self):
+        """Yield lines for identities of all players on database.
+
+        Each player which is not an alias of another is given with its
+        aliases, and its own identity last.
+
+        """
+        database = self.database
+        record = ResultsDBrecordPlayer()
+        record.set_database(database)
+        rset = database.recordlist_ebm(filespec.PLAYER_FILE_DEF)
+        cursor = database.database_cursor(
+            filespec.PLAYER_FILE_DEF, None, recordset=rset
+        )
+        try:
+            r = cursor.first()
+            while r:
+                record.load_record(r)
+                value = record.value
+                if type(value.merge) in _MAIN_ALIAS_TYPES:
+                    key = record.key.recno
+                    for alias in value.alias:
+                        if alias != key:
+                            yield from convert_alias_to_transfer_format(
+                                self._get_alias_identity(alias),
+                                constants._name,
+                            )
+                    yield from convert_alias_to_transfer_format(
+                        get_alias_identity(record), constants._name
+                    )
+                    yield "=".join((constants._exportedeventplayer, "true"))
+                r = cursor.next()
+        finally:
+            cursor.close()
+            try:
+                rset.close()
+            except AttributeError:
+                pass
+
+    def _get_player_lines(self, key, names):
+        """Return lines for player key in game using keys in names."""
+        cname, cpin, cpinfalse, caffiliation, creportedcodes = names
+        name, pin, affiliation, reportedcodes = self.get_player(key)
+        lines = ["=".join((cname, name))]
+        if pin:
+            lines.append("=".join((cpin, str(pin))))
+        elif pin is False:
+            lines.append("=".join((cpinfalse, "true")))
+        if affiliation:
+            lines.append("=".join((caffiliation, self.get_name(affiliation))))
+        if reportedcodes:
+            for rc in reportedcodes:
+                lines.append("=".join((creportedcodes, rc)))
+        return lines
+
+    def _get_game_lines(self, value):
+        """Return lines for game record value."""
+        name, startdate, enddate, sections = self.get_event_identity(
+            value.event
+        )
+        lines = [
+            "=".join((constants._event, name)),
+            "=".join((constants._startdate, startdate)),
+            "=".join((constants._enddate, enddate)),
+        ]
+        for s in sections:
+            lines.append("=".join((constants._eventsection, s)))
+        if value.homeplayerwhite is True:
+            colour = constants._yes
+        elif value.homeplayerwhite is False:
+            colour = constants._no
+        else:
+            colour = constants.NOCOLOR
+        lines.append("=".join((constants._homeplayerwhite, colour)))
+        lines.append("=".join((constants._date, value.date)))
+        if value.board:
+            lines.append("=".join((constants._board, value.board)))
+        if value.round:
+            lines.append("=".join((constants._round, value.round)))
+        for key, namekey in (
+            (constants._hometeam, value.hometeam),
+            (constants._awayteam, value.awayteam),
+            (constants._section, value.section),
+        ):
+            if namekey:
+                lines.append("=".join((key, self.get_name(namekey))))
+        lines.extend(self._get_player_lines(value.homeplayer, _HOME_PLAYER))
+        lines.extend(self._get_player_lines(value.awayplayer, _AWAY_PLAYER))
+        lines.append("=".join((constants._result, value.result)))
+        return lines
+
+    def generate_game_lines(self):
+        """Yield lines for games in events, one event at a time."""
+        for key in self.eventkeys:
+            event = get_event(self.database, key)
+            if event is None:
+                continue
+            for game in get_games_for_event(self.database, event):
+                yield from self._get_game_lines(game.value)
+
+    def generate_lines(self):
+        """Yield all lines of export."""
+        yield from self.generate_player_lines()
+        yield from self.generate_game_lines()
+
+    def write(self, file):
+        """Write export to text file, lines separated by newline."""
+        self.line_count = 0
+        for line in self.generate_lines():
+            if self.line_count:
+                file.write("\n")
+            file.write(line)
+            self.line_count += 1
+
+
+def open_export_file(filename, mode="wt"):
+    """Return export file filename opened in mode, bz2 if name ends .bz2."""
+    if filename.lower().endswith(".bz2"):
+        return bz2.open(filename, mode=mode, encoding="utf8")
+    return open(filename, mode=mode, encoding="utf8")
+
+
+def export_events(database, eventkeys, filename):
+    """Write export of events with keys in eventkeys to filename.
+
+    The export is done in a read only transaction and the EventExport is
+    returned.  The file is removed if the export fails.
+
+    """
+    export = EventExport(database, eventkeys)
+    database.start_read_only_transaction()
+    try:
+        with open_export_file(filename) as file:
+            export.write(file)
+    except BaseException:
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+        raise
+    finally:
+        database.end_read_only_transaction()
+    return export
@@ -6,6 +6,7 @@
 
 from . import resultsrecord
 from . import filespec
+from .constants import AWIN, DRAW, HWIN
 
 
 def get_new_player_for_alias_key(database, key):
@@ -39,18 +40,17 @@ def get_person_for_alias_key(database, key):
     or False.
     Return this record if value.merge is False (identified player).
     Return None if value.merge is None or True (unidentified player).
-    Return None if _get_merge_for_alias_key() returns None.
+    Return None if a record in the merge chain does not exist.
+
+    The database's AliasPersonMap is used to avoid repeating the step up
+    the merge chain.
 
     """
-    r = _get_merge_for_alias_key(database, key[-1])
-    while r:
-        if r.value.merge is False:
-            return r
-        elif r.value.merge is True:
-            return
-        elif r.value.merge is None:
-            return
-        r = _get_merge_for_alias_key(database, r.value.merge)
+    r = database.get_alias_person_map().get_person_record(database, key[-1])
+    if r is None:
+        return
+    elif r.value.merge is False:
+        return r
 
 
 def get_persons_for_alias_keys(database, keys):
@@ -220,29 +220,212 @@ def merge_new_players(database, playerrecord, merges):
     return None
 
 
-def _get_merge_for_alias_key(database, key):
-    """Return the Alias record of the merged player.
+class AliasPersonMap:
+    """Map alias record keys to the record at the end of their merge chain.
 
-    Allow for value.merge on the record with key srkey being any value.
-    Return the record if value.merge is None True or False.
-    Otherwise assume value.merge is integer and use it to retreive and
-    return a record.
-    return None if get_alias() returns None.
+    The record at the end of the merge chain has value.merge None True or
+    False.  The chain is walked once for an alias and the answer is kept
+    with the keys of all records visited, so an edit or delete of any of
+    those records discards the answers which depended on it.
+
+    ResultsDBrecordPlayer calls discard() when a player record is put,
+    edited, or deleted; which covers join_merged_players, merge_new_players,
+    and the break merge actions.  The database calls clear() on backout.
 
     """
-    r = resultsrecord.get_alias(database, key)
-    if r is None:
-        return
-    elif r.value.merge is None:
-        return r
-    elif r.value.merge is True:
-        return r
-    elif r.value.merge is False:
-        return r
-    r = resultsrecord.get_alias(database, r.value.merge)
-    if r is None:
-        return
-    return r
+
+    def __init__(self):
+        """Initialise an empty map."""
+        super().__init__()
+        self._persons = {}
+        self._dependants = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_person_record(self, database, key):
+        """Return record at end of merge chain for alias key, or None.
+
+        None is returned if a record in the chain does not exist or the
+        chain loops back on itself.
+
+        """
+        record = self._get_person_record(database, key)
+        if record is None:
+            return None
+        return record.clone()
+
+    def get_person_key(self, database, key):
+        """Return key of record at end of merge chain for alias key, or None.
+
+        None is returned if get_person_record would return None.
+
+        """
+        record = self._get_person_record(database, key)
+        if record is None:
+            return None
+        return record.key.recno
+
+    def _get_person_record(self, database, key):
+        """Return shared record at end of merge chain for alias key, or None."""
+        if key in self._persons:
+            self.hits += 1
+            return self._persons[key]
+        self.misses += 1
+        chain = []
+        record = None
+        merge = key
+        while merge not in chain:
+            chain.append(merge)
+            record = resultsrecord.get_alias(database, merge)
+            if record is None:
+                break
+            merge = record.value.merge
+            if merge is None or merge is True or merge is False:
+                break
+        else:
+            record = None
+        self._persons[key] = record
+        for item in chain:
+            self._dependants.setdefault(item, set()).add(key)
+        return record
+
+    def discard(self, key):
+        """Discard answers for aliases whose merge chain includes key."""
+        for alias in self._dependants.pop(key, ()):
+            self._persons.pop(alias, None)
+
+    def clear(self):
+        """Discard all answers."""
+        self._persons.clear()
+        self._dependants.clear()
+
+
+class PersonGameMap:
+    """Map player record keys to the games played by the player.
+
+    The games for a player are the games indexed on the GAMEPLAYER index
+    for the player record and the records in its alias list.  They are
+    found once for a player and kept with the keys of the player record and
+    its aliases, so a put, edit, or delete of a game for any of these, or
+    of any of these player records, discards the games for the player.
+
+    Opponents are kept as the alias on the game record and converted to
+    the record at the end of the merge chain, usually the person, through
+    the database's AliasPersonMap when the games are fetched.
+
+    ResultsDBrecordGame and ResultsDBrecordPlayer call discard() when a
+    record is put, edited, or deleted; which covers update_results in
+    CollationDB and the merge functions.  The database calls clear() on
+    backout.
+
+    The player details dialogue lists a player's games from this map.
+
+    """
+
+    def __init__(self):
+        """Initialise an empty map."""
+        super().__init__()
+        self._games = {}
+        self._dependants = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_games(self, database, key):
+        """Return [(game key, opponent, result, date), ...] for player key.
+
+        opponent is the key of the record at the end of the opponent's
+        merge chain, or None if the chain is broken.  result is 1, 0, or -1
+        for a win, draw, or loss by the player, or None if the game is not
+        a win, draw, or loss.  The games are in game key order.
+
+        """
+        games = self._games.get(key)
+        if games is None:
+            self.misses += 1
+            games = self._find_games(database, key)
+        else:
+            self.hits += 1
+        alias_person_map = database.get_alias_person_map()
+        return [
+            (
+                gamekey,
+                alias_person_map.get_person_key(database, opponent),
+                result,
+                date,
+            )
+            for gamekey, opponent, result, date in games
+        ]
+
+    def _find_games(self, database, key):
+        """Return games for player key found on GAMEPLAYER index."""
+        aliases = [key]
+        record = resultsrecord.get_alias(database, key)
+        if record is not None:
+            aliases.extend(record.value.get_alias_list())
+        gamekeys = set()
+        cursor = database.database_cursor(
+            filespec.GAME_FILE_DEF, filespec.GAMEPLAYER_FIELD_DEF
+        )
+        try:
+            for alias in sorted(set(aliases)):
+                playerkey = database.encode_record_number(alias)
+                r = cursor.nearest(playerkey)
+                while r:
+                    gp, gk = r
+                    if database.encode_record_selector(gp) != playerkey:
+                        break
+                    gamekeys.add(gk)
+                    r = cursor.next()
+        finally:
+            cursor.close()
+        aliases = set(aliases)
+        games = []
+        for gk in sorted(gamekeys):
+            g = database.get_primary_record(filespec.GAME_FILE_DEF, gk)
+            if g is None:
+                continue
+            game = resultsrecord.ResultsDBrecordGame()
+            game.load_record(g)
+            value = game.value
+            for player, opponent, win, loss in (
+                (value.homeplayer, value.awayplayer, HWIN, AWIN),
+                (value.awayplayer, value.homeplayer, AWIN, HWIN),
+            ):
+                if player not in aliases:
+                    continue
+                if value.result == win:
+                    result = 1
+                elif value.result == loss:
+                    result = -1
+                elif value.result == DRAW:
+                    result = 0
+                else:
+                    result = None
+                games.append((game.key.recno, opponent, result, value.date))
+        self._games[key] = games
+        for alias in aliases:
+            self._dependants.setdefault(alias, set()).add(key)
+        return games
+
+    def discard(self, key):
+        """Discard games for players whose games depend on player key."""
+        for player in self._dependants.pop(key, ()):
+            self._games.pop(player, None)
+
+    def clear(self):
+        """Discard all games."""
+        self._games.clear()
+        self._dependants.clear()
+
+
+def get_games_for_player(database, key):
+    """Return [(game key, opponent, result, date), ...] for player key.
+
+    The database's PersonGameMap is used so the GAMEPLAYER index is read
+    once for a player until a game or player record it depends on changes.
+
+    """
+    return database.get_person_game_map().get_games(database, key)
 
 
 def _get_records(database, keys, function):
@@ -17,6 +17,7 @@ from ...minorbases.textapi import (
     FOLDER,
     FIELDS,
 )
+from ...minorbases.ziptextapi import ZipTextapiRoot
 
 PLAYERS = "ogdplayers"
 
@@ -25,8 +26,13 @@ class ECFOGD(Textapi):
     """Access an Online Grading Database file published by ECF."""
 
     def __init__(self, DBpath):
-        """Define filespec for text in DBpath file, and delegate."""
-        if isinstance(DBpath, io.BytesIO):
+        """Define filespec for text in DBpath file, and delegate.
+
+        DBpath is a file name, a BytesIO, or a tuple of a zip file name and
+        the name of the member holding the text.
+
+        """
+        if isinstance(DBpath, (io.BytesIO, tuple)):
             d, f = False, DBpath
         else:
             d, f = split(DBpath)
@@ -41,7 +47,14 @@ class ECFOGD(Textapi):
         Textapi.__init__(self, dbnames, d)
 
     def make_root(self, filename):
-        """Return ECFOGDRoot instance for filename."""
+        """Return ECFOGDRoot instance for filename.
+
+        An ECFOGDZipRoot instance is returned if filename is a tuple of zip
+        file name and member name.
+
+        """
+        if isinstance(filename, tuple):
+            return ECFOGDZipRoot(*filename)
         return ECFOGDRoot(filename)
 
 
@@ -58,7 +71,10 @@ class ECFOGDRoot(TextapiRoot):
     def open_root(self):
         """Delegate then note CSV file fieldnames and row count."""
         super(ECFOGDRoot, self).open_root()
-        self.headerline = self.textlines.pop(0)
+        if self._table_link is None:
+            return
+        self.headerline = self.textlines[0]
+        self.textlines = self.textlines[1:]
         self.record_count = len(self.textlines)
         if isinstance(self.headerline, bytes):
             try:
@@ -70,6 +86,15 @@ class ECFOGDRoot(TextapiRoot):
             self.fieldnames = csv.DictReader([self.headerline]).fieldnames
 
 
+class ECFOGDZipRoot(ECFOGDRoot, ZipTextapiRoot):
+    """Provide record access to an Online Grading Database file in a zip file.
+
+    The member of the zip file is read through the line offset index rather
+    than copied into memory.
+
+    """
+
+
 class ECFOGDkey(KeyText):
     """OGD player key."""
 
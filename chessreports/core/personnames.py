@@ -0,0 +1,46 @@
+# personnames.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Shared bounded cache of parsed person names.
+
+Packing player records, answering index lookups, and matching names when
+identifying players parse the same few thousand names over and over during
+an event import or a merge.  The parsed names are kept in a least recently
+used cache shared by all these uses.
+
+"""
+
+import functools
+
+from solentware_misc.core.utilities import AppSysPersonNameParts
+
+# Enough for the players in several seasons of a large league.
+PERSON_NAME_CACHE_SIZE = 20000
+
+
+@functools.lru_cache(maxsize=PERSON_NAME_CACHE_SIZE)
+def get_person_name_parts(name):
+    """Return AppSysPersonNameParts instance for name.
+
+    The instance is shared by all callers so partialnames is a frozenset.
+
+    """
+    parts = AppSysPersonNameParts(name)
+    parts.partialnames = frozenset(parts.partialnames)
+    return parts
+
+
+def get_person_name(name):
+    """Return normalized name, AppSysPersonName(name).name, for name."""
+    return get_person_name_parts(name).name
+
+
+def get_person_name_cache_info():
+    """Return hits, misses, maxsize, and currsize of person name cache."""
+    return get_person_name_parts.cache_info()
+
+
+def clear_person_name_cache():
+    """Discard all names and reset counts in person name cache."""
+    get_person_name_parts.cache_clear()
@@ -0,0 +1,80 @@
+# recordcache.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Cache of records read by primary key for the resultsrecord helpers.
+
+Reports and the player identification actions look up the same few events,
+names, and players thousands of times while following the keys held on game
+and player records.  The RecordCache keeps the records read by key for each
+file so each is read from the database once.
+
+The database discards the entry for a record when it is put, edited, or
+deleted, and clears the cache on commit and backout.
+
+"""
+
+
+class RecordCache:
+    """Map (file, primary key) to the record read from the database.
+
+    The stored value, the (key, value) tuple returned by get_primary_record,
+    is kept along with a record instance loaded from it on first use.
+
+    get_record returns the shared record instance so callers must not
+    change it.  get_primary_record returns the stored value so callers can
+    load a record instance of their own.
+
+    """
+
+    def __init__(self):
+        """Initialise an empty cache."""
+        super().__init__()
+        self._files = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get_entry(self, database, dbset, key):
+        """Return [stored value, record] for key in dbset, read if needed."""
+        records = self._files.get(dbset)
+        if records is None:
+            records = self._files[dbset] = {}
+        entry = records.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = records[key] = [database.get_primary_record(dbset, key), None]
+        return entry
+
+    def get_primary_record(self, database, dbset, key):
+        """Return stored value for key in dbset, or None if no record."""
+        return self._get_entry(database, dbset, key)[0]
+
+    def get_record(self, database, dbset, key, recordclass):
+        """Return shared recordclass instance for key in dbset, or None."""
+        entry = self._get_entry(database, dbset, key)
+        if entry[0] is None:
+            return None
+        if entry[1] is None:
+            record = recordclass()
+            record.load_record(entry[0])
+            entry[1] = record
+        return entry[1]
+
+    def discard(self, dbset, key):
+        """Discard the record for key in dbset."""
+        records = self._files.get(dbset)
+        if records is not None:
+            records.pop(key, None)
+
+    def clear(self):
+        """Discard all records."""
+        self._files.clear()
+
+    def get_hit_rate(self):
+        """Return fraction of lookups answered from cache, 0 if none done."""
+        lookups = self.hits + self.misses
+        if not lookups:
+            return 0
+        return self.hits / lookups
@@ -9,17 +9,14 @@ from ast import literal_eval
 from solentware_base.core.record import KeyData
 from solentware_base.core.record import Value, ValueList, Record
 
-from solentware_misc.core.utilities import (
-    AppSysPersonNameParts,
-    AppSysPersonName,
-)
-
 # Hack while some non-ISO format dates survive on game records
 from solentware_misc.core.utilities import AppSysDate
 
 from chessvalidate.core.gameresults import ecfresult
 
 from . import filespec
+from .valuecodec import CodecValueList, CodecRecord
+from .personnames import get_person_name, get_person_name_parts
 from .constants import AWIN, DRAW, HWIN
 
 # see note in ResultsDBrecordPlayer about possible modification
@@ -101,7 +98,7 @@ class ResultsDBkeyGame(KeyData):
     pass
 
 
-class ResultsDBvalueGame(ValueList):
+class ResultsDBvalueGame(CodecValueList):
     """Game data."""
 
     attributes = dict(
@@ -181,7 +178,7 @@ class ResultsDBvalueGame(ValueList):
         return False
 
 
-class ResultsDBrecordGame(Record):
+class ResultsDBrecordGame(CodecRecord):
     """Game record."""
 
     def __init__(
@@ -190,6 +187,33 @@ class ResultsDBrecordGame(Record):
         """Customise Record with ResultsDBkeyGame and ResultsDBvalueGame."""
         super(ResultsDBrecordGame, self).__init__(keyclass, valueclass)
 
+    def delete_record(self, dbase, dbset):
+        """Extend, discard games found for the players in this game."""
+        super().delete_record(dbase, dbset)
+        _discard_person_game_map_answers(
+            dbase, (self.value.homeplayer, self.value.awayplayer)
+        )
+
+    def edit_record(self, dbase, dbset, dbname, newrecord):
+        """Extend, discard games found for the players in both games."""
+        super().edit_record(dbase, dbset, dbname, newrecord)
+        _discard_person_game_map_answers(
+            dbase,
+            (
+                self.value.homeplayer,
+                self.value.awayplayer,
+                newrecord.value.homeplayer,
+                newrecord.value.awayplayer,
+            ),
+        )
+
+    def put_record(self, dbase, dbset):
+        """Extend, discard games found for the players in this game."""
+        super().put_record(dbase, dbset)
+        _discard_person_game_map_answers(
+            dbase, (self.value.homeplayer, self.value.awayplayer)
+        )
+
     def get_keys(self, datasource=None, partial=None):
         """Override, return [(key, value), ...] by partial key in datasource."""
         try:
@@ -299,7 +323,7 @@ class ResultsDBkeyPlayer(KeyData):
     pass
 
 
-class ResultsDBvaluePlayer(ValueList):
+class ResultsDBvaluePlayer(CodecValueList):
     """Player data."""
 
     attributes = dict(
@@ -384,19 +408,15 @@ class ResultsDBvaluePlayer(ValueList):
         index = v[1]
         identity = self.identity_packed()
         index[filespec.PLAYERALIAS_FIELD_DEF] = [identity]
-        nameparts = AppSysPersonNameParts(self.name)
+        nameparts = get_person_name_parts(self.name)
         if self.merge is None:
-            index[filespec.PLAYERNAMENEW_FIELD_DEF] = [
-                AppSysPersonName(self.name).name
-            ]
+            index[filespec.PLAYERNAMENEW_FIELD_DEF] = [nameparts.name]
             index[filespec.PLAYERNEW_FIELD_DEF] = [identity]
             index[filespec.PLAYERPARTIALNEW_FIELD_DEF] = [
                 pn for pn in nameparts.partialnames
             ]
         elif self.merge is True:
-            index[filespec.PLAYERNAMENEW_FIELD_DEF] = [
-                AppSysPersonName(self.name).name
-            ]
+            index[filespec.PLAYERNAMENEW_FIELD_DEF] = [nameparts.name]
             index[filespec.PLAYERNEW_FIELD_DEF] = [identity]
             index[filespec.PLAYERPARTIALNEW_FIELD_DEF] = [
                 pn for pn in nameparts.partialnames
@@ -416,7 +436,7 @@ class ResultsDBvaluePlayer(ValueList):
         return v
 
 
-class ResultsDBrecordPlayer(Record):
+class ResultsDBrecordPlayer(CodecRecord):
     """Player record."""
 
     # handle changes to related records when alias and merge modified by
@@ -428,6 +448,36 @@ class ResultsDBrecordPlayer(Record):
         """Customise Record with ResultsDBkeyPlayer and ResultsDBvaluePlayer."""
         super(ResultsDBrecordPlayer, self).__init__(keyclass, valueclass)
 
+    def delete_record(self, dbase, dbset):
+        """Extend, discard alias to person map answers using this record.
+
+        Games found for players using this record are discarded too.
+
+        """
+        super().delete_record(dbase, dbset)
+        _discard_alias_person_map_answers(dbase, self.key.recno)
+        _discard_person_game_map_answers(dbase, (self.key.recno,))
+
+    def edit_record(self, dbase, dbset, dbname, newrecord):
+        """Extend, discard alias to person map answers using this record.
+
+        Games found for players using this record are discarded too.
+
+        """
+        super().edit_record(dbase, dbset, dbname, newrecord)
+        _discard_alias_person_map_answers(dbase, self.key.recno)
+        _discard_person_game_map_answers(dbase, (self.key.recno,))
+
+    def put_record(self, dbase, dbset):
+        """Extend, discard alias to person map answers using this record.
+
+        Games found for players using this record are discarded too.
+
+        """
+        super().put_record(dbase, dbset)
+        _discard_alias_person_map_answers(dbase, self.key.recno)
+        _discard_person_game_map_answers(dbase, (self.key.recno,))
+
     def get_keys(self, datasource=None, partial=None):
         """Override, return [(key, value), ...] by partial key in datasource."""
         try:
@@ -449,26 +499,24 @@ class ResultsDBrecordPlayer(Record):
                     return [(self.value.identity(), srkey)]
             elif dbname == filespec.PLAYERNAMEIDENTITY_FIELD_DEF:
                 if self.value.merge is False:
-                    return [(AppSysPersonName(self.value.name).name, srkey)]
+                    return [(get_person_name(self.value.name), srkey)]
             elif dbname == filespec.PLAYERNAME_FIELD_DEF:
                 if self.merge is None:
                     return []
                 elif self.merge is True:
                     return []
                 elif self.merge is False:
-                    return [(AppSysPersonName(self.value.name).name, srkey)]
+                    return [(get_person_name(self.value.name), srkey)]
                 elif self.alias is False:
-                    return [(AppSysPersonName(self.value.name).name, srkey)]
+                    return [(get_person_name(self.value.name), srkey)]
             elif dbname == filespec.PLAYERNAMENEW_FIELD_DEF:
                 if self.value.merge is None:
-                    return [(AppSysPersonName(self.value.name).name, srkey)]
+                    return [(get_person_name(self.value.name), srkey)]
                 elif self.value.merge is True:
-                    return [(AppSysPersonName(self.value.name).name, srkey)]
+                    return [(get_person_name(self.value.name), srkey)]
                 elif self.value.merge is not False:
                     if self.alias is not False:
-                        return [
-                            (AppSysPersonName(self.value.name).name, srkey)
-                        ]
+                        return [(get_person_name(self.value.name), srkey)]
             elif dbname == filespec.PLAYERPARTIALNAME_FIELD_DEF:
                 if self.merge is None:
                     return []
@@ -477,7 +525,7 @@ class ResultsDBrecordPlayer(Record):
                 else:
                     return [
                         (k, srkey)
-                        for k in AppSysPersonNameParts(
+                        for k in get_person_name_parts(
                             self.value.name
                         ).partialnames
                     ]
@@ -486,18 +534,60 @@ class ResultsDBrecordPlayer(Record):
             return []
 
 
+def _discard_alias_person_map_answers(database, key):
+    """Discard alias to person map answers which depend on record key."""
+    get_alias_person_map = getattr(database, "get_alias_person_map", None)
+    if get_alias_person_map is not None:
+        get_alias_person_map().discard(key)
+
+
+def _discard_person_game_map_answers(database, keys):
+    """Discard player to games map answers which depend on player keys."""
+    get_person_game_map = getattr(database, "get_person_game_map", None)
+    if get_person_game_map is not None:
+        person_game_map = get_person_game_map()
+        for key in keys:
+            person_game_map.discard(key)
+
+
+def _get_primary_record(database, dbset, key):
+    """Return stored value for key in dbset, from record cache if possible."""
+    get_record_cache = getattr(database, "get_record_cache", None)
+    if get_record_cache is None:
+        return database.get_primary_record(dbset, key)
+    return get_record_cache().get_primary_record(database, dbset, key)
+
+
+def _get_shared_record(database, dbset, key, recordclass):
+    """Return recordclass instance for key in dbset which must not be changed.
+
+    The instance is shared with other callers if the database has a record
+    cache.
+
+    """
+    get_record_cache = getattr(database, "get_record_cache", None)
+    if get_record_cache is not None:
+        return get_record_cache().get_record(database, dbset, key, recordclass)
+    value = database.get_primary_record(dbset, key)
+    if value is None:
+        return None
+    record = recordclass()
+    record.load_record(value)
+    return record
+
+
 def get_affiliation_details(database, affiliation):
     """Return ResultsDBrecordName instance for affiliation."""
     if affiliation is None:
         return ""
-    return get_name_from_record_value(
-        database.get_primary_record(filespec.NAME_FILE_DEF, affiliation)
+    return _get_shared_record(
+        database, filespec.NAME_FILE_DEF, affiliation, ResultsDBrecordName
     ).value.name
 
 
 def get_alias(database, key):
     """Return ResultsDBrecordPlayer instance for key."""
-    a = database.get_primary_record(filespec.PLAYER_FILE_DEF, key)
+    a = _get_primary_record(database, filespec.PLAYER_FILE_DEF, key)
     if a is not None:
         ar = ResultsDBrecordPlayer()
         ar.load_record(a)
@@ -526,7 +616,7 @@ def get_alias_for_player(database, name):
         if r:
             av, ak = r
             if database.encode_record_selector(av) == name:
-                a = database.get_primary_record(filespec.PLAYER_FILE_DEF, ak)
+                a = _get_primary_record(database, filespec.PLAYER_FILE_DEF, ak)
                 if a is not None:
                     alias = ResultsDBrecordPlayer()
                     alias.load_record(a)
@@ -543,18 +633,22 @@ def get_aliases_for_event(database, event):
 
 
 def get_aliases_for_games(database, games):
-    """Return {record key : ResultsDBrecordPlayer(), ...} for games."""
-    aliases = dict()
+    """Return {record key : ResultsDBrecordPlayer(), ...} for games.
+
+    The player records are read once each in record key order after
+    collecting the keys from all games.
+
+    """
+    keys = set()
     for g in games:
-        for ak in (g.value.homeplayer, g.value.awayplayer):
-            if ak not in aliases:
-                aliases[ak] = get_alias(database, ak)
-    return aliases
+        keys.add(g.value.homeplayer)
+        keys.add(g.value.awayplayer)
+    return {ak: get_alias(database, ak) for ak in sorted(keys)}
 
 
 def get_event(database, key):
     """Return ResultsDBrecordEvent instance for key."""
-    e = database.get_primary_record(filespec.EVENT_FILE_DEF, key)
+    e = _get_primary_record(database, filespec.EVENT_FILE_DEF, key)
     if e is not None:
         er = ResultsDBrecordEvent()
         er.load_record(e)
@@ -573,8 +667,8 @@ def get_event_from_record_value(value):
 
 def get_event_details(database, event):
     """Return tab separated event identity for event."""
-    record = get_event_from_record_value(
-        database.get_primary_record(filespec.EVENT_FILE_DEF, event)
+    record = _get_shared_record(
+        database, filespec.EVENT_FILE_DEF, event, ResultsDBrecordEvent
     )
     return "\t".join(
         (record.value.startdate, record.value.enddate, record.value.name)
@@ -629,7 +723,7 @@ def get_games_for_event(database, event):
 
 def get_name(database, key):
     """Return ResultsDBrecordName instance for key."""
-    n = database.get_primary_record(filespec.NAME_FILE_DEF, key)
+    n = _get_primary_record(database, filespec.NAME_FILE_DEF, key)
     if n is not None:
         nr = ResultsDBrecordName()
         nr.load_record(n)
@@ -654,7 +748,9 @@ def get_names_for_games(database, games):
             if v is not None:
                 if v not in names:
                     names[v] = get_name_from_record_value(
-                        database.get_primary_record(filespec.NAME_FILE_DEF, v)
+                        _get_primary_record(
+                            database, filespec.NAME_FILE_DEF, v
+                        )
                     )
     return names
 
@@ -724,6 +820,7 @@ def get_persons(database, aliases):
     """Return map alias to person {alias : ResultsDBrecordPlayer(), ...}."""
     persons = dict()
     merge = dict()
+    alias_person_map = database.get_alias_person_map()
     for a in aliases:
         if a not in persons:
             m = aliases[a].value.merge
@@ -741,7 +838,7 @@ def get_persons(database, aliases):
                     m = database.encode_record_number(aliases[a].key.recno)
                     merge[m] = aliases[a].clone()
                 if m not in merge:
-                    merge[m] = get_alias(database, m)
+                    merge[m] = alias_person_map.get_person_record(database, m)
                 persons[a] = merge[m]
     return persons
 
@@ -877,8 +974,8 @@ def get_section_details(database, section, pin):
     """Return section name. Format depends on pin."""
     if section is None:
         return ""
-    record = get_name_from_record_value(
-        database.get_primary_record(filespec.NAME_FILE_DEF, section)
+    record = _get_shared_record(
+        database, filespec.NAME_FILE_DEF, section, ResultsDBrecordName
     )
     if pin:
         return "\t".join((record.value.name, str(pin)))
@@ -906,19 +1003,19 @@ def get_alias_identity(record):
     """
     v = record.value
     db = record.database
-    event = get_event_from_record_value(
-        db.get_primary_record(filespec.EVENT_FILE_DEF, v.event)
+    event = _get_shared_record(
+        db, filespec.EVENT_FILE_DEF, v.event, ResultsDBrecordEvent
     ).value
     sections = set()
     for s in event.sections:
         sections.add(
-            get_name_from_record_value(
-                db.get_primary_record(filespec.NAME_FILE_DEF, s)
+            _get_shared_record(
+                db, filespec.NAME_FILE_DEF, s, ResultsDBrecordName
             ).value.name
         )
     if v.section:
-        section = get_name_from_record_value(
-            db.get_primary_record(filespec.NAME_FILE_DEF, v.section)
+        section = _get_shared_record(
+            db, filespec.NAME_FILE_DEF, v.section, ResultsDBrecordName
         ).value.name
     else:
         section = v.section
@@ -933,74 +1030,119 @@ def get_alias_identity(record):
     )
 
 
-def get_events_for_performance_calculation(database, events):
-    """Return calculation data from database records for events."""
+def get_games_for_events(database, events):
+    """Return [ResultsDBrecordGame(), ...] for events.
+
+    events is a list of items whose last element is an event record key.
+
+    One cursor on the game event index is used for all events, visited in
+    index key order, and the game records are read in record key order
+    after collecting all the keys.
+
+    """
+    gamekeys = []
+    cursor = database.database_cursor(
+        filespec.GAME_FILE_DEF, filespec.GAMEEVENT_FIELD_DEF
+    )
+    try:
+        for evkey in sorted(
+            {database.encode_record_number(e[-1]) for e in events}
+        ):
+            r = cursor.nearest(evkey)
+            while r:
+                ge, gk = r
+                if database.encode_record_selector(ge) != evkey:
+                    break
+                gamekeys.append(gk)
+                r = cursor.next()
+    finally:
+        cursor.close()
+    games = []
+    for gk in sorted(set(gamekeys)):
+        g = database.get_primary_record(filespec.GAME_FILE_DEF, gk)
+        if g is not None:
+            games.append(ResultsDBrecordGame())
+            games[-1].load_record(g)
+    return games
+
+
+def get_calculation_data_for_games(database, eventgames):
+    """Return calculation data from database records for eventgames.
+
+    Player records are read once for all games, in record key order, and
+    the person for each player is found once.
+
+    """
     games = dict()
     players = dict()
     game_opponent = dict()
     opponents = dict()
     names = dict()
-    for e in events:
-        eventgames = get_games_for_event(database, get_event(database, e[-1]))
-        eventaliases = get_aliases_for_games(database, eventgames)
-        eventpersons = get_persons(database, eventaliases)
-        alias = dict()
-        for k in eventaliases.keys():
-            v = eventpersons.get(k)
-            if v is None:
-                return
-            alias[k] = v.key.recno
-            names[alias[k]] = v.value.name
-        for g in eventgames:
-            if g.value.result in ecfresult:  # 'a', 'd', 'h'
-                for a in (g.value.homeplayer, g.value.awayplayer):
-                    p = alias[a]
-                    if p not in players:
-                        players[p] = {g.key.recno}
-                    else:
-                        players[p].add(g.key.recno)
-                    if p not in opponents:
-                        opponents[p] = set()
-                game_opponent[g.key.recno] = {
-                    alias[g.value.homeplayer]: alias[g.value.awayplayer],
-                    alias[g.value.awayplayer]: alias[g.value.homeplayer],
-                }
-                opponents[alias[g.value.homeplayer]].add(
-                    alias[g.value.awayplayer]
-                )
-                opponents[alias[g.value.awayplayer]].add(
-                    alias[g.value.homeplayer]
-                )
-                result = dict()
-                if g.value.result == AWIN:
-                    result[alias[g.value.awayplayer]] = 1
-                    result[alias[g.value.homeplayer]] = -1
-                elif g.value.result == HWIN:
-                    result[alias[g.value.awayplayer]] = -1
-                    result[alias[g.value.homeplayer]] = 1
-                elif g.value.result == DRAW:
-                    result[alias[g.value.awayplayer]] = 0
-                    result[alias[g.value.homeplayer]] = 0
-                games[g.key.recno] = result
+    eventaliases = dict()
+    for ak in sorted(
+        {g.value.homeplayer for g in eventgames}.union(
+            g.value.awayplayer for g in eventgames
+        )
+    ):
+        eventaliases[ak] = get_alias(database, ak)
+    eventpersons = get_persons(database, eventaliases)
+    alias = dict()
+    for k in eventaliases.keys():
+        v = eventpersons.get(k)
+        if v is None:
+            return
+        alias[k] = v.key.recno
+        names[alias[k]] = v.value.name
+    for g in eventgames:
+        if g.value.result in ecfresult:  # 'a', 'd', 'h'
+            for a in (g.value.homeplayer, g.value.awayplayer):
+                p = alias[a]
+                if p not in players:
+                    players[p] = {g.key.recno}
+                else:
+                    players[p].add(g.key.recno)
+                if p not in opponents:
+                    opponents[p] = set()
+            game_opponent[g.key.recno] = {
+                alias[g.value.homeplayer]: alias[g.value.awayplayer],
+                alias[g.value.awayplayer]: alias[g.value.homeplayer],
+            }
+            opponents[alias[g.value.homeplayer]].add(alias[g.value.awayplayer])
+            opponents[alias[g.value.awayplayer]].add(alias[g.value.homeplayer])
+            result = dict()
+            if g.value.result == AWIN:
+                result[alias[g.value.awayplayer]] = 1
+                result[alias[g.value.homeplayer]] = -1
+            elif g.value.result == HWIN:
+                result[alias[g.value.awayplayer]] = -1
+                result[alias[g.value.homeplayer]] = 1
+            elif g.value.result == DRAW:
+                result[alias[g.value.awayplayer]] = 0
+                result[alias[g.value.homeplayer]] = 0
+            games[g.key.recno] = result
     return (games, players, game_opponent, opponents, names)
 
 
+def get_events_for_performance_calculation(database, events):
+    """Return calculation data from database records for events."""
+    return get_calculation_data_for_games(
+        database, get_games_for_events(database, events)
+    )
+
+
 def get_events_for_performance_prediction(database, events):
     """Return calculation data from database records for events."""
-    (
-        games,
-        players,
-        game_opponent,
-        opponents,
-        names,
-    ) = get_events_for_performance_calculation(database, events)
+    eventgames = get_games_for_events(database, events)
+    gefpc = get_calculation_data_for_games(database, eventgames)
+    if gefpc is None:
+        return
+    games, players, game_opponent, opponents, names = gefpc
     seasons = {}
-    game = ResultsDBrecordGame()
     asd = AppSysDate()
-    for gk in sorted(games):
-        game.load_record(
-            database.get_primary_record(filespec.GAME_FILE_DEF, gk)
-        )
+    for game in eventgames:
+        gk = game.key.recno
+        if gk not in games:
+            continue
         # Hack to deal with surviving non-ISO format dates
         # y, m, d = [int(e) for e in game.value.date.split('-')]
         if asd.parse_date(game.value.date) > 0:
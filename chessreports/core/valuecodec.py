@@ -0,0 +1,184 @@
+# valuecodec.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Encode and decode record values as repr() or compact JSON text.
+
+Record values have always been stored as the repr() of a list or tuple and
+decoded by ast.literal_eval(), which is slow when grids and reports load
+thousands of records.  The compact encoding is COMPACT_MARKER followed by
+the JSON text of the list, which json.loads() decodes much faster.
+
+Decoding looks at the first character so a database can hold values in
+both encodings: databases created before the compact encoding existed can
+be read without conversion.  The encoding used for new values is chosen per
+database by the presence of VALUE_ENCODING_FILE in the database directory,
+see the convert_value_encoding module in chessreports.tools.  The open
+database notes the encoding in its value_encoding attribute, and a
+CodecRecord packs its value in the encoding of the record's database.
+
+Values containing items which JSON would not give back unchanged, such as
+tuples, are always written in repr() encoding.
+
+"""
+
+import os
+import json
+from ast import literal_eval
+
+from solentware_base.core.record import Record, Value, ValueList
+
+COMPACT_MARKER = "J"
+VALUE_ENCODING_FILE = "value_encoding"
+REPR_ENCODING = "repr"
+COMPACT_ENCODING = "compact"
+
+
+def is_compact_database(database):
+    """Return True if database uses compact encoding for new values.
+
+    Databases without a value_encoding attribute use repr() encoding.
+
+    """
+    return (
+        getattr(database, "value_encoding", REPR_ENCODING) == COMPACT_ENCODING
+    )
+
+
+def _is_json_exact(data):
+    """Return True if data is unchanged by a JSON dump and load."""
+    if isinstance(data, list):
+        for item in data:
+            if not _is_json_exact(item):
+                return False
+        return True
+    return data is None or isinstance(data, (bool, int, float, str))
+
+
+def encode(data, compact=False):
+    """Return data, a list or tuple, encoded as text for a record value.
+
+    Compact encoding is used if compact is True.  A tuple is encoded as a
+    list in compact encoding, so callers decoding a tuple must accept a list
+    of the same items.
+
+    """
+    if compact:
+        items = list(data) if isinstance(data, tuple) else data
+        if _is_json_exact(items):
+            return COMPACT_MARKER + json.dumps(
+                items, ensure_ascii=False, separators=(",", ":")
+            )
+    return repr(data)
+
+
+def decode(value):
+    """Return data decoded from a record value in either encoding."""
+    if value.startswith(COMPACT_MARKER):
+        return json.loads(value[len(COMPACT_MARKER) :])
+    return literal_eval(value)
+
+
+def read_database_encoding(home_directory):
+    """Return the value encoding named in home_directory.
+
+    REPR_ENCODING is returned if the database has no value encoding file.
+
+    """
+    try:
+        with open(
+            os.path.join(home_directory, VALUE_ENCODING_FILE),
+            "r",
+            encoding="utf-8",
+        ) as file:
+            encoding = file.read().strip()
+    except FileNotFoundError:
+        return REPR_ENCODING
+    if encoding == COMPACT_ENCODING:
+        return COMPACT_ENCODING
+    return REPR_ENCODING
+
+
+def write_database_encoding(home_directory, encoding):
+    """Record encoding as the value encoding for database in home_directory.
+
+    The value encoding file is removed for REPR_ENCODING so the database
+    looks the same as one created before compact encoding existed.
+
+    """
+    path = os.path.join(home_directory, VALUE_ENCODING_FILE)
+    if encoding == COMPACT_ENCODING:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(COMPACT_ENCODING)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+class CodecValue(Value):
+    """Value packed in the value encoding of the record's database.
+
+    CodecRecord sets compact_encoding before packing the value.  It is a
+    slot so it is not one of the attributes of the value.
+
+    """
+
+    __slots__ = ("compact_encoding",)
+
+    def __init__(self):
+        """Extend, initialise for repr() encoding."""
+        self.compact_encoding = False
+        super().__init__()
+
+    def encode(self, data):
+        """Return data encoded in the encoding noted in compact_encoding."""
+        return encode(data, compact=self.compact_encoding)
+
+
+class CodecValueList(CodecValue, ValueList):
+    """ValueList with values in the encoding selected for the database."""
+
+    def load(self, value):
+        """Override, bind attributes in _attribute_order to decoded value."""
+        try:
+            for attr, data in zip(self._attribute_order, decode(value)):
+                self.__dict__[attr] = data
+        except Exception:
+            self.__dict__ = {}
+
+    def pack_value(self):
+        """Override, return encoded list of attributes in _attribute_order."""
+        return self.encode(
+            [self.__dict__.get(a) for a in self._attribute_order]
+        )
+
+
+class CodecRecord(Record):
+    """Record with value packed in the value encoding of its database.
+
+    The database given to put_record, edit_record, and delete_record is
+    noted as the database of the record, and of the new record for edits,
+    so it is known when the database engine packs the value.
+
+    """
+
+    def delete_record(self, database, dbset):
+        """Extend, note database then delete record."""
+        self.set_database(database)
+        super().delete_record(database, dbset)
+
+    def edit_record(self, database, dbset, dbname, newrecord):
+        """Extend, note database then edit record."""
+        self.set_database(database)
+        newrecord.set_database(database)
+        super().edit_record(database, dbset, dbname, newrecord)
+
+    def put_record(self, database, dbset):
+        """Extend, note database then put record."""
+        self.set_database(database)
+        super().put_record(database, dbset)
+
+    def packed_value(self):
+        """Extend, set value encoding from database then pack value."""
+        if isinstance(self.value, CodecValue):
+            self.value.compact_encoding = is_compact_database(self.database)
+        return super().packed_value()
@@ -11,6 +11,8 @@ import bz2
 import csv
 import os
 import io
+import shutil
+import tempfile
 
 from solentware_misc.gui import panel, dialogue
 from solentware_misc.core.utilities import AppSysPersonName
@@ -19,11 +21,12 @@ from chessvalidate.core import gameresults
 
 from ..core import (
     constants,
-    filespec,
     resultsrecord,
+    deleteevents,
+    exportevents,
+    eventsummary,
     configuration,
 )
-from ..core.importreports import convert_alias_to_transfer_format
 from . import (
     eventgrids,
     gamesummary,
@@ -77,6 +80,7 @@ class Events(panel.PanelGridSelector):
     def __init__(self, parent=None, cnf=dict(), **kargs):
         """Extend and define the results database events panel."""
         self.eventgrid = None
+        self.__exportfile = None
         super(Events, self).__init__(parent=parent, cnf=cnf, **kargs)
         self.show_event_panel_actions_allowed_buttons()
         self.create_buttons()
@@ -98,99 +102,11 @@ class Events(panel.PanelGridSelector):
         pass
 
     def generate_event_export(self, database, logwidget):
-        """Write events selected for export to serial file."""
+        """Write events selected for export to temporary serial file.
 
-        def add_name_to_export(key, valuekey):
-            exportdata.append(
-                "=".join(
-                    (
-                        key,
-                        resultsrecord.get_name_from_record_value(
-                            database.get_primary_record(
-                                filespec.NAME_FILE_DEF, valuekey
-                            )
-                        ).value.name,
-                    )
-                )
-            )
-
-        def add_game_player_to_export(
-            cname, cpin, cpinfalse, caffiliation, creportedcodes
-        ):
-            def agpte(player):
-                aliastext, m, a, affiliation, reportedcodes = player
-                exportdata.append("=".join((cname, aliastext[0])))
-                if aliastext[6]:
-                    exportdata.append("=".join((cpin, str(aliastext[6]))))
-                elif aliastext[6] is False:
-                    exportdata.append("=".join((cpinfalse, "true")))
-                if affiliation:
-                    add_name_to_export(caffiliation, affiliation)
-                if reportedcodes:
-                    for rc in reportedcodes:
-                        exportdata.append("=".join((creportedcodes, rc)))
-
-            return agpte
-
-        add_game_homeplayer_to_export = add_game_player_to_export(
-            constants._homename,
-            constants._homepin,
-            constants._homepinfalse,
-            constants._homeaffiliation,
-            constants._homereportedcodes,
-        )
-        add_game_awayplayer_to_export = add_game_player_to_export(
-            constants._awayname,
-            constants._awaypin,
-            constants._awaypinfalse,
-            constants._awayaffiliation,
-            constants._awayreportedcodes,
-        )
-
-        def add_game_to_export(game):
-            v = game.value
-            if gameplayers[v.homeplayer] not in eventplayers:
-                return False
-            if gameplayers[v.awayplayer] not in eventplayers:
-                return False
-            event = resultsrecord.get_event_from_record_value(
-                database.get_primary_record(filespec.EVENT_FILE_DEF, v.event)
-            ).value
-            exportdata.append("=".join((constants._event, event.name)))
-            exportdata.append(
-                "=".join((constants._startdate, event.startdate))
-            )
-            exportdata.append("=".join((constants._enddate, event.enddate)))
-            for s in event.sections:
-                add_name_to_export(constants._eventsection, s)
-            if v.homeplayerwhite is True:
-                exportdata.append(
-                    "=".join((constants._homeplayerwhite, constants._yes))
-                )
-            elif v.homeplayerwhite is False:
-                exportdata.append(
-                    "=".join((constants._homeplayerwhite, constants._no))
-                )
-            else:
-                exportdata.append(
-                    "=".join((constants._homeplayerwhite, constants.NOCOLOR))
-                )
-            exportdata.append("=".join((constants._date, v.date)))
-            if v.board:
-                exportdata.append("=".join((constants._board, v.board)))
-            if v.round:
-                exportdata.append("=".join((constants._round, v.round)))
-            if v.hometeam:
-                add_name_to_export(constants._hometeam, v.hometeam)
-            if v.awayteam:
-                add_name_to_export(constants._awayteam, v.awayteam)
-            if v.section:
-                add_name_to_export(constants._section, v.section)
-            add_game_homeplayer_to_export(players[gameplayers[v.homeplayer]])
-            add_game_awayplayer_to_export(players[gameplayers[v.awayplayer]])
-            exportdata.append("=".join((constants._result, v.result)))
-            return True
+        The file is copied to the file named in the save dialogue.
 
+        """
         esel = self.eventgrid.selection
         ebkm = self.eventgrid.bookmarks
         export_events = []
@@ -224,131 +140,42 @@ class Events(panel.PanelGridSelector):
             )
             return
 
+        export = exportevents.EventExport(
+            database, [e[-1] for e in export_events]
+        )
+        exportfile = tempfile.TemporaryFile()
+        message = None
         database.start_read_only_transaction()
         try:
-            for e in export_events:
-                rv = resultsrecord.get_event_from_record_value(
-                    database.get_primary_record(filespec.EVENT_FILE_DEF, e[-1])
-                ).value
-                er = [rv.startdate, rv.enddate, rv.name]
-                er.extend(
-                    [
-                        resultsrecord.get_name_from_record_value(
-                            database.get_primary_record(
-                                filespec.NAME_FILE_DEF, s
-                            )
-                        ).value.name
-                        for s in rv.sections
-                    ]
-                )
-                if logwidget:
-                    logwidget.append_text_only("\t".join(er))
-
-            # get all aliases on exporting database
-            # note identity with embedded keys translated and merge structure
             if logwidget:
-                logwidget.append_text(
-                    "Finding all player names on the database."
-                )
-                logwidget.append_text_only("")
-            players = dict()
-            gai = resultsrecord.get_alias_identity
-            pr = resultsrecord.ResultsDBrecordPlayer()
-            pk = pr.key
-            pv = pr.value
-            pr.set_database(database)
-            rset = database.recordlist_ebm(filespec.PLAYER_FILE_DEF)
-            cursor = database.database_cursor(
-                filespec.PLAYER_FILE_DEF, None, recordset=rset
-            )
-            try:
-                r = cursor.first()
-                while r:
-                    pr.load_record(r)
-                    players[pk.recno] = (
-                        gai(pr),
-                        pv.merge,
-                        pv.alias,
-                        pv.affiliation,
-                        pv.reported_codes,
+                for key in export.eventkeys:
+                    name, startdate, enddate, sections = (
+                        export.get_event_identity(key)
+                    )
+                    logwidget.append_text_only(
+                        "\t".join((startdate, enddate, name) + sections)
                     )
-                    r = cursor.next()
-            finally:
-                cursor.close()
-                try:
-                    rset.close()
-                except AttributeError:
-                    pass
-
-            # get all games for events being exported
-            if logwidget:
-                logwidget.append_text("Finding all games in the events.")
-                logwidget.append_text_only("")
-            games = []
-            for event in export_events:
-                eventgames = resultsrecord.get_games_for_event(
-                    database, resultsrecord.get_event(database, event[-1])
-                )
-                games.extend(eventgames)
-
-            # get alias keys for games being exported and map coded to decoded.
-            if logwidget:
-                logwidget.append_text_only("")
-                logwidget.append_text(
-                    "Finding all player names in the events."
-                )
-            eventplayers = set()
-            gameplayers = dict()
-            for g in games:
-                for ak in (g.value.homeplayer, g.value.awayplayer):
-                    k = ak  # Legacy of {coded:decoded} mapping.
-                    eventplayers.add(k)
-                    gameplayers[ak] = k
-            if logwidget:
                 logwidget.append_text("Preparing data for export.")
                 logwidget.append_text_only("")
-
-            # add all aliases to export data with identity last
-            main_alias_values = {type(True), type(False), type(None)}
-            exportdata = []
-            for k, v in players.items():
-                pi, pm, pa, paff, prc = v
-                if type(pm) in main_alias_values:
-                    for a in pa:
-                        if a != k:
-                            exportdata.extend(
-                                convert_alias_to_transfer_format(
-                                    players[a][0], constants._name
-                                )
-                            )
-                    exportdata.extend(
-                        convert_alias_to_transfer_format(pi, constants._name)
-                    )
-                    exportdata.append(
-                        "=".join((constants._exportedeventplayer, "true"))
-                    )
-
-            # add all games being exported to export data
-            allmerged = True
-            for g in games:
-                allmerged = allmerged and add_game_to_export(g)
+            with bz2.open(exportfile, mode="wt", encoding="utf8") as output:
+                export.write(output)
+        except exportevents.ExportEventsError as exc:
+            message = str(exc)
+        except BaseException:
+            exportfile.close()
+            raise
         finally:
             database.end_read_only_transaction()
 
-        if not allmerged:
+        if message is not None:
+            exportfile.close()
             tkinter.messagebox.showinfo(
                 parent=self.get_widget(),
-                message=" ".join(
-                    (
-                        "Cannot generate an export file when some players in",
-                        "the events being exported have not been merged or",
-                        "joined.",
-                    )
-                ),
+                message=message,
                 title="Events",
             )
             return
-        self.__exportdata = exportdata
+        self.__exportfile = exportfile
         if logwidget:
             logwidget.append_text("Ready to save export file.")
             logwidget.append_text_only("")
@@ -463,7 +290,9 @@ class Events(panel.PanelGridSelector):
 
     def _on_dismiss_exported_events(self, event=None):
         """Tidy up when finished with export event task log."""
-        self.__exportdata = None
+        if self.__exportfile is not None:
+            self.__exportfile.close()
+        self.__exportfile = None
 
     def _on_dismiss_event_summary(self, event=None):
         """Tidy up when finished with event summary task log."""
@@ -471,7 +300,7 @@ class Events(panel.PanelGridSelector):
 
     def _on_save_exported_events(self, event=None):
         """Save exported events dialogue."""
-        if self.__exportdata is None:
+        if self.__exportfile is None:
             return
         conf = configuration.Configuration()
         filename = tkinter.filedialog.asksaveasfilename(
@@ -494,9 +323,9 @@ class Events(panel.PanelGridSelector):
             constants.RECENT_EXPORT_EVENTS,
             conf.convert_home_directory_to_tilde(os.path.dirname(filename)),
         )
-        outputfile = bz2.open(filename, mode="wt", encoding="utf8")
-        outputfile.write("\n".join(self.__exportdata))
-        outputfile.close()
+        self.__exportfile.seek(0)
+        with open(filename, mode="wb") as outputfile:
+            shutil.copyfileobj(self.__exportfile, outputfile)
         tkinter.messagebox.showinfo(
             parent=self.get_widget(),
             title="Export Event Results",
@@ -620,37 +449,31 @@ class Events(panel.PanelGridSelector):
 
         db = self.get_appsys().get_results_database()
         event_report = []
-        identity_report = []
         db.start_read_only_transaction()
         try:
-            for e in delete_events:
-                rec = resultsrecord.get_event_from_record_value(
-                    db.get_primary_record(filespec.EVENT_FILE_DEF, e[-1])
-                )
-                identity_report.extend(
-                    self.player_identification_dependant_on_event(db, rec)
-                )
-                rv = rec.value
+            deletion = deleteevents.get_event_deletion(
+                db, [e[-1] for e in delete_events]
+            )
+            for event in deletion.events:
+                rv = event.value
                 er = [rv.startdate, rv.enddate, rv.name]
                 er.extend(
                     [
-                        resultsrecord.get_name_from_record_value(
-                            db.get_primary_record(filespec.NAME_FILE_DEF, s)
-                        ).value.name
+                        resultsrecord.get_section_details(db, s, None)
                         for s in rv.sections
                     ]
                 )
                 event_report.append("\t".join(er))
-            if identity_report:
+            if deletion.blocking:
                 names = [
                     resultsrecord.get_player_name_text_tabs(
                         db, i.value.identity()
                     )
-                    for i in identity_report
+                    for i in deletion.blocking
                 ]
         finally:
             db.end_read_only_transaction()
-        if identity_report:
+        if deletion.blocking:
             head = "".join(
                 (
                     " ".join(
@@ -708,79 +531,20 @@ class Events(panel.PanelGridSelector):
             if not dlg.ok_pressed():
                 return
 
-        def unset_name(skey):
-            """Get name record and decrement reference count."""
-            if skey not in names:
-                names[skey] = resultsrecord.get_name_from_record_value(
-                    db.get_primary_record(filespec.NAME_FILE_DEF, skey)
-                )
-                namesamend[skey] = names[skey].clone()
-            namesamend[skey].value.reference_count -= 1
-
-        def unset_player(skey):
-            """Get player record and decrement reference counts for names."""
-            if skey not in players:
-                players[skey] = resultsrecord.get_alias(db, skey)
-                a = players[skey].value.affiliation
-                if a is not None:
-                    unset_name(a)
-                if players[skey].value.section:
-                    unset_name(players[skey].value.section)
-
-        events = dict()
-        games = []
-        players = dict()
-        names = dict()
-        namesamend = dict()
-
-        db.start_transaction()
-        for e in delete_events:
-            events[e[-1]] = resultsrecord.get_event_from_record_value(
-                db.get_primary_record(filespec.EVENT_FILE_DEF, e[-1])
-            )
-            for s in events[e[-1]].value.sections:
-                unset_name(s)
-            games.extend(
-                resultsrecord.get_games_for_event(
-                    db, self.eventgrid.objects[e]
-                )
-            )
-        for g in games:
-            for s in (g.value.awayteam, g.value.hometeam, g.value.section):
-                if s is not None:
-                    unset_name(s)
-            for p in (g.value.homeplayer, g.value.awayplayer):
-                unset_player(p)
-
-        for g in games:
-            g.delete_record(db, filespec.GAME_FILE_DEF)
-        for n in names:
-            if n in namesamend:
-                rc = namesamend[n].value.reference_count
-                if rc <= 0:
-                    names[n].delete_record(db, filespec.NAME_FILE_DEF)
-                elif names[n].value.reference_count != rc:
-                    names[n].edit_record(
-                        db,
-                        filespec.NAME_FILE_DEF,
-                        filespec.NAME_FIELD_DEF,
-                        namesamend[n],
+        deletion = deleteevents.delete_events(
+            db, [e[-1] for e in delete_events]
+        )
+        if deletion.blocking:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="".join(
+                    (
+                        "Events not deleted because player identifications ",
+                        "changed after confirmation.",
                     )
-        for p in players:
-            if isinstance(players[p].value.merge, int):
-                prforp = resultsrecord.get_person_from_alias(db, players[p])
-                prforpamend = prforp.clone()
-                prforpamend.value.alias.remove(p)
-                prforp.edit_record(
-                    db,
-                    filespec.PLAYER_FILE_DEF,
-                    filespec.PLAYER_FIELD_DEF,
-                    prforpamend,
-                )
-            players[p].delete_record(db, filespec.PLAYER_FILE_DEF)
-        for e in events:
-            events[e].delete_record(db, filespec.EVENT_FILE_DEF)
-        db.commit()
+                ),
+                title="Delete Events",
+            )
         self.refresh_controls((self.eventgrid,))
 
     def describe_buttons(self):
@@ -831,23 +595,6 @@ class Events(panel.PanelGridSelector):
             command=self.on_event_summary,
         )
 
-    def player_identification_dependant_on_event(self, database, event):
-        """Return list of players in event used as main person identifier."""
-        players = set()
-        identifiers = []
-        for g in resultsrecord.get_games_for_event(database, event):
-            for p in (g.value.homeplayer, g.value.awayplayer):
-                players.add(p)
-        for p in players:
-            a = resultsrecord.get_alias(database, p)
-            if len(a.value.get_alias_list()):
-                identifiers.append(a)
-            elif a.value.merge is False:
-                identifiers.append(a)
-            elif a.value.merge is True:
-                identifiers.append(a)
-        return identifiers
-
     def show_event_panel_actions_allowed_buttons(self):
         """Specify buttons to show on events panel."""
         self.hide_panel_buttons()
@@ -896,12 +643,16 @@ class Events(panel.PanelGridSelector):
         if logwidget:
             logwidget.append_text("Extracting game summaries for each event.")
             logwidget.append_text_only("")
+        summary = eventsummary.EventSummary(
+            database, [e[-1] for e in summary_events]
+        )
         database.start_read_only_transaction()
         try:
-            for e in summary_events:
-                gamesummary.GameSummary(self, database, e)
+            summary.collect()
         finally:
             database.end_read_only_transaction()
+        for e in summary_events:
+            gamesummary.GameSummary(self, summary, e)
         if logwidget:
             logwidget.append_text("Extract completed.")
             logwidget.append_text_only("")
@@ -959,80 +710,28 @@ class Events(panel.PanelGridSelector):
 
     def _populate_event_summary(self, database, logwidget, summary_events):
         """Write events selected for summary to serial file."""
-        for e in summary_events:
-            rv = resultsrecord.get_event_from_record_value(
-                database.get_primary_record(filespec.EVENT_FILE_DEF, e[-1])
-            ).value
-            er = [rv.startdate, rv.enddate, rv.name]
-            er.extend(
-                [
-                    resultsrecord.get_name_from_record_value(
-                        database.get_primary_record(filespec.NAME_FILE_DEF, s)
-                    ).value.name
-                    for s in rv.sections
-                ]
-            )
-            if logwidget:
-                logwidget.append_text_only("\t".join(er))
-
-        # get all games for events included in summary
         if logwidget:
-            logwidget.append_text_only("")
             logwidget.append_text("Finding all games in the events.")
             logwidget.append_text_only("")
-        games = []
-        for event in summary_events:
-            eventgames = resultsrecord.get_games_for_event(
-                database, resultsrecord.get_event(database, event[-1])
-            )
-            games.extend(eventgames)
+        summary = eventsummary.EventSummary(
+            database, [e[-1] for e in summary_events]
+        )
+        summary.collect()
+        events = summary.events
+        names = summary.names
+        for key in summary.eventkeys:
+            rv = events[key]
+            er = [rv.startdate, rv.enddate, rv.name]
+            er.extend([names[s] for s in rv.sections])
+            if logwidget:
+                logwidget.append_text_only("\t".join(er))
         if logwidget:
-            logwidget.append_text("Finding detail of all games in the events.")
             logwidget.append_text_only("")
-        # get encoded data for games in events included in summary
-        players = set()
-        teams = set()
-        sections = set()
-        events = set()
-        gamecounts = dict()
-        for g in games:
-            for ak in (g.value.homeplayer, g.value.awayplayer):
-                players.add(ak)
-                gamecounts[ak] = gamecounts.setdefault(ak, 0) + 1
-            for tk in (g.value.hometeam, g.value.awayteam):
-                teams.add(tk)
-            sections.add(g.value.section)
-            events.add(g.value.event)
-        # Extract translations for encoded game data
-        events = {
-            e: resultsrecord.get_event_from_record_value(
-                database.get_primary_record(filespec.EVENT_FILE_DEF, e)
-            ).value
-            for e in events
-        }
-        teams = {
-            t: (
-                resultsrecord.get_name_from_record_value(
-                    database.get_primary_record(filespec.NAME_FILE_DEF, t)
-                ).value.name
-                if t
-                else ""
-            )
-            for t in teams
-        }
-        sections = {
-            s: (
-                resultsrecord.get_name_from_record_value(
-                    database.get_primary_record(filespec.NAME_FILE_DEF, s)
-                ).value.name
-                if s
-                else ""
-            )
-            for s in sections
-        }
+        games = summary.games
+        gamecounts = summary.player_counts
 
         # gradingcodes below needs the first step in setting players.
-        players = {p: resultsrecord.get_alias(database, p) for p in players}
+        players = summary.players
 
         # Generate unique number for each person.
         personnumbers = {}
@@ -1047,10 +746,10 @@ class Events(panel.PanelGridSelector):
             if k not in personnumbers:
                 personnumbers[k] = personnumbers[m]
 
-        # Generate unique number for each event.
+        # Generate unique number for each event with games.
         eventnumbers = {}
-        for k in events:
-            if k not in eventnumbers:
+        for k, eventgames in summary.event_games.items():
+            if eventgames and k not in eventnumbers:
                 eventnumbers[k] = len(eventnumbers)
 
         # Maybe put this in subclass methods eventually.
@@ -1075,9 +774,9 @@ class Events(panel.PanelGridSelector):
                     events[g.value.event].name,
                     events[g.value.event].startdate,
                     events[g.value.event].enddate,
-                    sections[g.value.section],
-                    teams[g.value.hometeam],
-                    teams[g.value.awayteam],
+                    names.get(g.value.section, ""),
+                    names.get(g.value.hometeam, ""),
+                    names.get(g.value.awayteam, ""),
                     g.value.round if g.value.round else "",
                     g.value.date if g.value.date else "",
                     g.value.board if g.value.board else "",
@@ -16,8 +16,6 @@ from chessvalidate.core.gameresults import (
 )
 
 from . import reports
-from ..core import resultsrecord
-from ..core import filespec
 from ..core import constants
 
 INVERT_RESULT = {
@@ -36,13 +34,16 @@ class _GameSummaryReport(reports.ChessResultsReport):
 class GameSummary(ExceptionHandler):
     """Game summary report for an event."""
 
-    def __init__(self, parent, database, event):
-        """Create widget to display game summary for event."""
+    def __init__(self, parent, summary, event):
+        """Create widget to display game summary for event.
+
+        summary is a core.eventsummary.EventSummary which has collected
+        the games for event.
+
+        """
         super(GameSummary, self).__init__()
         self.event = event
-        rv = resultsrecord.get_event_from_record_value(
-            database.get_primary_record(filespec.EVENT_FILE_DEF, event[-1])
-        ).value
+        rv = summary.events[event[-1]]
 
         self.summary = _GameSummaryReport(
             parent=parent,
@@ -79,9 +80,7 @@ class GameSummary(ExceptionHandler):
                 )
             )
         )
-        eventgames = resultsrecord.get_games_for_event(
-            database, resultsrecord.get_event(database, event[-1])
-        )
+        eventgames = summary.event_games[event[-1]]
         self.summary.append(
             "".join(
                 (
@@ -91,17 +90,13 @@ class GameSummary(ExceptionHandler):
                 )
             )
         )
-        eventaliases = resultsrecord.get_aliases_for_games(
-            database, eventgames
-        )
-        eventplayers = resultsrecord.get_persons(database, eventaliases)
+        eventaliases = summary.players
+        persons = summary.persons
         self.summary.append(
             "".join(
                 (
                     "\n\n",
-                    str(
-                        len(set([p.key.recno for p in eventplayers.values()]))
-                    ),
+                    str(summary.get_event_person_count(event[-1])),
                     " players with games for grading.",
                 )
             )
@@ -110,12 +105,13 @@ class GameSummary(ExceptionHandler):
         incomplete = False
         for g in eventgames:
             for ak in (g.value.homeplayer, g.value.awayplayer):
-                if ak in eventplayers:
+                if persons[ak] is not None:
                     games.append(
                         (
                             AppSysPersonName(eventaliases[ak].value.name).name,
                             g.value.date,
-                            eventplayers[ak].key.recno,
+                            persons[ak],
+                            g.key.recno,
                             g,
                         )
                     )
@@ -135,9 +131,9 @@ class GameSummary(ExceptionHandler):
         self.summary.append("\n\nGames listed by each player and date.\n")
         current_name = None
         for g in sorted(games):
-            if current_name != g[-2]:
+            if current_name != g[2]:
                 self.summary.append("\n")
-                current_name = g[-2]
+                current_name = g[2]
             gv = g[-1].value
             if gv.homeplayerwhite is False:
                 self.summary.append(
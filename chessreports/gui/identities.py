@@ -24,12 +24,12 @@ import tkinter.filedialog
 import bz2
 from functools import reduce
 
-from solentware_misc.core.utilities import AppSysPersonName
 from solentware_bind.gui.exceptionhandler import ExceptionHandler
 from solentware_bind.gui.bindings import Bindings
 
 from ..core import constants
 from ..core import importreports
+from ..core.personnames import get_person_name
 
 
 class Identities(ExceptionHandler):
@@ -360,12 +360,10 @@ class Identities(ExceptionHandler):
                 merge, alias = v
                 if merge is not None:
                     self.remote.append(
-                        (AppSysPersonName(player[0]).name, player, player)
+                        (get_person_name(player[0]), player, player)
                     )
                     for a in alias:
-                        self.remote.append(
-                            (AppSysPersonName(a[0]).name, a, player)
-                        )
+                        self.remote.append((get_person_name(a[0]), a, player))
             self.remote.sort()
             # populate listbox
             lbk = self.lbknown
@@ -438,9 +436,7 @@ class Identities(ExceptionHandler):
         self.map_lbii_rem_new = []
         matchedplayers = set()
         for new, known in self.importdata.new_to_known.items():
-            self.map_lbii_rem_new.append(
-                (AppSysPersonName(new[0]).name, new, known)
-            )
+            self.map_lbii_rem_new.append((get_person_name(new[0]), new, known))
             matchedplayers.add(new)
             if not isinstance(new, type(gameplayermerge[new])):
                 for a in gameplayermerge[new]:
@@ -451,12 +447,10 @@ class Identities(ExceptionHandler):
         for np in new_players:
             if np not in matchedplayers:
                 if np in gameplayermerge:
-                    self.local.append((AppSysPersonName(np[0]).name, np, np))
+                    self.local.append((get_person_name(np[0]), np, np))
                     for a in gameplayermerge[np]:
                         if a in new_players:
-                            self.local.append(
-                                (AppSysPersonName(a[0]).name, a, np)
-                            )
+                            self.local.append((get_person_name(a[0]), a, np))
         self.local.sort()
         # populate listboxes
         self.map_lbni_newplayer = []
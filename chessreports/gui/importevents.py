@@ -576,14 +576,18 @@ class ImportEvents(logpanel.TextAndLogPanel):
                 return
             database.start_transaction()
             tasklog.append_text("Update database with imported results.")
-            collatedb.update_results()
+            collatedb.update_results(bulk=True)
+            for line in collatedb.get_phase_timings_report():
+                tasklog.append_text_only(line)
             tasklog.append_text("Merge exported database players.")
             collatedb.merge_players()
         else:
             # warning if import file expects an occupied database?
             database.start_transaction()
             tasklog.append_text("Update database with imported results.")
-            collatedb.update_results()
+            collatedb.update_results(bulk=True)
+            for line in collatedb.get_phase_timings_report():
+                tasklog.append_text_only(line)
             tasklog.append_text("Accept exporting database identifications.")
             tasklog.append_text_only(
                 "(The database was empty before importing these events)"
@@ -253,7 +253,8 @@ class Events(events_database.Events):
             "Calculate  Distributions",
             "\n".join(event_report),
             *gefpc,
-            show_report=_PredictionReport
+            show_report=_PredictionReport,
+            warmstart=database.get_warm_start()
         )
         if logwidget:
             logwidget.append_text("Calculations completed.")
@@ -355,7 +356,8 @@ class Events(events_database.Events):
             "Calculate Player Performances",
             "\n".join(event_report),
             *gefpc,
-            show_report=_PerformanceReport
+            show_report=_PerformanceReport,
+            warmstart=database.get_warm_start()
         )
         if logwidget:
             logwidget.append_text("Calculations completed.")
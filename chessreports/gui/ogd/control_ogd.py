@@ -14,7 +14,6 @@ import tkinter.messagebox
 import tkinter.filedialog
 import os
 import zipfile
-import io
 
 from .. import control_database
 from ...minorbases.textapi import TextapiError
@@ -319,14 +318,9 @@ class Control(control_database.Control):
         self, dbdefinition, dbset, dbname, archive, element
     ):
         """Display ECF rating list data with date for update confirmation."""
-        memory_file = None
-        csvarchive = open(archive, "rb")
-        try:
-            memory_file = io.BytesIO(csvarchive.read())
-        finally:
-            csvarchive.close()
-
-        ecffile = dbdefinition(memory_file)
+        # The file is read when needed, using a saved line index if the
+        # file has been opened before, so it is not copied into memory.
+        ecffile = dbdefinition(archive)
         try:
             ecffile.open_context()
             return (ecffile, (archive, element))
@@ -352,7 +346,7 @@ class Control(control_database.Control):
             )
 
     def _get_memory_csv_from_zipfile(self, dbdefinition):
-        """Create 'in-memory' CSV file from zipped file."""
+        """Open CSV file selected from members of zipped file."""
         selection = self.ecf_reference_file.curselection()
         if not selection:
             return
@@ -370,17 +364,7 @@ class Control(control_database.Control):
         self, dbdefinition, dbset, dbname, archive, element
     ):
         """Display ECF grading list data with date for update confirmation."""
-        memory_file = None
-        ziparchive = zipfile.ZipFile(archive, "r")
-        try:
-            for za in ziparchive.namelist():
-                if za == element:
-                    memory_file = io.BytesIO(ziparchive.read(za))
-                    break
-        finally:
-            ziparchive.close()
-
-        ecffile = dbdefinition(memory_file)
+        ecffile = dbdefinition((archive, element))
         try:
             ecffile.open_context()
             return (ecffile, (archive, element))
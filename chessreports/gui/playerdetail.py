@@ -162,6 +162,20 @@ def display_player_details(myself, selections, title):
                 "\n".join(aliases),
             )
         )
+        db.start_read_only_transaction()
+        try:
+            games = _game_details(db, selected.key.recno)
+        finally:
+            db.end_read_only_transaction()
+        if games:
+            text.extend(
+                (
+                    "\n\n",
+                    "Games played by this identity are:",
+                    "\n\n",
+                    "\n".join(games),
+                )
+            )
         dialogue.Report(
             parent=myself,
             title=title,
@@ -171,6 +185,35 @@ def display_player_details(myself, selections, title):
         ).append("\n\n".join((header, "".join(text))))
 
 
+def _game_details(db, key):
+    """Return [<date result opponent>, ...] for games played by player key.
+
+    The games are taken from the database's map of players to games, so the
+    GAMEPLAYER index is read once for a player until one of their game or
+    player records changes.
+
+    """
+    results = {1: "won", 0: "drew", -1: "lost"}
+    details = []
+    for gamekey, opponent, result, date in mergeplayers.get_games_for_player(
+        db, key
+    ):
+        if opponent is not None:
+            opponent = resultsrecord.get_alias(db, opponent)
+        details.append(
+            "\t".join(
+                (
+                    date or "",
+                    results.get(result, "other"),
+                    "Unknown opponent"
+                    if opponent is None
+                    else opponent.value.name,
+                )
+            )
+        )
+    return details
+
+
 def _alias_details(myself, selection, title):
     """Return (<identity name>, <ecf detail>, [<alias name>, ...])."""
     db = myself.get_appsys().get_results_database()
@@ -28,13 +28,12 @@ class BZ2TextapiRoot(textapi.TextapiRoot):
 
     """
 
-    def open_root(self):
-        """Open a bz2 compressed text file and read all lines."""
-        try:
-            self._table_link = bz2.BZ2File(self.filename, "rb")
-            self.textlines = self._table_link.read().splitlines()
-            self.record_count = len(self.textlines)
-            self.record_number = None
-            self.record_select = None
-        except:
-            self._table_link = None
+    def _open_text_stream(self):
+        """Open a bz2 compressed text file and return decompressed stream.
+
+        The file is read through a DecompressedStream so blocks of lines
+        before the current block are not decompressed again.
+
+        """
+        self._table_link = bz2.BZ2File(self.filename, "rb")
+        return textapi.DecompressedStream(self._table_link)
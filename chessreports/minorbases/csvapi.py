@@ -11,25 +11,46 @@ Adapted from dbaseapi.py adding index access.
 
 Access is read only and provided to support existing data import processes.
 
+The rows are read from the file when needed, so large files can be browsed
+and imported without holding all the rows in memory.
+
 """
 
 import os
+import sys
+import io
 from pickle import dumps
+from array import array
+from bisect import bisect_left
 import csv
 import bz2
 
-from ..core.database import DatabaseError, Database
-from ..core import cursor
-from ..core.constants import PRIMARY, SECONDARY, FILE, FOLDER, FIELDS
+# from ..core.database import DatabaseError, Database
+# from ..core import cursor
+# from ..core.constants import PRIMARY, SECONDARY, FILE, FOLDER, FIELDS
+from solentware_base.core.constants import (
+    PRIMARY,
+    SECONDARY,
+    FILE,
+    FOLDER,
+    FIELDS,
+)
+
+# Rows read at a time when a row is needed.
+ROWS_PER_BLOCK = 256
+
+# Any byte sequence can be decoded as iso-8859-1, and callers can get the
+# bytes on the file by encoding values with it if another codec is needed.
+CSV_ENCODING = "iso-8859-1"
 
 
-class CSVapiError(DatabaseError):
+class CSVapiError(Exception):  # DatabaseError):
     """Exception class for csvapi module."""
 
     pass
 
 
-class CSVapi(Database):
+class CSVapi:  # (Database):
     """Define a CSV database structure.
 
     The database is read only.
@@ -216,14 +237,19 @@ class CSV:
 
     The first, last, nearest, next, prior, and Set methods return the
     pickled value for compatibility with the bsddb and DPT interfaces.
-    This is despite the data already being available as a dictionary
-    of values keyed by field name.
+    The value is a dictionary of values keyed by field name.
+
+    The rows are not held in memory.  The offset of each row is found in
+    one pass over the file, which also builds any secondary indexes, and
+    rows are read in blocks when needed.  A row is a tuple of values in
+    the order of fieldnames, taken from the first row of the file.
 
     """
 
-    def __init__(self, filename):
+    def __init__(self, filename, encoding=CSV_ENCODING):
         """Initilise for CSV file "filename" in closed state."""
         self.filename = filename
+        self.encoding = encoding
         self._set_closed_state()
 
     def __del__(self):
@@ -248,107 +274,146 @@ class CSV:
         return CursorCSVfile(self)
 
     def first(self):
-        """Return first record not marked as deleted."""
-        value = self._first_record()
-        while value:
-            if self.record_control == _EXISTS:
-                return (self.record_select, dumps(value))
-            elif self.record_control not in _PRESENT:
-                return None
-            value = self._next_record()
+        """Return first record."""
+        self._select_first()
+        return self._get_pickled_record()
 
     def last(self):
-        """Return last record not marked as deleted."""
-        value = self._last_record()
-        while value:
-            if self.record_control == _EXISTS:
-                return (self.record_select, dumps(value))
-            elif self.record_control not in _PRESENT:
-                return None
-            value = self._prior_record()
+        """Return last record."""
+        self._select_last()
+        return self._get_pickled_record()
 
     def nearest(self, current):
-        """Return nearest record not marked as deleted."""
+        """Return nearest record."""
         self._set_record_number(current)
-        value = self._get_record()
-        while value:
-            if self.record_control == _EXISTS:
-                return (self.record_select, dumps(value))
-            elif self.record_control not in _PRESENT:
-                return None
-            value = self._next_record()
+        return self._get_pickled_record()
 
     def next(self, current):
-        """Return next record not marked as deleted."""
+        """Return next record."""
         self._set_record_number(current)
-        value = self._next_record()
-        while value:
-            if self.record_control == _EXISTS:
-                return (self.record_select, dumps(value))
-            elif self.record_control not in _PRESENT:
-                return None
-            value = self._next_record()
+        self._select_next()
+        return self._get_pickled_record()
 
-    def open_csv(self):
-        """Extract records from CSV file into a list of dicts."""
+    def open_csv(self, indexes=None):
+        """Index rows of CSV file, and build secondary indexes if any.
+
+        indexes maps index names to tuples of field names.
+
+        """
         try:
             # use open or bz2 open depending on extension
             if os.path.splitext(self.filename)[-1].lower() == ".bz2":
-                self._table_link = bz2.BZ2File(self.filename, "r")
+                self._table_link = bz2.BZ2File(self.filename, "rb")
             else:
                 self._table_link = open(self.filename, "rb")
-            reader = csv.DictReader(self._table_link)
-            self.records = [row for row in reader]
-            self.fields = reader.fieldnames
-            print(self.fields, len(self.records))
-            self._table_link.close()
+            self._index_rows(indexes or {})
         except:
-            print("except")
-            self._table_link = None
+            self.close()
 
     def prior(self, current):
-        """Return prior record not marked as deleted."""
+        """Return prior record."""
         self._set_record_number(current)
-        value = self._prior_record()
-        while value:
-            if self.record_control == _EXISTS:
-                return (self.record_select, dumps(value))
-            elif self.record_control not in _PRESENT:
-                return None
-            value = self._prior_record()
+        self._select_prior()
+        return self._get_pickled_record()
 
     def setat(self, current):
-        """Return current record.  Return None if deleted."""
+        """Return current record."""
         self._set_record_number(current)
-        value = self._get_record()
-        if value:
-            if self.record_control == _EXISTS:
-                return (self.record_select, dumps(value))
+        return self._get_pickled_record()
+
+    def get_row(self, number):
+        """Return row at record number as tuple of values."""
+        block, row = divmod(number, ROWS_PER_BLOCK)
+        cached = self._block
+        if block != cached[0]:
+            cached = self._block = (block, self._read_block(block))
+        return cached[1][row]
 
     def _set_closed_state(self):
         self._table_link = None
-        self.version = None
+        self._offsets = None  # offset of each row and end of last row
+        self._block = (None, ())  # (block number, rows in block)
         self.record_count = None
-        self.first_record_seek = None
-        self.record_length = None
         self.fields = dict()
         self.record_number = None
         self.record_select = None
-        self.record_control = None
         self.fieldnames = None
         self.sortedfieldnames = None
 
-    def _first_record(self):
-        """Position at and return first record."""
-        self._select_first()
-        return self._get_record()
-
-    def _get_record(self):
-        """Return selected record.
+        # {index name: (sorted index values, record numbers), ...}
+        self.indexes = dict()
+
+    def _index_rows(self, indexes):
+        """Find offset of each row and build secondary indexes."""
+        stream = self._table_link
+        encoding = self.encoding
+        end = [0]
+
+        def lines():
+            position = 0
+            for line in stream:
+                position += len(line)
+                end[0] = position
+                yield line.decode(encoding)
+
+        # The reader takes lines only as needed to complete each row, so
+        # the row starts where the previous row ended.
+        reader = csv.reader(lines())
+        self.fieldnames = tuple(next(reader, ()))
+        width = len(self.fieldnames)
+        columns = {
+            name: tuple(self.fieldnames.index(f) for f in fields)
+            for name, fields in indexes.items()
+        }
+        entries = {name: [] for name in columns}
+        offsets = array("Q")
+        start = end[0]
+        for row in reader:
+            if row:
+                if columns:
+                    row = _make_row(row, width)
+                    for name, index in columns.items():
+                        entries[name].append(
+                            (_get_index_value(row, index), len(offsets))
+                        )
+                offsets.append(start)
+            start = end[0]
+        offsets.append(start)
+        for name, items in entries.items():
+            items.sort()
+            self.indexes[name] = (
+                [value for value, number in items],
+                array("L", [number for value, number in items]),
+            )
+        self._offsets = offsets
+        self.record_count = len(offsets) - 1
+        self.fields = self.fieldnames
+        self.sortedfieldnames = tuple(sorted(self.fieldnames))
+
+    def _read_block(self, block):
+        """Return list of rows in block read from CSV file."""
+        offsets = self._offsets
+        first = block * ROWS_PER_BLOCK
+        last = min(first + ROWS_PER_BLOCK, self.record_count)
+        self._table_link.seek(offsets[first])
+        text = self._table_link.read(offsets[last] - offsets[first])
+        width = len(self.fieldnames)
+        return [
+            _make_row(row, width)
+            for row in csv.reader(
+                io.StringIO(text.decode(self.encoding), newline="")
+            )
+            if row
+        ]
 
-        Copy record deleted/exists marker to self.record_control.
+    def _get_pickled_record(self):
+        """Return (record number, pickled dict of selected row) or None."""
+        row = self._get_record()
+        if row is not None:
+            return (self.record_select, dumps(dict(zip(self.fieldnames, row))))
 
-        """
+    def _get_record(self):
+        """Return selected row, or None if no row selected."""
         if self._table_link == None:
             return None
         if self.record_select < 0:
@@ -358,36 +423,7 @@ class CSV:
             self.record_select = self.record_count
             return None
         self.record_number = self.record_select
-        seek = self.first_record_seek + self.record_number * self.record_length
-        tell = self._table_link.tell()
-        if seek != tell:
-            self._table_link.seek(seek - tell, 1)
-        fielddata = self._table_link.read(self.record_length)
-        self.record_control = fielddata[0]
-        """if self.record_control in _PRESENT:
-            result = {}
-            for fieldname in self.fieldnames:
-                s = self.fields[fieldname][START]
-                f = self.fields[fieldname][START] + self.fields[fieldname][LENGTH]
-                result[fieldname] = fielddata[s:f].strip()
-            return result
-        else:
-            return None"""
-
-    def _last_record(self):
-        """Position at and return last record."""
-        self._select_last()
-        return self._get_record()
-
-    def _next_record(self):
-        """Position at and return next record."""
-        self._select_next()
-        return self._get_record()
-
-    def _prior_record(self):
-        """Position at and return prior record."""
-        self._select_prior()
-        return self._get_record()
+        return self.get_row(self.record_number)
 
     def _select_first(self):
         """Set record selection cursor at first record."""
@@ -419,17 +455,25 @@ class CSV:
             self.record_select = -1
         else:
             self.record_select = number
+        self.record_number = self.record_select
+
 
-    def _decode_number(self, number):
-        """Return base256 string converted to integer."""
-        result = 0
-        for i in range(len(number), 0, -1):
-            result = 256 * result + ord(number[i - 1])
-        return result
+def _make_row(row, width):
+    """Return row as tuple of width values, padded with "" if short."""
+    if len(row) < width:
+        row.extend([""] * (width - len(row)))
+    return tuple(row[:width])
+
+
+def _get_index_value(row, index):
+    """Return index value for row: a str, or tuple if several fields."""
+    if len(index) == 1:
+        return row[index[0]]
+    return tuple(row[i] for i in index)
 
 
 class CursorCSVfile:
-    """Define a dBase III file cursor.
+    """Define a CSV file cursor.
 
     Wrap the CSV methods in corresponding cursor method names.
 
@@ -454,41 +498,174 @@ class CursorCSVfile:
         self._current = None
 
     def first(self):
-        """Return first record not marked as deleted."""
+        """Return first record."""
         r = self._dbobject.first()
         if r:
             self._current = r[0]
             return r
 
     def last(self):
-        """Return last record not marked as deleted."""
+        """Return last record."""
         r = self._dbobject.last()
         if r:
             self._current = r[0]
             return r
 
+    def nearest(self, key):
+        """Return nearest record."""
+        r = self._dbobject.nearest(key)
+        if r:
+            self._current = r[0]
+            return r
+
     def next(self):
-        """Return next record not marked as deleted."""
+        """Return next record."""
         r = self._dbobject.next(self._current)
         if r:
             self._current = r[0]
             return r
 
     def prev(self):
-        """Return prior record not marked as deleted."""
+        """Return prior record."""
         r = self._dbobject.prior(self._current)
         if r:
             self._current = r[0]
             return r
 
     def setat(self, record):
-        """Return current record.  Return None if deleted."""
+        """Return current record."""
         k, v = record
         r = self._dbobject.setat(k)
         if r:
             self._current = r[0]
             return r
 
+    def cursor_count(self):
+        """Return count of records on file."""
+        return self._dbobject.record_count
+
+
+class CursorCSVindex:
+    """Define a cursor on a secondary index of a CSV file.
+
+    Records are (index value, record number) tuples in index value order,
+    where index values are str for one field indexes and tuples of str for
+    indexes on several fields.  The partial key is a prefix of the index
+    value for one field indexes.
+
+    """
+
+    def __init__(self, dbobject, indexname, keyrange=None):
+        """Initialise cursor for indexname in dbobject ignoring keyrange."""
+        super().__init__()
+        self._dbobject = dbobject
+        self._values, self._numbers = dbobject.indexes[indexname]
+        self._partial = None
+        self._low = 0
+        self._high = len(self._values)
+        self._current = None
+
+    def __del__(self):
+        """Delete instance."""
+        self.close()
+
+    def close(self):
+        """Close cursor."""
+        self._dbobject = None
+        self._current = None
+
+    def _get_index_record(self, position):
+        """Return record at position in index, or None if out of range."""
+        if self._low <= position < self._high:
+            self._current = position
+            return (self._values[position], self._numbers[position])
+
+    def _find(self, record):
+        """Return position of first record in index not before record."""
+        value, number = record
+        position = bisect_left(self._values, value, self._low, self._high)
+        values = self._values
+        numbers = self._numbers
+        while (
+            position < self._high
+            and values[position] == value
+            and numbers[position] < number
+        ):
+            position += 1
+        return position
+
+    def first(self):
+        """Return first record taking partial key into account."""
+        return self._get_index_record(self._low)
+
+    def last(self):
+        """Return last record taking partial key into account."""
+        return self._get_index_record(self._high - 1)
+
+    def nearest(self, key):
+        """Return nearest record to index value key."""
+        return self._get_index_record(
+            bisect_left(self._values, key, self._low, self._high)
+        )
+
+    def next(self):
+        """Return next record taking partial key into account."""
+        if self._current is None:
+            return self.first()
+        return self._get_index_record(self._current + 1)
+
+    def prev(self):
+        """Return prior record taking partial key into account."""
+        if self._current is None:
+            return self.last()
+        return self._get_index_record(self._current - 1)
+
+    def setat(self, record):
+        """Return record if in index taking partial key into account."""
+        position = self._find(record)
+        if position < self._high:
+            if (self._values[position], self._numbers[position]) == record:
+                return self._get_index_record(position)
+
+    def count_records(self):
+        """Return record count or None if cursor is not usable."""
+        if self._dbobject is None:
+            return None
+        return self._high - self._low
+
+    def get_partial(self):
+        """Return partial key."""
+        return self._partial
+
+    def set_partial_key(self, partial):
+        """Restrict cursor to index values starting with partial."""
+        self._partial = partial
+        self._current = None
+        if partial:
+            self._low = bisect_left(self._values, partial)
+            self._high = bisect_left(
+                self._values, partial + chr(sys.maxunicode), self._low
+            )
+        else:
+            self._low = 0
+            self._high = len(self._values)
+
+    def get_position_of_record(self, record=None):
+        """Return position of record in index or 0 (zero)."""
+        if record is None:
+            return 0
+        return self._find(record) - self._low
+
+    def get_record_at_position(self, position=None):
+        """Return record for positionth record in index or None."""
+        if position is None:
+            return None
+        if position < 0:
+            position += self._high - self._low
+            if position < 0:
+                return None
+        return self._get_index_record(self._low + position)
+
 
 class _CSVapiRoot:
     """Provide file level access to a CSV file.
@@ -688,7 +865,7 @@ class _CSVapiRoot:
         """Open CSV file."""
         if self._CSVobject == True:
             opendb = CSV(self._file)
-            opendb.open_csv()
+            opendb.open_csv(indexes=self._secondary)
             for f in self._fields:
                 if f not in opendb.fields:
                     raise CSVapiError(
@@ -727,15 +904,14 @@ class CSVapiRoot(_CSVapiRoot):
         return self._CSVobject
 
     def make_cursor(self, indexname, keyrange=None):
-        """Create a cursor on the CSV file."""
+        """Create a cursor on the CSV file or one of its indexes."""
         if indexname not in self._secondary:
             # c = self._CSVobject.Cursor()
             c = CursorCSV(self._CSVobject, keyrange)
-            if c:
-                self._clientcursors[c] = True
-            return c
         else:
-            raise CSVapiError("Indexes not supported")
+            c = CursorCSVindex(self._CSVobject, indexname, keyrange)
+        self._clientcursors[c] = True
+        return c
 
     def _get_deferable_update_files(self, defer, dd):
         """Return a dictionary of empty lists for the CSV files.
@@ -777,13 +953,11 @@ class CSVapiRoot(_CSVapiRoot):
         super().open_root()
 
 
-class CursorCSV(CursorCSVfile, cursor.Cursor):
+class CursorCSV(CursorCSVfile):  # , cursor.Cursor):
     """Define a CSV cursor.
 
-    Clearly not finished.  So notes left as found.
-
     A cursor implemented using a CursorCSVfile cursor for access in
-    record number order. Index access is not supported.
+    record number order. Index access is provided by CursorCSVindex.
     This class and its methods support the core.dataclient.DataClient class
     and may not be appropriate in other contexts.
     CursorCSV is a subclass of CursorCSVfile at present. The methods
@@ -798,6 +972,33 @@ class CursorCSV(CursorCSVfile, cursor.Cursor):
         """Delegate ignoring keyrange."""
         super().__init__(dbobject=dbasedb)
 
+    def count_records(self):
+        """Return record count or None if cursor is not usable."""
+        if self._dbobject is None:
+            return None
+        return self.cursor_count()
+
+    def get_partial(self):
+        """Return None.  Partial key not relevant."""
+        return None
+
     def set_partial_key(self, partial):
         """Do nothing.  Partial key not relevant."""
         pass
+
+    def get_position_of_record(self, record=None):
+        """Return position of record in file or 0 (zero)."""
+        if record is None:
+            return 0
+        return min(max(record[0], 0), self.count_records())
+
+    def get_record_at_position(self, position=None):
+        """Return record for positionth record in file or None."""
+        if position is None:
+            return None
+        keycount = self.count_records()
+        if position < 0:
+            position += keycount
+        if position < 0 or position >= keycount:
+            return None
+        return self.setat((position, None))
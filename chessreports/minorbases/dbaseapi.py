@@ -17,6 +17,9 @@ import os
 import os.path
 import io
 import threading
+import mmap
+from array import array
+from bisect import bisect_left
 
 # from ..core.database import DatabaseError, Database
 # from ..core import cursor
@@ -261,6 +264,11 @@ class dBaseIII:
     This is despite the data already being available as a dictionary
     of values keyed by field name.
 
+    The records are read from a memory map of the file, or the bytes of
+    a BytesIO file, by slicing at an offset calculated from the record
+    number.  There is no file position to share so records are read
+    without taking the lock.
+
     """
 
     def __init__(self, filename):
@@ -283,6 +291,11 @@ class dBaseIII:
         self._lock_dBaseIII.acquire()
         try:
             try:
+                try:
+                    if isinstance(self._records, mmap.mmap):
+                        self._records.close()
+                except:
+                    pass
                 try:
                     self._table_link.close()
                 except:
@@ -413,8 +426,25 @@ class dBaseIII:
                 self.fieldnames = tuple(fieldnames)
                 fieldnames.sort()
                 self.sortedfieldnames = tuple(fieldnames)
+                self._field_slices = tuple(
+                    (
+                        f,
+                        slice(
+                            self.fields[f][START],
+                            self.fields[f][START] + self.fields[f][LENGTH],
+                        ),
+                    )
+                    for f in self.fieldnames
+                )
+                if isinstance(self._table_link, io.BytesIO):
+                    self._records = self._table_link.getvalue()
+                else:
+                    self._records = mmap.mmap(
+                        self._table_link.fileno(), 0, access=mmap.ACCESS_READ
+                    )
             except:
                 self._table_link = None
+                self._records = None
         finally:
             self._lock_dBaseIII.release()
 
@@ -439,6 +469,9 @@ class dBaseIII:
 
     def _set_closed_state(self):
         self._table_link = None
+        self._records = None  # mmap of file, or bytes of BytesIO file
+        self._field_slices = ()  # (fieldname, slice) in fieldnames order
+        self._existing_records = None  # see _get_existing_records()
         self.version = None
         self.record_count = None
         self.first_record_seek = None
@@ -463,46 +496,88 @@ class dBaseIII:
         Copy record deleted/exists marker to self.record_control.
 
         """
+        records = self._records
+        if records is None:
+            return None
+        localdata = self._localdata
+        if localdata.record_select < 0:
+            localdata.record_select = -1
+            return None
+        elif localdata.record_select >= self.record_count:
+            localdata.record_select = self.record_count
+            return None
+        localdata.record_number = localdata.record_select
+        seek = self.first_record_seek + (
+            localdata.record_number * self.record_length
+        )
+        data = records[seek : seek + self.record_length]
+        if not data:
+            return None
+        localdata.record_data = data
+        localdata.record_control = data[0]
+        if localdata.record_control in _PRESENT:
+            # Do not decode bytes because caller knows codec to use
+            return {
+                fieldname: data[field].strip()
+                for fieldname, field in self._field_slices
+            }
+        else:
+            return None
+
+    def _get_existing_records(self):
+        """Return record numbers of records not marked deleted in order.
+
+        The marker bytes of all records are taken in one extended slice of
+        the records, so the list is built without reading each record.  A
+        range is returned if no records are marked deleted.  Records after
+        a marker which is neither deleted nor exists are ignored, as in
+        the next and prior methods.
+
+        """
+        existing = self._existing_records
+        if existing is not None:
+            return existing
         self._lock_dBaseIII.acquire()
         try:
-            if self._table_link == None:
-                return None
-            if self._localdata.record_select < 0:
-                self._localdata.record_select = -1
-                return None
-            elif self._localdata.record_select >= self.record_count:
-                self._localdata.record_select = self.record_count
-                return None
-            self._localdata.record_number = self._localdata.record_select
-            seek = (
-                self.first_record_seek
-                + self._localdata.record_number * self.record_length
-            )
-            tell = self._table_link.tell()
-            if seek != tell:
-                self._table_link.seek(seek - tell, 1)
-            self._localdata.record_data = self._table_link.read(
-                self.record_length
-            )
-            self._localdata.record_control = self._localdata.record_data[0]
-            if self._localdata.record_control in _PRESENT:
-                result = {}
-                for fieldname in self.fieldnames:
-                    s = self.fields[fieldname][START]
-                    f = (
-                        self.fields[fieldname][START]
-                        + self.fields[fieldname][LENGTH]
-                    )
-                    # Do not decode bytes because caller knows codec to use
-                    result[fieldname] = self._localdata.record_data[
-                        s:f
-                    ].strip()
-                return result
-            else:
-                return None
+            if self._existing_records is None:
+                records = self._records
+                if records is None:
+                    return range(0)
+                markers = records[
+                    self.first_record_seek : self.first_record_seek
+                    + self.record_count
+                    * self.record_length : self.record_length
+                ]
+                if markers.count(_EXISTS) == len(markers):
+                    self._existing_records = range(len(markers))
+                else:
+                    existing = array("L")
+                    for recno, marker in enumerate(markers):
+                        if marker == _EXISTS:
+                            existing.append(recno)
+                        elif marker not in _PRESENT:
+                            break
+                    self._existing_records = existing
+            return self._existing_records
         finally:
             self._lock_dBaseIII.release()
 
+    def get_position_of_record_number(self, number):
+        """Return count of records before record number not marked deleted."""
+        return bisect_left(self._get_existing_records(), number)
+
+    def get_record_number_at_position(self, position):
+        """Return number of positionth record not marked deleted, or None.
+
+        Negative positions count back from the last record, -1 being the
+        last record.
+
+        """
+        try:
+            return self._get_existing_records()[position]
+        except IndexError:
+            return None
+
     def _last_record(self):
         """Position at and return last record."""
         self._select_last()
@@ -1099,37 +1174,16 @@ class Cursor(CursordBaseIII):  # , cursor.Cursor):
         """Return position of record in file or 0 (zero)."""
         if record is None:
             return 0
-        start = self.first
-        step = self.next
-        keycount = self.count_records()
-        position = 0
-        k = record[0]
-        r = start()
-        while r:
-            if r[0] >= k:
-                break
-            position += 1
-            r = step()
-        return position
+        return self._dbobject.get_position_of_record_number(record[0])
 
     def get_record_at_position(self, position=None):
         """Return record for positionth record in file or None."""
         if position is None:
             return None
-        if position < 0:
-            start = self.last
-            step = self.prev
-            position = -1 - position
-        else:
-            start = self.first
-            step = self.next
-        keycount = self.count_records()
-        count = 0
-        r = start()
-        while r:
-            count += 1
-            if count > position:
-                break
-            r = step()
-        if r is not None:
+        recno = self._dbobject.get_record_number_at_position(position)
+        if recno is None:
+            return None
+        r = self._dbobject.setat(recno)
+        if r:
+            self._current = r[0]
             return r
@@ -7,21 +7,53 @@
 The database interface defined in the core.database.Database and
 core.database.Cursor classes is used.
 
+The lines are not read when the file is opened.  The offset of each line
+is found in one pass over the file and lines are read in blocks when
+needed.  The line offsets for a file on disk are saved in a file next to
+it, and used while the file's size and modification time are unchanged.
+
+Lines end with b"\\n", b"\\r\\n", or b"\\r", as for bytes.splitlines().
+
+Decompressed streams are read through a DecompressedStream, which keeps
+the data decompressed so far in a temporary file so earlier lines are read
+without decompressing the stream again from the start.
+
 """
 
 import os
 import os.path
+import sys
+from array import array
 
 # io may be used, for example, on csv files extracted from zip archives into
 # memory rather than to a permanent file or database.
 import io
+import re
+import tempfile
 import threading
+import zlib
 
 # from ..core.database import DatabaseError, Database
 # from ..core import cursor
 # from ..core.constants import FILE, FOLDER, FIELDS
 from solentware_base.core.constants import FILE, FOLDER, FIELDS
 
+# Suffix of file holding line offsets for a text file.
+LINE_INDEX_SUFFIX = ".lineindex"
+
+# Bytes read at a time when finding line offsets.
+INDEX_BLOCK_SIZE = 1048576
+
+# Lines read at a time when a line is needed.
+LINES_PER_BLOCK = 256
+
+# Version of the line offsets held in a line index file.  Version 2 ends
+# lines at b"\r" as well as b"\n".
+LINE_INDEX_VERSION = 2
+
+# Line terminators.
+_LINE_END = re.compile(rb"\r\n|\r|\n")
+
 
 class TextapiError(Exception):  # DatabaseError):
     """Exception class for textapi module."""
@@ -229,6 +261,9 @@ class TextapiRoot:
 
     """
 
+    # Name of text stream within file, for archives of several files.
+    _text_stream_name = None
+
     def __init__(self, filename):
         """Initialise for text file "filename" in closed state."""
         self._localdata = threading.local()
@@ -250,6 +285,11 @@ class TextapiRoot:
         self._lock_text.acquire()
         try:
             try:
+                try:
+                    if self._text_stream is not self._table_link:
+                        self._text_stream.close()
+                except:
+                    pass
                 try:
                     self._table_link.close()
                 except:
@@ -272,23 +312,90 @@ class TextapiRoot:
             self._lock_text.release()
 
     def open_root(self):
-        """Open text file and extract lines as records."""
+        """Open text file and index lines as records."""
         self._lock_text.acquire()
         try:
             try:
-                if isinstance(self.filename, io.BytesIO):
-                    self._table_link = self.filename
-                else:
-                    self._table_link = open(self.filename, "rb")
-                self.textlines = self._table_link.read().splitlines()
+                self._text_stream = self._open_text_stream()
+                self.textlines = TextLines(
+                    self._text_stream, self._get_line_offsets()
+                )
                 self.record_count = len(self.textlines)
                 self._localdata.record_number = None
                 self._localdata.record_select = None
             except:
                 self._table_link = None
+                self._text_stream = None
         finally:
             self._lock_text.release()
 
+    def _open_text_stream(self):
+        """Open text file and return binary stream to read text.
+
+        Subclasses for compressed files override this method to open the
+        file in self._table_link and return the decompressed stream.
+
+        """
+        if isinstance(self.filename, io.BytesIO):
+            self._table_link = self.filename
+        else:
+            self._table_link = open(self.filename, "rb")
+        return self._table_link
+
+    def _get_line_index_name(self):
+        """Return (index file name, key) or None if index not saved.
+
+        key identifies the text file, and the stream within it, for which
+        the index file holds line offsets.  The index file name includes a
+        checksum of the stream name for archives of several files.
+
+        """
+        if isinstance(self.filename, io.BytesIO):
+            return None
+        status = os.stat(self.filename)
+        key = repr(
+            (
+                status.st_size,
+                status.st_mtime_ns,
+                self._text_stream_name,
+                sys.byteorder,
+                LINE_INDEX_VERSION,
+            )
+        )
+        name = self.filename
+        if self._text_stream_name is not None:
+            name = ".".join(
+                (
+                    name,
+                    format(zlib.crc32(self._text_stream_name.encode()), "08x"),
+                )
+            )
+        return (name + LINE_INDEX_SUFFIX, key.encode() + b"\n")
+
+    def _get_line_offsets(self):
+        """Return line offsets from saved index or by reading text stream."""
+        index = self._get_line_index_name()
+        if index is not None:
+            indexname, key = index
+            try:
+                with open(indexname, "rb") as indexfile:
+                    if indexfile.readline() == key:
+                        offsets = array("Q")
+                        offsets.frombytes(indexfile.read())
+                        if len(offsets):
+                            return offsets
+            except (OSError, ValueError):
+                pass
+        offsets = get_line_offsets(self._text_stream)
+        if index is not None:
+            try:
+                with open(indexname, "wb") as indexfile:
+                    indexfile.write(key)
+                    offsets.tofile(indexfile)
+            except OSError:
+                pass
+        return offsets
+
     def first(self):
         """Return first record."""
         value = self._first_record()
@@ -331,6 +438,7 @@ class TextapiRoot:
 
     def _set_closed_state(self):
         self._table_link = None
+        self._text_stream = None
         self.textlines = None
         self.record_count = None
         self._localdata.record_number = None
@@ -406,6 +514,216 @@ class TextapiRoot:
             self._localdata.record_select = number
 
 
+class TextLines:
+    """Sequence of the lines in a binary text stream read when needed.
+
+    Lines are bytes without the line terminator, as given by splitlines().
+    Slicing a TextLines instance
+    returns another, sharing the stream, for the lines in the slice.
+
+    """
+
+    def __init__(self, stream, offsets, start=0, stop=None):
+        """Note stream and offsets of lines from start to stop in stream.
+
+        offsets[n] is the offset of line n and the last item is the length
+        of the stream.
+
+        """
+        super().__init__()
+        self._stream = stream
+        self._offsets = offsets
+        self._lock = threading.Lock()
+        self._block = (None, ())  # (block number, lines in block)
+        self.start = start
+        self.stop = len(offsets) - 1 if stop is None else stop
+
+    def __len__(self):
+        """Return number of lines."""
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        """Return line at index, or a TextLines for the slice at index."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Slices of TextLines must have step 1")
+            lines = TextLines(
+                self._stream,
+                self._offsets,
+                start=self.start + start,
+                stop=self.start + max(start, stop),
+            )
+            lines._lock = self._lock
+            return lines
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("TextLines index out of range")
+        block, line = divmod(self.start + index, LINES_PER_BLOCK)
+        cached = self._block
+        if block != cached[0]:
+            cached = self._block = (block, self._read_block(block))
+        return cached[1][line]
+
+    def __iter__(self):
+        """Yield lines in order."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def _read_block(self, block):
+        """Return list of lines in block read from stream."""
+        offsets = self._offsets
+        first = block * LINES_PER_BLOCK
+        last = min(first + LINES_PER_BLOCK, len(offsets) - 1)
+        self._lock.acquire()
+        try:
+            self._stream.seek(offsets[first])
+            data = self._stream.read(offsets[last] - offsets[first])
+        finally:
+            self._lock.release()
+        base = offsets[first]
+        lines = []
+        for line in range(first, last):
+            text = data[offsets[line] - base : offsets[line + 1] - base]
+            if text.endswith(b"\n"):
+                text = text[:-1]
+            if text.endswith(b"\r"):
+                text = text[:-1]
+            lines.append(text)
+        return lines
+
+
+def get_line_offsets(stream, blocksize=INDEX_BLOCK_SIZE):
+    """Return array of offsets of lines in stream from start of stream.
+
+    Lines end with b"\\n", b"\\r\\n", or b"\\r".  The last item is the
+    length of the stream, so the number of lines is one less than the length
+    of the array.
+
+    """
+    stream.seek(0)
+    offsets = array("Q", [0])
+    position = 0
+    carriage_return = False  # Previous block ended with b"\r".
+    while True:
+        block = stream.read(blocksize)
+        if not block:
+            break
+        start = 0
+        if carriage_return:
+            if block.startswith(b"\n"):
+                start = 1
+            offsets.append(position + start)
+            carriage_return = False
+        if b"\r" not in block:
+            find = block.find
+            end = find(b"\n", start)
+            while end != -1:
+                offsets.append(position + end + 1)
+                end = find(b"\n", end + 1)
+        else:
+            length = len(block)
+            for match in _LINE_END.finditer(block, start):
+                end = match.end()
+                if end == length and match.group() == b"\r":
+                    carriage_return = True
+                else:
+                    offsets.append(position + end)
+        position += len(block)
+    if offsets[-1] != position:
+        offsets.append(position)
+    return offsets
+
+
+class DecompressedStream:
+    """Seekable binary stream of the data read from a decompressed stream.
+
+    Seeking backward in a decompressed stream, such as a BZ2File or a
+    member of a zip file, decompresses again from the start of the stream.
+    Data read from source is copied to a temporary file, which is used to
+    read data already decompressed, so source is read forward only, once,
+    and only as far as the data read so far.
+
+    """
+
+    def __init__(self, source, blocksize=INDEX_BLOCK_SIZE):
+        """Note source stream and create the temporary file."""
+        super().__init__()
+        self._source = source
+        self._blocksize = blocksize
+        self._copy = tempfile.TemporaryFile()
+        self._length = 0
+        self._exhausted = False
+        self._position = 0
+
+    def close(self):
+        """Close temporary file and source stream."""
+        try:
+            self._copy.close()
+        finally:
+            self._source.close()
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Set position in stream and return new position."""
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            self._copy_source()
+            offset += self._length
+        elif whence != io.SEEK_SET:
+            raise ValueError("Invalid whence value")
+        if offset < 0:
+            raise ValueError("Negative seek position")
+        self._position = offset
+        return offset
+
+    def tell(self):
+        """Return position in stream."""
+        return self._position
+
+    def read(self, size=-1):
+        """Return up to size bytes from position, or to end if size < 0."""
+        position = self._position
+        if size is None or size < 0:
+            self._copy_source()
+            stop = self._length
+        elif position == self._length and not self._exhausted:
+            # Read on from source without reading back the copy.
+            data = self._source.read(size)
+            if not data:
+                self._exhausted = True
+                return data
+            self._copy.seek(self._length)
+            self._copy.write(data)
+            self._length += len(data)
+            self._position += len(data)
+            return data
+        else:
+            stop = position + size
+            self._copy_source(stop)
+            stop = min(stop, self._length)
+        if stop <= position:
+            return b""
+        self._copy.seek(position)
+        data = self._copy.read(stop - position)
+        self._position += len(data)
+        return data
+
+    def _copy_source(self, stop=None):
+        """Copy source to temporary file up to offset stop, or to end."""
+        if self._exhausted:
+            return
+        self._copy.seek(self._length)
+        while stop is None or self._length < stop:
+            data = self._source.read(self._blocksize)
+            if not data:
+                self._exhausted = True
+                break
+            self._copy.write(data)
+            self._length += len(data)
+
+
 class Cursor:  # (cursor.Cursor):
     """Define cursor implemented using the Berkeley DB cursor methods."""
 
@@ -476,40 +794,23 @@ class Cursor:  # (cursor.Cursor):
         """Return position of record in file or 0 (zero)."""
         if record is None:
             return 0
-        start = self.first
-        step = self.next
         keycount = self.count_records()
-        position = 0
-        k = record[0]
-        r = start()
-        while r:
-            if r[0] >= k:
-                break
-            position += 1
-            r = step()
-        return position
+        if not keycount:
+            return 0
+        return min(max(record[0], 0), keycount)
 
     def get_record_at_position(self, position=None):
         """Return record for positionth record in file or None."""
         if position is None:
             return None
-        if position < 0:
-            start = self.last
-            step = self.prev
-            position = -1 - position
-        else:
-            start = self.first
-            step = self.next
         keycount = self.count_records()
-        count = 0
-        r = start()
-        while r:
-            count += 1
-            if count > position:
-                break
-            r = step()
-        if r is not None:
-            return r
+        if not keycount:
+            return None
+        if position < 0:
+            position += keycount
+        if position < 0 or position >= keycount:
+            return None
+        return self._get_record(self._cursor.set(position))
 
 
 class _CursorText:
@@ -33,20 +33,31 @@ class ZipTextapiRoot(textapi.TextapiRoot):
 
     """
 
-    def open_root(self):
-        """Open a zip compressed text file and read all lines."""
+    def __init__(self, filename, element=None):
+        """Initialise for member element of zip file filename.
+
+        The first member of the zip file is used if element is None.
+
+        """
+        self.element = element
+        super().__init__(filename)
+
+    def _open_text_stream(self):
+        """Open member of a zip file and return decompressed stream.
+
+        The member is read through a DecompressedStream so blocks of lines
+        before the current block are not decompressed again.
+
+        """
+        self._table_link = zipfile.ZipFile(self.filename, "r")
         try:
-            self._table_link = zipfile.ZipFile(self.filename, "r")
-            # open method added at Python 2.6
-            """self.textlines = [
-                t for t in self._table_link.open(
-                    self._table_link.infolist()[0])]"""
-            # should use csv.reader to cope with '\n' as data in csv files
-            self.textlines = self._table_link.read(
-                self._table_link.namelist()[0]
-            ).split("\n")
-            self.record_count = len(self.textlines)
-            self.record_number = None
-            self.record_select = None
-        except:
-            self._table_link = None
+            if self.element is None:
+                self._text_stream_name = self._table_link.namelist()[0]
+            else:
+                self._text_stream_name = self.element
+            return textapi.DecompressedStream(
+                self._table_link.open(self._text_stream_name)
+            )
+        except Exception:
+            self._table_link.close()
+            raise
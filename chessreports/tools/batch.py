@@ -0,0 +1,490 @@
+# batch.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Run ChessReports tasks on a results database without the user interface.
+
+The database can be any of the supported database engines, found from the
+database files unless named by --engine.  The tasks are:
+
+ecf-clubs FILE      apply an ECF active clubs download (JSON)
+ecf-players FILE    apply an ECF rated players download (JSON)
+import-events FILE  import events from a results export file
+event-summary       list events with their game and player counts
+performance         calculate player performances
+prediction          calculate season performance predictions
+export-events FILE  export events to results export file, bz2 if FILE
+                    ends .bz2
+
+event-summary, performance, prediction, and export-events use the events
+played between --start and --end, default all events.
+
+performance and prediction start the iterations from the performances in
+the --warm-start file, if given, and write the performances calculated to
+it.  --cold-start reports the iterations saved by doing the calculation a
+second time without the warm start.
+
+The time taken by each phase of a task is printed on standard output as
+one JSON object per line, with keys task, phase, and seconds.  Progress
+messages are printed on standard error, and reports are written to the
+--output file or standard error.
+
+Run as:
+
+python -m chessreports.tools.batch [options] <database folder> <task> [FILE]
+
+"""
+
+import os
+import sys
+import time
+import json
+import argparse
+
+from ..core import resultsrecord
+from ..core import importreports
+from ..core import importcollation
+from ..core import importcollationdb
+from ..core import deleteevents
+from ..core import exportevents
+from ..core import eventsummary
+from ..core.personnames import get_person_name
+from ..basecore import opendatabase
+from ..basecore import ecfdataimport
+from ..chesscalc_legacy.core import calculationreports
+from ..chesscalc_legacy.core import performances
+
+TASKS = (
+    "ecf-clubs",
+    "ecf-players",
+    "import-events",
+    "event-summary",
+    "performance",
+    "prediction",
+    "export-events",
+)
+
+
+class BatchTaskError(Exception):
+    """Exception raised when a batch task cannot be done."""
+
+
+class TaskLog:
+    """Write progress messages to a file, by default standard error.
+
+    The methods used by the import functions on the Tk log widget are
+    provided.
+
+    """
+
+    def __init__(self, file=None):
+        """Note file for messages."""
+        super().__init__()
+        self.file = sys.stderr if file is None else file
+
+    def append_text(self, text, timestamp=True):
+        """Write text, preceded by the time if timestamp is True."""
+        if timestamp:
+            text = " ".join((time.strftime("%H:%M:%S"), text))
+        print(text, file=self.file)
+
+    def append_text_only(self, text):
+        """Write text."""
+        print(text, file=self.file)
+
+
+class TaskTimer:
+    """Time the phases of a task and print them as JSON objects."""
+
+    def __init__(self, task, file=None):
+        """Start timing first phase of task."""
+        super().__init__()
+        self.task = task
+        self.file = sys.stdout if file is None else file
+        self.timings = []
+        self._start = time.perf_counter()
+
+    def end_phase(self, phase):
+        """Print time taken by phase and start timing next phase."""
+        now = time.perf_counter()
+        self.add_phase(phase, now - self._start)
+        self._start = now
+
+    def add_phase(self, phase, seconds):
+        """Print seconds taken by phase timed elsewhere."""
+        self.timings.append((phase, seconds))
+        print(
+            json.dumps(
+                dict(task=self.task, phase=phase, seconds=round(seconds, 6))
+            ),
+            file=self.file,
+            flush=True,
+        )
+
+
+def _read_json(filename):
+    """Return object loaded from JSON file filename."""
+    with open(filename, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _get_event_items(database, startdate, enddate):
+    """Return [(event key,), ...] for events from startdate to enddate."""
+    database.start_read_only_transaction()
+    try:
+        keys = deleteevents.get_events_in_date_range(
+            database, startdate=startdate, enddate=enddate
+        )
+    finally:
+        database.end_read_only_transaction()
+    if not keys:
+        raise BatchTaskError("No events in date range")
+    return [(key,) for key in keys]
+
+
+def _get_event_report(database, events):
+    """Return tab separated identity and sections for events, one per line."""
+    report = []
+    for event in events:
+        value = resultsrecord.get_event(database, event[-1]).value
+        line = [value.startdate, value.enddate, value.name]
+        line.extend(
+            resultsrecord.get_section_details(database, s, None)
+            for s in value.sections
+        )
+        report.append("\t".join(line))
+    return "\n".join(report)
+
+
+def import_ecf_clubs(database, filename, timer, log, downloaddate, dry_run):
+    """Apply ECF active clubs download in filename to database."""
+    ecfdata = _read_json(filename)
+    timer.end_phase("read download")
+    ecfdataimport.copy_ecf_clubs_post_2020_rules(
+        database,
+        logwidget=log,
+        ecfdata=ecfdata,
+        downloaddate=downloaddate,
+        dry_run=dry_run,
+    )
+    timer.end_phase("apply download")
+
+
+def import_ecf_players(database, filename, timer, log, downloaddate, dry_run):
+    """Apply ECF rated players download in filename to database."""
+    ecfdata = _read_json(filename)
+    timer.end_phase("read download")
+    ecfdataimport.copy_ecf_players_post_2020_rules(
+        database,
+        logwidget=log,
+        ecfdata=ecfdata,
+        downloaddate=downloaddate,
+        dry_run=dry_run,
+    )
+    timer.end_phase("apply download")
+
+
+def import_events(database, filename, timer, log):
+    """Import events from results export file filename into database.
+
+    Export files containing identification decisions in reply to a report
+    must be imported with the Import Events action in the application
+    because the reply is validated against the report.
+
+    """
+    with open(filename, "r", encoding="utf8") as file:
+        importdata = importreports.get_import_event_reports(
+            file.read().rstrip().split("\n")
+        )
+    if importdata is None:
+        raise BatchTaskError("Unable to extract events from import file")
+    if importdata.remoteplayer:
+        raise BatchTaskError(
+            "Import file is a reply to a report: use Import Events"
+        )
+    for name in importdata.get_event_names():
+        log.append_text_only("  ".join((name[1], name[2], name[0])))
+    timer.end_phase("read import file")
+    collation = importcollation.ImportCollation(importdata)
+    collatedb = importcollationdb.ImportCollationDB(collation, database)
+    timer.end_phase("collate")
+    database.start_read_only_transaction()
+    try:
+        empty = collatedb.is_database_empty_of_players()
+        if not empty:
+            inconsistent = collatedb.is_player_identification_inconsistent()
+        else:
+            inconsistent = ()
+    finally:
+        database.end_read_only_transaction()
+    if len(inconsistent):
+        raise BatchTaskError(
+            "Player identifications on import are not consistent with "
+            "player records on database"
+        )
+    timer.end_phase("check identifications")
+    database.start_transaction()
+    try:
+        message = collatedb.update_results(bulk=True)
+        if message:
+            raise BatchTaskError("\n".join(message))
+        for phase, seconds in collatedb.phase_timings:
+            timer.add_phase(phase, seconds)
+        if empty:
+            collatedb.identify_players()
+        else:
+            collatedb.merge_players()
+    except BaseException:
+        database.backout()
+        raise
+    database.commit()
+    timer.end_phase("identify players")
+
+
+def event_summary(database, events, timer, output):
+    """Write events with game and player counts to output."""
+    summary = eventsummary.EventSummary(database, [e[-1] for e in events])
+    database.start_read_only_transaction()
+    try:
+        summary.collect()
+    finally:
+        database.end_read_only_transaction()
+    timer.end_phase("read events")
+    lines = []
+    for key in summary.eventkeys:
+        value = summary.events[key]
+        lines.append(
+            "\t".join(
+                [
+                    value.startdate,
+                    value.enddate,
+                    value.name,
+                    str(len(summary.event_games[key])),
+                    str(len(summary.event_players[key])),
+                ]
+            )
+        )
+    output.write("\n".join(lines))
+    output.write("\n")
+    timer.end_phase("write report")
+
+
+def _get_calculation_data(database, events, timer, prediction):
+    """Return event report and calculation data for events."""
+    database.start_read_only_transaction()
+    try:
+        event_report = _get_event_report(database, events)
+        if prediction:
+            gefpc = resultsrecord.get_events_for_performance_prediction(
+                database, events
+            )
+        else:
+            gefpc = resultsrecord.get_events_for_performance_calculation(
+                database, events
+            )
+    finally:
+        database.end_read_only_transaction()
+    if gefpc is None:
+        raise BatchTaskError(
+            "Cannot resolve all player identities: merge new players first"
+        )
+    names = gefpc[-1]
+    for k in names.keys():
+        names[k] = (get_person_name(names[k]), names[k])
+    timer.end_phase("read games")
+    return event_report, gefpc
+
+
+def calculate_performances(
+    database, events, timer, output, warmstart=None, cold_start=False
+):
+    """Write player performances for events to output."""
+    event_report, gefpc = _get_calculation_data(database, events, timer, False)
+    report = calculationreports.PerformanceReport(
+        *gefpc, warmstart=warmstart, cold_start=cold_start
+    )
+    text = report.calculate_performance()
+    timer.end_phase("calculate")
+    _write_calculation_report(output, event_report, text)
+    timer.end_phase("write report")
+
+
+def calculate_predictions(
+    database, events, timer, output, warmstart=None, cold_start=False
+):
+    """Write season performance predictions for events to output."""
+    event_report, gefpc = _get_calculation_data(database, events, timer, True)
+    report = calculationreports.PredictionReport(
+        *gefpc, warmstart=warmstart, cold_start=cold_start
+    )
+    text = report.calculate_prediction()
+    timer.end_phase("calculate")
+    _write_calculation_report(output, event_report, text)
+    timer.end_phase("write report")
+
+
+def _read_warm_start(filename):
+    """Return WarmStart with performances in filename if it exists."""
+    warmstart = performances.WarmStart()
+    if os.path.exists(filename):
+        try:
+            warmstart.read(filename)
+        except (OSError, ValueError, SyntaxError) as exc:
+            raise BatchTaskError(
+                " ".join(("Cannot read warm start file", filename))
+            ) from exc
+    return warmstart
+
+
+def _write_calculation_report(output, event_report, text):
+    """Write calculation report text for events in event_report to output."""
+    output.write("Events included:\n\n")
+    output.write(event_report)
+    output.write("".join(text))
+    output.write("\n")
+
+
+def export_events(database, events, filename, timer, log):
+    """Write export of events to results export file filename."""
+    export = exportevents.export_events(
+        database, [e[-1] for e in events], filename
+    )
+    log.append_text(
+        " ".join((str(export.line_count), "lines exported to", filename))
+    )
+    timer.end_phase("write export file")
+
+
+def run_task(arguments, log=None, output=None):
+    """Open database named in arguments and run task named in arguments."""
+    if log is None:
+        log = TaskLog()
+    if output is None:
+        output = sys.stderr
+    timer = TaskTimer(arguments.task)
+    database = opendatabase.open_results_database(
+        arguments.database, enginename=arguments.engine
+    )
+    timer.end_phase("open database")
+    try:
+        if arguments.task in TASKS[:3]:
+            if arguments.file is None:
+                raise BatchTaskError(
+                    " ".join((arguments.task, "needs a file name"))
+                )
+            if arguments.task == "ecf-clubs":
+                import_ecf_clubs(
+                    database,
+                    arguments.file,
+                    timer,
+                    log,
+                    arguments.download_date,
+                    arguments.dry_run,
+                )
+            elif arguments.task == "ecf-players":
+                import_ecf_players(
+                    database,
+                    arguments.file,
+                    timer,
+                    log,
+                    arguments.download_date,
+                    arguments.dry_run,
+                )
+            else:
+                import_events(database, arguments.file, timer, log)
+        else:
+            if arguments.task == "export-events" and arguments.file is None:
+                raise BatchTaskError(
+                    " ".join((arguments.task, "needs a file name"))
+                )
+            events = _get_event_items(database, arguments.start, arguments.end)
+            timer.end_phase("select events")
+            if arguments.task == "export-events":
+                export_events(database, events, arguments.file, timer, log)
+            elif arguments.task == "event-summary":
+                event_summary(database, events, timer, output)
+            else:
+                warmstart = None
+                if arguments.warm_start:
+                    warmstart = _read_warm_start(arguments.warm_start)
+                    timer.end_phase("read warm start")
+                if arguments.task == "performance":
+                    calculate = calculate_performances
+                else:
+                    calculate = calculate_predictions
+                calculate(
+                    database,
+                    events,
+                    timer,
+                    output,
+                    warmstart=warmstart,
+                    cold_start=arguments.cold_start,
+                )
+                if warmstart is not None:
+                    warmstart.write(arguments.warm_start)
+                    timer.end_phase("write warm start")
+    finally:
+        database.close_database()
+    timer.end_phase("close database")
+
+
+def get_argument_parser():
+    """Return ArgumentParser for batch tasks."""
+    parser = argparse.ArgumentParser(
+        prog="python -m chessreports.tools.batch",
+        description="Run ChessReports tasks without the user interface.",
+    )
+    parser.add_argument("database", help="results database folder")
+    parser.add_argument("task", choices=TASKS, help="task to run")
+    parser.add_argument(
+        "file",
+        nargs="?",
+        help="download or export file for import and export tasks",
+    )
+    parser.add_argument(
+        "--engine",
+        help="database engine module, default found from database files",
+    )
+    parser.add_argument(
+        "--start", help="earliest event start date, ISO format"
+    )
+    parser.add_argument("--end", help="latest event end date, ISO format")
+    parser.add_argument(
+        "--download-date",
+        default=time.strftime("%Y-%m-%d"),
+        help="date of ECF download, default today",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="report ECF download changes without applying them",
+    )
+    parser.add_argument("--output", help="report file, default stderr")
+    parser.add_argument(
+        "--warm-start",
+        help="file of performances to start performance and prediction "
+        "iterations, updated with the performances calculated",
+    )
+    parser.add_argument(
+        "--cold-start",
+        action="store_true",
+        help="report iterations saved by --warm-start compared with a "
+        "calculation without it",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    arguments = get_argument_parser().parse_args()
+    try:
+        if arguments.output:
+            with open(arguments.output, "w", encoding="utf-8") as output:
+                run_task(arguments, output=output)
+        else:
+            run_task(arguments)
+    except (
+        BatchTaskError,
+        exportevents.ExportEventsError,
+        opendatabase.OpenDatabaseError,
+    ) as exc:
+        raise SystemExit(str(exc))
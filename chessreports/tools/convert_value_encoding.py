@@ -0,0 +1,138 @@
+# convert_value_encoding.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Convert record values in a ChessReports database to another encoding.
+
+Game, player, ECF map, and ECF reference records are rewritten in compact
+or repr() encoding, and the encoding is recorded as the one used for new
+values in the database.  Records already in the requested encoding are not
+rewritten.
+
+Run as:
+
+python -m chessreports.tools.convert_value_encoding <folder> [compact|repr]
+
+"""
+
+from ..core import filespec
+from ..core import valuecodec
+from ..core import resultsrecord
+from ..core.ecf import ecfrecord
+from ..core.ecf import ecfmaprecord
+from ..basecore import opendatabase
+
+
+class _StoredValue:
+    """Mixin for the old record of an edit which keeps the value as stored.
+
+    The database engine's edit_instance method packs the old record before
+    comparing it with the new one.  The old record must keep the value as
+    stored, set by load_record, or it would be packed in the new encoding
+    and seen as unchanged.
+
+    """
+
+    def set_packed_value_and_indexes(self):
+        """Override, set indexes but keep value as stored."""
+        self.srindex = self.packed_value()[1]
+
+
+def _stored_value_class(recordclass):
+    """Return subclass of recordclass keeping value as stored for edits."""
+    return type(
+        "Stored" + recordclass.__name__, (_StoredValue, recordclass), {}
+    )
+
+
+_CONVERTED_FILES = tuple(
+    (dbset, recordclass, _stored_value_class(recordclass))
+    for dbset, recordclass in (
+        (filespec.GAME_FILE_DEF, resultsrecord.ResultsDBrecordGame),
+        (filespec.PLAYER_FILE_DEF, resultsrecord.ResultsDBrecordPlayer),
+        (filespec.MAPECFCLUB_FILE_DEF, ecfmaprecord.ECFmapDBrecordClub),
+        (filespec.MAPECFPLAYER_FILE_DEF, ecfmaprecord.ECFmapDBrecordPlayer),
+        (filespec.ECFCLUB_FILE_DEF, ecfrecord.ECFrefDBrecordECFclub),
+        (filespec.ECFPLAYER_FILE_DEF, ecfrecord.ECFrefDBrecordECFplayer),
+        (filespec.ECFEVENT_FILE_DEF, ecfrecord.ECFrefDBrecordEvent),
+    )
+)
+
+
+def convert_value_encoding(database, encoding, report=None):
+    """Rewrite record values in database in encoding.
+
+    The value_encoding of database is set to encoding while the records are
+    rewritten, and left as encoding if the conversion is committed.
+
+    report, if not None, is called with the file name and the number of
+    records read and rewritten after each file is done.
+
+    """
+    previous_encoding = database.value_encoding
+    database.value_encoding = encoding
+    database.start_transaction()
+    try:
+        for dbset, recordclass, storedclass in _CONVERTED_FILES:
+            read = 0
+            rewritten = 0
+            cursor = database.database_cursor(dbset, dbset)
+            try:
+                data = cursor.first()
+                while data:
+                    read += 1
+                    record = storedclass()
+                    record.load_record(data)
+                    record.set_database(database)
+
+                    # Values which could not be decoded are left alone.
+                    if record.value.__dict__:
+                        if record.packed_value()[0] != data[1]:
+                            newrecord = recordclass()
+                            newrecord.load_record(data)
+                            record.edit_record(
+                                database, dbset, dbset, newrecord
+                            )
+                            rewritten += 1
+                    data = cursor.next()
+            finally:
+                cursor.close()
+            if report:
+                report(dbset, read, rewritten)
+    except BaseException:
+        database.backout()
+        database.value_encoding = previous_encoding
+        raise
+    database.commit()
+    valuecodec.write_database_encoding(database.home_directory, encoding)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) not in (2, 3):
+        raise SystemExit(
+            "Usage: convert_value_encoding <database folder> [compact|repr]"
+        )
+    encoding = valuecodec.COMPACT_ENCODING
+    if len(sys.argv) == 3:
+        encoding = sys.argv[2]
+    if encoding not in (
+        valuecodec.COMPACT_ENCODING,
+        valuecodec.REPR_ENCODING,
+    ):
+        raise SystemExit(" ".join((encoding, "is not a value encoding")))
+    try:
+        results = opendatabase.open_results_database(sys.argv[1])
+    except opendatabase.OpenDatabaseError as exc:
+        raise SystemExit(str(exc))
+    try:
+        convert_value_encoding(
+            results,
+            encoding,
+            report=lambda dbset, read, rewritten: print(
+                dbset, read, "read", rewritten, "rewritten"
+            ),
+        )
+    finally:
+        results.close_database()